@@ -0,0 +1,195 @@
+import gzip
+import io
+import json
+import os
+import stat
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+from fileio import atomic_open, atomic_write_json, locked
+from metrics import incr
+
+ARCHIVE_DIR = "vitatkal_archive"
+PARTITIONED = ("requests", "booked_log")
+
+
+def journey_months(dates):
+    return pd.to_datetime(dates, errors="coerce").dt.strftime("%Y-%m")
+
+
+# ---------- Month partitions ----------
+# Past journey months are moved out of the live tables into read-only,
+# gzip-compressed CSV partitions, one file per table and month, listed in
+# manifest.json. The live tables then only hold the hot months (the current
+# month onwards), which is all a normal page load parses. Both backends keep
+# their archive this way.
+class Archive:
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, "manifest.json")
+
+    def manifest(self):
+        if not os.path.exists(self.manifest_file):
+            return {table: {} for table in PARTITIONED}
+        with open(self.manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+        return {table: manifest.get(table, {}) for table in PARTITIONED}
+
+    # Changes whenever a partition is written or removed
+    def version(self):
+        try:
+            st = os.stat(self.manifest_file)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def months(self, table):
+        return sorted(self.manifest()[table])
+
+    def load(self, table, months, columns):
+        entries = self.manifest()[table]
+        frames = []
+        for month in months:
+            if month not in entries:
+                continue
+            path = os.path.join(self.directory, entries[month]["file"])
+            with open(path, "rb") as f:
+                raw = f.read()
+            incr("bytes_read_total", len(raw), file=os.path.basename(path))
+            frames.append(pd.read_csv(io.BytesIO(gzip.decompress(raw)), dtype={"Phone": str, "GroupID": str}))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
+    def write(self, table, month, df):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{table}-{month}.csv.gz"
+        path = os.path.join(self.directory, name)
+        with locked(self.manifest_file):
+            with atomic_open(path, "wb") as f:
+                f.write(gzip.compress(df.to_csv(index=False).encode("utf-8")))
+            os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            manifest = self.manifest()
+            entry = {"file": name, "rows": len(df), "archived_at": datetime.now().isoformat(timespec="seconds")}
+            if "GroupID" in df and table == "requests":
+                entry["groups"] = int(df["GroupID"].nunique())
+            manifest[table][month] = entry
+            atomic_write_json(manifest, self.manifest_file)
+
+    def remove(self, table, month):
+        with locked(self.manifest_file):
+            manifest = self.manifest()
+            entry = manifest[table].pop(month, None)
+            if entry is None:
+                return
+            atomic_write_json(manifest, self.manifest_file)
+            path = os.path.join(self.directory, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# ---------- Archive / unarchive ----------
+# Both run against the raw backend, not CachedStorage: archived rows still
+# count towards the ledger and rollups, so listeners must not see them as
+# deletes. The views notice the changed table versions and rebuild, reading
+# live and archived rows alike (see load_with_archive).
+def archive_before(storage, cutoff):
+    archive = storage.archive
+    requests = storage.load_requests()
+    log = storage.load_booked_log()
+    request_months = journey_months(requests["Date of Journey"])
+    log_months = journey_months(log["Date of Journey"])
+    old_requests = requests[request_months < cutoff]
+    old_log = log[log_months < cutoff]
+    months = sorted(set(request_months[old_requests.index]) | set(log_months[old_log.index]))
+
+    # Partitions are written before the live rows are dropped, so a crash in
+    # between leaves duplicates (merged away on the next run), never losses.
+    for month in months:
+        rows = old_requests[request_months[old_requests.index] == month]
+        archive.write("requests", month, _merge(archive.load("requests", [month], requests.columns), rows))
+        entries = old_log[log_months[old_log.index] == month]
+        archive.write("booked_log", month, _merge(archive.load("booked_log", [month], log.columns), entries))
+
+    group_ids = old_requests["GroupID"].dropna().unique().tolist()
+    if group_ids:
+        storage.delete_groups(group_ids)
+    if not old_log.empty:
+        storage.delete_booked_log_rows(list(old_log.index))
+    journal = getattr(storage, "journal", None)
+    if journal is not None and group_ids:
+        journal.compact()  # fold the delete so the snapshot itself shrinks
+    print(f"✅ Archived {len(group_ids)} group(s) and {len(old_log)} booked-log row(s) from {len(months)} month(s)")
+    return months
+
+
+# Months with a partition in any archived table; an interrupted archive or
+# unarchive can leave a month in one table only
+def all_archived_months(storage):
+    return sorted(set().union(*(storage.archived_months(table) for table in PARTITIONED)))
+
+
+def unarchive(storage, months):
+    archive = storage.archive
+    requests = storage.load_requests()
+    log = storage.load_booked_log()
+    restored = 0
+    for month in months:
+        # Rows already live (an interrupted earlier run) are not added twice
+        rows = archive.load("requests", [month], requests.columns)
+        rows = rows[~rows["GroupID"].isin(requests["GroupID"])]
+        groups = [_records(group) for _, group in rows.groupby("GroupID", sort=False)]
+        if groups:
+            storage.add_request_groups(groups)
+
+        entries = archive.load("booked_log", [month], log.columns)
+        entries = entries[entries["GroupID"].isna() | ~entries["GroupID"].isin(log["GroupID"].dropna())]
+        if not entries.empty:
+            storage.add_booked_log_many(_records(entries))
+
+        archive.remove("requests", month)
+        archive.remove("booked_log", month)
+        restored += len(groups)
+    print(f"✅ Restored {restored} group(s) from {len(months)} archived month(s)")
+
+
+def _merge(kept, rows):
+    # Rows already in the partition (same GroupID) are replaced by the live copy
+    kept = kept[~kept["GroupID"].isin(rows["GroupID"].dropna())]
+    if kept.empty:
+        return rows
+    return pd.concat([kept, rows], ignore_index=True)
+
+
+def _records(df):
+    return df.astype(object).where(pd.notna(df), None).to_dict("records")
+
+
+# Full table including every archived month, for rebuilds and consistency checks
+def load_with_archive(storage, table):
+    live = storage.load_requests() if table == "requests" else storage.load_booked_log()
+    months = storage.archived_months(table)
+    if not months:
+        return live
+    return pd.concat([live, storage.load_archived(table, months)], ignore_index=True)
+
+
+if __name__ == "__main__":
+    from storage import open_storage
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("list", "archive", "unarchive"):
+        print("Usage: python archive.py list|archive|unarchive [csv|sqlite] [YYYY-MM ...]")
+        sys.exit(1)
+    store = open_storage(sys.argv[2] if len(sys.argv) > 2 else "csv")
+    months = sys.argv[3:]
+    if sys.argv[1] == "archive":
+        # Everything with a journey before the given month (default: this month)
+        archive_before(store, months[0] if months else datetime.now().strftime("%Y-%m"))
+    elif sys.argv[1] == "unarchive":
+        unarchive(store, months or all_archived_months(store))
+    else:
+        for table in PARTITIONED:
+            for month, entry in sorted(store.archive.manifest()[table].items()):
+                print(f"{table:10} {month}  {entry['rows']:>7} row(s)  archived {entry['archived_at']}")
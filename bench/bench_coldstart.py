@@ -0,0 +1,151 @@
+"""Public form cold start: module imports and first render in a fresh process.
+
+For each app tree (a checkout containing vittatkal.py) and repeat, a new
+Python process runs under `python -X importtime` in a scratch copy of the
+tree. Streamlit, pandas and AppTest are imported first, as any server
+process has them loaded already; what the app imports after that is its
+own cold-start cost. It then measures:
+- modules: how many modules the app's first render loaded, leaving out
+  Streamlit's own lazily loaded internals (the same for any app)
+- import_ms: the import time of those modules, from a second fresh process
+  that only imports them (in a running app the timings are blurred by the
+  script thread sharing the interpreter with the server's threads)
+- first_ms: the AppTest first render of the public booking form. This
+  includes Streamlit compiling the entry script (magic plus compile(),
+  about 180 ms for the old 1,000-line single-file script); page modules
+  load from cached bytecode instead
+- rerun_ms: a second run of the same page. AppTest compiles the entry
+  script again on every run, where a server keeps it after the first, so
+  this mostly tracks the entry script's size
+- mail / admin: whether smtplib or the admin panel code were loaded
+
+Compare the current tree with an earlier commit checked out beside it:
+
+    git worktree add /tmp/vitatkal-before HEAD~1
+    python bench/bench_coldstart.py --tree /tmp/vitatkal-before --tree .
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MARKER = "-- vitatkal cold start --"
+ADMIN_MODULES = ("ui.admin", "transfer")  # the single-file script imported transfer at the top
+
+PRELOAD = """
+import sys, time
+import pandas, streamlit
+from streamlit.testing.v1 import AppTest
+"""
+
+CHILD = PRELOAD + """
+before = set(sys.modules)
+at = AppTest.from_file("vittatkal.py", default_timeout=300)
+at.secrets["admin"] = {"pass": "bench"}
+at.secrets["email"] = {"sender": "bench@localhost", "password": "", "receiver": "bench@localhost",
+                       "host": "127.0.0.1", "port": 1}
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+loaded = [m for m in sys.modules if m not in before and m.split(".")[0] != "streamlit"]
+print(repr({"first_ms": first * 1000, "rerun_ms": rerun * 1000, "loaded": loaded,
+            "mail": "smtplib" in loaded,
+            "admin": any(m in loaded for m in %(admin)r)}))
+"""
+
+IMPORTS = PRELOAD + """
+print(%(marker)r, file=sys.stderr, flush=True)
+for name in %(loaded)r:
+    try:
+        __import__(name)  # importlib.import_module isn't seen by -X importtime
+    except Exception:
+        pass  # e.g. modules that need a running script
+"""
+
+
+# Copies the tree (sources and sample data, not .git) and compiles it once,
+# so every run starts from the same files with bytecode already cached
+def prepare(tree, work):
+    shutil.copytree(tree, work, ignore=shutil.ignore_patterns(".git", "bench", "vitatkal_*", "*.db", "*.arrow"))
+    subprocess.run([sys.executable, "-m", "compileall", "-q", work], check=True)
+
+
+def import_ms(stderr):
+    total = 0
+    after = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            after = True
+        elif after and line.startswith("import time:") and "|" in line:
+            self_us = line.split(":", 1)[1].split("|")[0].strip()
+            if self_us.isdigit():
+                total += int(self_us)
+    return total / 1000
+
+
+def python(code, cwd, *flags):
+    proc = subprocess.run([sys.executable, *flags, "-c", code], cwd=cwd, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr[-2000:])
+    return proc
+
+
+def run_once(prepared):
+    work = tempfile.mkdtemp(prefix="vitatkal-coldstart-")
+    try:
+        shutil.rmtree(work)
+        shutil.copytree(prepared, work)
+        proc = python(CHILD % {"admin": ADMIN_MODULES}, work)
+        result = eval(proc.stdout.strip().splitlines()[-1])
+        loaded = result.pop("loaded")
+        result["modules"] = len(loaded)
+        result["import_ms"] = import_ms(python(IMPORTS % {"marker": MARKER, "loaded": loaded}, work, "-X", "importtime").stderr)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tree", action="append", help="app tree to measure (repeatable; default: this checkout)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, tree in enumerate(args.tree or [ROOT]):
+            prepared = os.path.join(tmp, str(n))
+            prepare(tree, prepared)
+            runs = pd.DataFrame([run_once(prepared) for _ in range(args.repeat)])
+            rows.append({
+                "tree": os.path.abspath(tree),
+                "import_ms": round(runs["import_ms"].median(), 1),
+                "modules": int(runs["modules"].median()),
+                "first_ms": round(runs["first_ms"].median(), 1),
+                "rerun_ms": round(runs["rerun_ms"].median(), 1),
+                "mail": bool(runs["mail"].any()),
+                "admin": bool(runs["admin"].any()),
+            })
+            print(f"✅ {tree}: {args.repeat} run(s)", file=sys.stderr)
+
+    print(f"median of {args.repeat} fresh process(es) per tree")
+    print(pd.DataFrame(rows).set_index("tree").to_string())
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Admin refresh cost: full group-index reload vs the change-feed live index.
+
+For one synthetic data directory it measures, per refresh:
+- full: what a refresh cost before the feed, a typed requests load plus a
+  GroupIndex build
+- poll.idle: a live-index refresh with nothing written since the last one
+- poll.1: a live-index refresh after one new submission (feed read + patch)
+- poll.20: the same after a burst of 20 submissions and status changes
+
+    python bench/bench_feed.py --groups 100k --backend csv
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+from stress_submit import make_group  # noqa: E402
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(pd.Series(samples).median() * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", choices=list(SIZES), default="100k")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-feed-{args.backend}-")
+    write_dataset(workdir, args.backend, *generate(SIZES[args.groups]))
+    os.chdir(workdir)
+
+    from booking_index import GroupIndex, LiveGroupIndex
+    from cache import CachedStorage
+    from storage import open_storage
+
+    storage = CachedStorage(open_storage(args.backend))
+    load = lambda: storage.load_typed("requests")  # noqa: E731
+    live = LiveGroupIndex()
+    live.refresh(storage, load)
+    submitted = [0]
+
+    def submit(n):
+        group_ids = []
+        for _ in range(n):
+            group_id, rows = make_group(999, submitted[0])
+            submitted[0] += 1
+            storage.add_requests(rows)
+            group_ids.append(group_id)
+        if n > 1:
+            storage.set_groups_status(group_ids[: n // 2], "Booked ✅")
+
+    def full():
+        storage.cache.invalidate("requests")
+        GroupIndex(load())
+
+    def poll(n):
+        samples = []
+        for _ in range(args.repeat):
+            submit(n)
+            start = time.perf_counter()
+            live.refresh(storage, load)
+            samples.append(time.perf_counter() - start)
+        return round(pd.Series(samples).median() * 1000, 3)
+
+    results = [
+        {"refresh": "full", "median_ms": timed(full, args.repeat)},
+        {"refresh": "poll.idle", "median_ms": timed(lambda: live.refresh(storage, load), args.repeat * 20)},
+        {"refresh": "poll.1", "median_ms": poll(1)},
+        {"refresh": "poll.20", "median_ms": poll(20)},
+    ]
+    index = live.refresh(storage, load)
+    fresh = GroupIndex(load())
+    consistent = index.groups.sort_index()[["Status", "Passengers"]].astype(str).equals(
+        fresh.groups.sort_index()[["Status", "Passengers"]].astype(str))
+
+    print(pd.DataFrame(results).set_index("refresh").to_string())
+    print(f"groups: {len(index.groups)}, live index matches a full rebuild: {consistent}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "groups": args.groups, "results": results,
+                       "consistent": consistent}, f, indent=2)
+    if not consistent:
+        print("❌ Live index diverged from a full rebuild")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Throughput benchmark: synchronous vs queued (group-commit) ingestion.
+
+Simulates the 10:00 IST rush: many sessions (threads) submit at once
+against a pre-populated data directory, using the same storage stack as the
+app (cache + ledger / rollup views). The two modes are:
+- sync: each submit writes straight to storage.
+- queue: each submit enqueues into the durable ingest queue and returns a
+  receipt. The single writer then commits batches.
+
+It reports submit latency as seen by the user, end-to-end throughput until
+everything is stored, and the number of storage commits.
+
+    python bench/bench_ingest.py --backend csv --threads 32 --per-thread 20 --base-groups 10k
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+from stress_submit import make_group  # noqa: E402
+
+
+def run_mode(mode, args, frames):
+    from cache import CachedStorage
+    from ingest import IngestQueue, IngestWorker
+    from ledger import AgentLedger
+    from metrics import METRICS
+    from rollups import Rollups
+    from storage import open_storage
+
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-ingest-{mode}-")
+    write_dataset(workdir, args.backend, *frames)
+    os.chdir(workdir)
+    storage = CachedStorage(open_storage(args.backend), listeners=[AgentLedger(), Rollups()])
+    AgentLedger().rebuild(storage)
+    Rollups().rebuild(storage)
+    before = storage.count_groups()
+    commits_before = METRICS.totals["write.requests"][0]
+
+    worker = None
+    if mode == "queue":
+        worker = IngestWorker(IngestQueue(), storage)
+        worker.start()
+        submit = worker.submit
+    else:
+        submit = storage.add_requests
+
+    latencies = []
+    lock = threading.Lock()
+
+    def session(thread):
+        mine = []
+        for n in range(args.per_thread):
+            _, rows = make_group(thread, n)
+            start = time.perf_counter()
+            submit(rows)
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=session, args=(t,)) for t in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    accepted = time.perf_counter() - start
+    if worker is not None:
+        worker.wait_idle(timeout=600)
+    stored = time.perf_counter() - start
+
+    total = args.threads * args.per_thread
+    ms = pd.Series(latencies) * 1000
+    commits = METRICS.totals["write.requests"][0] - commits_before
+    result = {
+        "mode": mode,
+        "submissions": total,
+        "stored": int(storage.count_groups() - before),
+        "submit_p50_ms": round(ms.quantile(0.5), 3),
+        "submit_p95_ms": round(ms.quantile(0.95), 3),
+        "submit_max_ms": round(ms.max(), 3),
+        "accepted_per_s": round(total / accepted, 1),
+        "stored_per_s": round(total / stored, 1),
+        "storage_commits": int(commits),
+        "rollups_consistent": not Rollups().check(storage),
+    }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--per-thread", type=int, default=20)
+    parser.add_argument("--base-groups", choices=list(SIZES), default="10k")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    frames = generate(SIZES[args.base_groups])
+    results = [run_mode(mode, args, frames) for mode in ("sync", "queue")]
+
+    print(pd.DataFrame(results).set_index("mode").T.to_string())
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "base_groups": args.base_groups,
+                       "threads": args.threads, "results": results}, f, indent=2)
+    lost = [r["mode"] for r in results if r["stored"] != r["submissions"] or not r["rollups_consistent"]]
+    if lost:
+        print(f"❌ Lost submissions or inconsistent rollups in: {', '.join(lost)}")
+        sys.exit(1)
+    print("✅ All submissions stored in both modes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Load test: legitimate submit latency while abusive clients hammer submit.
+
+Runs the form's submit path without the UI (rate limiter, repeat check,
+storage write, outbox enqueue) against a pre-populated data directory, for
+a fixed time per scenario:
+- quiet: only legitimate users, each submitting a new request every
+  --think seconds from their own phone and session
+- abuse: the same users, plus --abusers clients that each resubmit from one
+  phone and session every --gap seconds (a tight retry loop, bounded by the
+  round trip a real client waits for). Names vary, so the repeat check
+  doesn't catch them. No rate limiter.
+- abuse+limit: the same abuse with the rate limiter (ratelimit.LIMITS)
+
+It reports legitimate submit latency, how many submissions were written and
+mails queued, and the rate limiter's rejections.
+
+    python bench/bench_ratelimit.py --backend csv --base-groups 10k --seconds 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+from stress_submit import make_group  # noqa: E402
+
+SCENARIOS = {"quiet": (False, False), "abuse": (True, False), "abuse+limit": (True, True)}
+
+
+def run_scenario(name, args, frames):
+    from cache import CachedStorage
+    from dedupe import DuplicateIndex
+    from ledger import AgentLedger
+    from metrics import METRICS
+    from outbox import Outbox
+    from ratelimit import RateLimiter
+    from rollups import Rollups
+    from storage import open_storage
+
+    abuse, limit = SCENARIOS[name]
+    workdir = tempfile.mkdtemp(prefix="vitatkal-ratelimit-")
+    write_dataset(workdir, args.backend, *frames)
+    os.chdir(workdir)
+    storage = CachedStorage(open_storage(args.backend), listeners=[AgentLedger(), Rollups()])
+    AgentLedger().rebuild(storage)
+    Rollups().rebuild(storage)
+    outbox = Outbox()
+    duplicates = DuplicateIndex()
+    limiter = RateLimiter() if limit else None
+    rejected_before = sum(v for (counter, _), v in METRICS.counters.items() if counter == "rate_limited_total")
+    stop = threading.Event()
+    counts = {"legit": 0, "abusive": 0, "limited": 0}
+    latencies = []
+    lock = threading.Lock()
+
+    # What ui/booking_form.py does on submit, minus Streamlit
+    def submit(rows, session):
+        if limiter is not None and limiter.acquire(phone=rows[0]["Phone"], session=session):
+            return False
+        if duplicates.claim(storage, rows):
+            return True
+        storage.add_requests(rows)
+        outbox.enqueue(f"🚨 New Vitatkal Booking Request from {rows[0]['Name']}", repr(rows))
+        return True
+
+    def user(u):
+        n = 0
+        while not stop.is_set():
+            _, rows = make_group(u, n)  # a new phone for every request
+            start = time.perf_counter()
+            submit(rows, f"user-{u}-{n}")
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                counts["legit"] += 1
+            n += 1
+            stop.wait(args.think)
+
+    def abuser(a):
+        n = 0
+        while not stop.is_set():
+            _, rows = make_group(9000 + a, n)
+            for row in rows:
+                row["Phone"] = f"8{a:09d}"
+            accepted = submit(rows, f"abuser-{a}")
+            with lock:
+                counts["abusive" if accepted else "limited"] += 1
+            n += 1
+            stop.wait(args.gap)
+
+    threads = [threading.Thread(target=user, args=(u,)) for u in range(args.users)]
+    if abuse:
+        threads += [threading.Thread(target=abuser, args=(a,)) for a in range(args.abusers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    ms = pd.Series(latencies) * 1000
+    rejected = sum(v for (counter, _), v in METRICS.counters.items() if counter == "rate_limited_total")
+    return {
+        "scenario": name,
+        "legit_submits": counts["legit"],
+        "legit_p50_ms": round(ms.quantile(0.5), 2),
+        "legit_p95_ms": round(ms.quantile(0.95), 2),
+        "legit_p99_ms": round(ms.quantile(0.99), 2),
+        "abusive_accepted": counts["abusive"],
+        "abusive_rejected": counts["limited"],
+        "rate_limited_total": int(rejected - rejected_before),
+        "mails_queued": outbox.counts().get("pending", 0),
+        "buckets": len(limiter) if limiter is not None else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--base-groups", choices=list(SIZES), default="10k")
+    parser.add_argument("--users", type=int, default=8, help="legitimate users")
+    parser.add_argument("--think", type=float, default=0.25, help="seconds between a user's submissions")
+    parser.add_argument("--abusers", type=int, default=4)
+    parser.add_argument("--gap", type=float, default=0.01, help="seconds between an abuser's submissions")
+    parser.add_argument("--seconds", type=float, default=10, help="length of each scenario")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    frames = generate(SIZES[args.base_groups])
+    results = [run_scenario(name, args, frames) for name in SCENARIOS]
+
+    print(pd.DataFrame(results).set_index("scenario").T.to_string())
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "base_groups": args.base_groups, "users": args.users,
+                       "abusers": args.abusers, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Admin session state over a long session: size and rerun time.
+
+Logs into the admin panel through AppTest on a synthetic data directory,
+then walks the Booking Requests list page by page (wrapping around) in one
+session. On every page it opens the "Mark as Booked" form of a few groups
+and changes one profit, as an admin working through the list would. After
+every page it records:
+- keys: entries in the session's state (user keys and widget states)
+- groups: how many of those keys belong to a single group
+- kb: the pickled size of the state
+- rerun_ms: a plain rerun of the admin page
+
+    python bench/bench_session.py --groups 10k --visits 200
+    python bench/bench_session.py --tree /tmp/vitatkal-before --groups 10k --visits 200
+"""
+import argparse
+import json
+import os
+import pickle
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH, ".."))
+GROUP_KEY = re.compile(r"G\d{13}[0-9a-f]{7}")
+ADMIN_PASS = "bench"
+
+
+def session_stats(at):
+    state = at.session_state._state._state  # SafeSessionState -> SessionState
+    keys = list(state._keys())
+    size = 0
+    for key in keys:
+        try:
+            size += len(key) + len(pickle.dumps(state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass  # e.g. widget values holding callables
+    return {"keys": len(keys), "groups": sum(1 for key in keys if GROUP_KEY.search(key)),
+            "kb": round(size / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tree", default=ROOT, help="app tree to run (default: this checkout)")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--groups", default="1k", help="synthetic groups: a number, or 1k, 10k or 100k")
+    parser.add_argument("--view", default="Pending", help="Booking Requests view to walk")
+    parser.add_argument("--visits", type=int, default=100, help="pages visited")
+    parser.add_argument("--open", type=int, default=3, help="forms opened per page")
+    parser.add_argument("--every", type=int, default=20, help="print a row every this many visits")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vitatkal-session-")
+    shutil.copytree(args.tree, workdir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns(".git", "bench", "vitatkal_*", "*.db", "*.arrow"))
+    # In its own process: generate_data imports this checkout's modules, and
+    # the session must only load the tree under test
+    subprocess.run([sys.executable, os.path.join(BENCH, "generate_data.py"), "--groups", args.groups,
+                    "--backend", args.backend, "--out", workdir], check=True, stdout=subprocess.DEVNULL)
+    sys.path.insert(0, workdir)
+    os.chdir(workdir)
+
+    import pandas as pd
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(workdir, "vittatkal.py"), default_timeout=600)
+    at.secrets["admin"] = {"pass": ADMIN_PASS}
+    at.secrets["email"] = {"sender": "bench@localhost", "password": "", "receiver": "bench@localhost",
+                           "host": "127.0.0.1", "port": 1}
+    at.secrets["storage"] = {"backend": args.backend}
+    at.query_params["admin"] = "true"
+    at.run()
+    at.text_input[0].input(ADMIN_PASS).run()
+    at.selectbox(key="list_view").select(args.view).run()
+    pages = int(re.search(r"of (\d+)", at.number_input(key="list_page").label).group(1))
+
+    rows = []
+    for visit in range(1, args.visits + 1):
+        at.number_input(key="list_page").set_value((visit - 1) % pages + 1).run()
+        for button in [b for b in at.button if b.label == "✅ Mark as Booked"][:args.open]:
+            button.click().run()
+        profits = [n for n in at.number_input if n.label == "💰 Profit ₹"]
+        if profits:
+            profits[0].increment().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        start = time.perf_counter()
+        at.run()
+        rows.append({"visit": visit, **session_stats(at), "rerun_ms": round((time.perf_counter() - start) * 1000, 1)})
+        if visit % args.every == 0 or visit == 1:
+            print(rows[-1], file=sys.stderr, flush=True)
+
+    df = pd.DataFrame(rows)
+    last = df.tail(max(1, len(df) // 10))
+    print(f"{args.tree}: {args.groups} groups, view {args.view!r} ({pages} pages), {args.visits} visits")
+    print(df[df["visit"].isin([1, *range(args.every, args.visits + 1, args.every)])].set_index("visit").to_string())
+    print(f"rerun_ms median: first tenth {df.head(max(1, len(df) // 10))['rerun_ms'].median()}, "
+          f"last tenth {last['rerun_ms'].median()}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"tree": args.tree, "groups": args.groups, "view": args.view, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
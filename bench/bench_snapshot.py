@@ -0,0 +1,125 @@
+"""Load time and memory: CSV vs the columnar (Arrow IPC) snapshot.
+
+For one synthetic data directory it measures, for the requests table and
+the booked log:
+- csv: the storage load followed by the date parsing the admin used to
+  repeat on every rerun (object dtypes otherwise, as before)
+- arrow.build: the first typed load, which reads the source and writes the
+  snapshot
+- arrow: a typed load from an up-to-date, memory-mapped snapshot
+
+Each measurement runs in a fresh process. Resident memory is the process
+RSS growth over the load, and frame memory is the DataFrame's deep
+memory_usage.
+
+    python bench/bench_snapshot.py --groups 100k --backend csv
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+
+TABLES = ("requests", "booked_log")
+
+
+def rss_bytes():
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def load_once(workdir, backend, table, method, repeat, queue):
+    from snapshot import ColumnarSnapshot
+    from storage import open_storage
+
+    os.chdir(workdir)
+    storage = open_storage(backend)
+    snapshot = ColumnarSnapshot(table)
+
+    def csv_load():
+        df = storage.load_requests() if table == "requests" else storage.load_booked_log()
+        df["Date of Journey"] = pd.to_datetime(df["Date of Journey"], errors="coerce")
+        return df
+
+    def arrow_build():
+        if os.path.exists(snapshot.path):
+            os.remove(snapshot.path)
+        return snapshot.load(storage)
+
+    load = {"csv": csv_load, "arrow.build": arrow_build, "arrow": lambda: snapshot.load(storage)}[method]
+    if method == "arrow":
+        snapshot.load(storage)  # make sure the snapshot is current
+
+    before = rss_bytes()
+    samples = []
+    df = None
+    for _ in range(repeat):
+        df = None
+        start = time.perf_counter()
+        df = load()
+        samples.append(time.perf_counter() - start)
+    queue.put({
+        "table": table,
+        "method": method,
+        "rows": len(df),
+        "median_ms": round(pd.Series(samples).median() * 1000, 2),
+        "frame_mb": round(df.memory_usage(index=True, deep=True).sum() / 1024 / 1024, 2),
+        "rss_mb": round((rss_bytes() - before) / 1024 / 1024, 2),
+    })
+
+
+def file_sizes(workdir, backend):
+    from snapshot import SNAPSHOT_FILE
+    from storage import BOOKED_LOG_FILE, CSV_FILE, SQLITE_FILE
+
+    source = {"requests": CSV_FILE, "booked_log": BOOKED_LOG_FILE} if backend == "csv" else {t: SQLITE_FILE for t in TABLES}
+    sizes = {}
+    for table in TABLES:
+        for name, path in (("source", source[table]), ("arrow", SNAPSHOT_FILE.format(table=table))):
+            full = os.path.join(workdir, path)
+            sizes[f"{table}.{name}_mb"] = round(os.path.getsize(full) / 1024 / 1024, 2) if os.path.exists(full) else None
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", choices=list(SIZES), default="100k")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-snapshot-{args.backend}-")
+    write_dataset(workdir, args.backend, *generate(SIZES[args.groups]))
+
+    results = []
+    for table in TABLES:
+        for method in ("csv", "arrow.build", "arrow"):
+            queue = Queue()
+            repeat = 1 if method == "arrow.build" else args.repeat
+            proc = Process(target=load_once, args=(workdir, args.backend, table, method, repeat, queue))
+            proc.start()
+            results.append(queue.get())
+            proc.join()
+
+    print(pd.DataFrame(results).set_index(["table", "method"]).to_string())
+    sizes = file_sizes(workdir, args.backend)
+    print("\n".join(f"{k:26} {v} MB" for k, v in sizes.items()))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "groups": args.groups, "results": results, "files": sizes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Station lookup latency: the prefix index vs a linear scan.
+
+Over the bundled station table (optionally padded with synthetic stations
+to the size of the full Indian Railways list, about 9,000) it measures:
+- build: loading the table into a StationIndex
+- complete: autocomplete for every prefix of every code, name and alias
+- lookup: normalising every code, name and alias to its station code
+- scan: the same completions by filtering every key with startswith
+
+    python bench/bench_stations.py --pad 9000
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from stations import STATIONS_FILE, StationIndex, _key  # noqa: E402
+
+
+def pad(stations, size, seed=7):
+    rng = random.Random(seed)
+    syllables = ["ka", "ra", "pa", "ma", "ni", "lu", "ko", "de", "va", "pur", "nagar", "gaon", "halli", "kot", "ganj"]
+    codes = set(stations["code"])
+    rows = []
+    while len(stations) + len(rows) < size:
+        code = "".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 5)))
+        if code in codes:
+            continue
+        codes.add(code)
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+        suffix = rng.choice(["", "", " Junction", " Road", " Town", " Halt"])
+        rows.append({"code": code, "name": name + suffix, "aliases": ""})
+    return pd.concat([stations, pd.DataFrame(rows)], ignore_index=True)
+
+
+def latencies(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append(time.perf_counter() - start)
+    series = pd.Series(samples) * 1_000_000
+    return {"queries": len(queries), "p50_us": round(series.median(), 2),
+            "p99_us": round(series.quantile(0.99), 2), "max_us": round(series.max(), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pad", type=int, default=0, help="pad the table with synthetic stations to this many")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    stations = pd.read_csv(STATIONS_FILE, dtype=str, keep_default_na=False)
+    if args.pad:
+        stations = pad(stations, args.pad)
+
+    start = time.perf_counter()
+    index = StationIndex(stations)
+    build_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    terms = [t for c, n, a in stations.itertuples(index=False) for t in [c, n] + a.split("|") if t]
+    prefixes = sorted({_key(t)[:i] for t in terms for i in range(1, len(_key(t)) + 1)})
+    keys = index.keys
+
+    def scan(prefix):
+        key = _key(prefix)
+        found = []
+        for k, (_, code) in zip(keys, index.entries):
+            if k.startswith(key) and code not in found:
+                found.append(code)
+                if len(found) == 10:
+                    break
+        return found
+
+    results = [
+        {"step": "complete", **latencies(index.complete, prefixes)},
+        {"step": "lookup", **latencies(index.lookup, terms)},
+        {"step": "scan", **latencies(scan, prefixes[:: max(1, len(prefixes) // 2000)])},
+    ]
+    print(f"stations: {len(index)}, index keys: {len(keys)}, build: {build_ms} ms")
+    print(pd.DataFrame(results).set_index("step").to_string())
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"stations": len(index), "build_ms": build_ms, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Admin "Next up" cost: re-sorting the pending groups vs the Tatkal queue.
+
+On one synthetic data directory, simulates an admin working through the
+requests while customers keep submitting: each step writes --submits new
+groups (journeys in the next few days), then picks the next group to book.
+- sort: what picking means without the queue: the live group index's
+  pending upcoming groups given window keys and sorted, and the first one
+  not yet taken
+- heap: a TatkalQueue refresh (change feed) and pop
+The live index is refreshed before each pick and not timed. Both report
+time per pick; "build" is the queue's first build from the index. The two
+must pick the same groups in the same order. As in timeit, the garbage
+collector is paused while a pick is timed (a full collection of the app's
+objects takes tens of milliseconds and lands on whichever pick triggers it).
+
+    python bench/bench_tatkal_queue.py --groups 100k --steps 200
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+from stress_submit import make_group  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", choices=list(SIZES), default="100k")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--steps", type=int, default=200, help="groups picked")
+    parser.add_argument("--submits", type=int, default=2, help="new submissions between picks")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-tatkal-{args.backend}-")
+    write_dataset(workdir, args.backend, *generate(SIZES[args.groups]))
+    os.chdir(workdir)
+
+    from booking_index import LiveGroupIndex
+    from cache import CachedStorage
+    from storage import open_storage
+    from tatkal_queue import AC_CLASSES, IST, TatkalQueue, _yesterday_midnight
+
+    storage = CachedStorage(open_storage(args.backend))
+    load = lambda: storage.load_typed("requests")  # noqa: E731
+    live = LiveGroupIndex()
+    live.refresh(storage, load)
+    queue = TatkalQueue()
+    start = time.perf_counter()
+    queue.refresh(storage, lambda: live.refresh(storage, load))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def sort_pick(taken):
+        groups = live.index.groups
+        groups = groups[(groups["Status"] != "Booked ✅") & ~groups.index.isin(taken)]
+        ac = groups["Class"].astype(str).str.strip().str.upper().isin(AC_CLASSES)
+        opens = (groups["Date of Journey"] - pd.Timedelta(days=1)
+                 + pd.to_timedelta(np.where(ac, 10, 11), unit="h")).dt.tz_localize(IST)
+        groups = groups.assign(_opens=opens, _pax=-groups["Passengers"])
+        groups = groups[groups["_opens"] >= pd.Timestamp(_yesterday_midnight(time.time()), unit="s", tz=IST)]
+        groups = groups.assign(_at=groups.index.str.slice(1, 14).astype("int64"), _gid=groups.index)
+        ordered = groups.sort_values(["_opens", "_pax", "_at", "_gid"])
+        return ordered.index[0] if len(ordered) else None
+
+    def heap_pick():
+        return queue.refresh(storage, lambda: live.refresh(storage, load)).pop()
+
+    random.seed(7)
+    samples = {"sort": [], "heap": []}
+    picks = {"sort": [], "heap": []}
+    taken = set()
+    for step in range(args.steps):
+        for n in range(args.submits):
+            _, rows = make_group(step, n)
+            doj = (date.today() + timedelta(days=random.randint(1, 4))).strftime("%Y-%m-%d")
+            for row in rows:
+                row["Date of Journey"] = doj
+            storage.add_requests(rows)
+        live.refresh(storage, load)
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        picked = sort_pick(taken)
+        samples["sort"].append(time.perf_counter() - start)
+        taken.add(picked)
+        picks["sort"].append(picked)
+        start = time.perf_counter()
+        picks["heap"].append(heap_pick())
+        samples["heap"].append(time.perf_counter() - start)
+        gc.enable()
+
+    results = {"groups": args.groups, "backend": args.backend, "steps": args.steps, "build_ms": round(build_ms, 1),
+               "same_order": picks["sort"] == picks["heap"]}
+    for name, values in samples.items():
+        ms = pd.Series(values) * 1000
+        results[f"{name}_p50_ms"] = round(ms.quantile(0.5), 3)
+        results[f"{name}_p95_ms"] = round(ms.quantile(0.95), 3)
+    print(pd.Series(results).to_string())
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bulk import / export: streaming transfer.py vs whole-frame handling.
+
+For one synthetic requests file (written from the generated dataset, with
+its GroupIDs dropped so the importer regroups the passengers) it measures:
+- import: transfer.import_rows into an empty store, chunked and batched
+- export.frame: what an export was before, a full load followed by to_csv
+- export.stream: transfer.export_rows written to a file chunk by chunk
+
+Peak memory is the tracemalloc peak over each export. The import is only
+timed: tracemalloc slows it down several times over.
+
+    python bench/bench_transfer.py --groups 100k --backend csv
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate  # noqa: E402
+
+
+def measure(name, fn, memory=True):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
+    tracemalloc.stop()
+    return {"step": name, "seconds": round(elapsed, 2),
+            "peak_mb": round(peak / 1024 / 1024, 1) if memory else None}, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", choices=list(SIZES), default="100k")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-transfer-{args.backend}-")
+    os.chdir(workdir)
+    requests = generate(SIZES[args.groups])[0]
+    requests.drop(columns=["GroupID"]).to_csv("import.csv", index=False)
+
+    from storage import open_storage
+    from transfer import export_rows, import_rows
+
+    storage = open_storage(args.backend)
+    results = []
+    row, summary = measure("import", lambda: import_rows(storage, "requests", "import.csv", rejects=None), memory=False)
+    results.append(row)
+
+    def frame():
+        storage.load_requests().to_csv("frame.csv", index=False)
+
+    def stream():
+        with open("stream.csv", "w", encoding="utf-8", newline="") as f:
+            for text in export_rows(storage, "requests"):
+                f.write(text)
+
+    results.append(measure("export.frame", frame)[0])
+    results.append(measure("export.stream", stream)[0])
+    same = pd.read_csv("frame.csv", dtype=str).equals(pd.read_csv("stream.csv", dtype=str))
+
+    print(pd.DataFrame(results).set_index("step").to_string())
+    print(f"rows: {summary['read']}, imported: {summary['imported']} in {summary['groups']} group(s), "
+          f"{summary['commits']} commit(s); streamed export matches: {same}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "groups": args.groups, "results": results,
+                       "import": summary, "consistent": same}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
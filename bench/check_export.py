@@ -0,0 +1,91 @@
+"""Clicks the admin "⬇️ Export" button through AppTest and checks the file.
+
+Runs the app on a synthetic data directory, logs into the admin panel and,
+for every table and format, clicks Export and has Streamlit build the
+download the way a browser click does (the button's data is a callable,
+run by the media file manager when the file is fetched). Each file must
+come back as non-empty bytes whose first line is the header (csv) or a JSON
+object (jsonl). Exits non-zero if any export fails.
+
+    python bench/check_export.py --backend csv
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH, ".."))
+ADMIN_PASS = "check"
+TABLES = {"Booking requests": "requests", "Booked log": "booked_log", "Settlements": "settlements"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--groups", default="1k", help="synthetic groups: a number, or 1k, 10k or 100k")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vitatkal-export-")
+    shutil.copytree(ROOT, workdir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns(".git", "bench", "vitatkal_*", "*.db", "*.arrow"))
+    subprocess.run([sys.executable, os.path.join(BENCH, "generate_data.py"), "--groups", args.groups,
+                    "--backend", args.backend, "--out", workdir], check=True, stdout=subprocess.DEVNULL)
+    sys.path.insert(0, workdir)
+    os.chdir(workdir)
+
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest's runtime only lives for one run; remember which media file
+    # manager each deferred download was registered with
+    managers = {}
+    add_deferred = MediaFileManager.add_deferred
+
+    def remember(self, *args, **kwargs):
+        file_id = add_deferred(self, *args, **kwargs)
+        managers[file_id] = self
+        return file_id
+
+    MediaFileManager.add_deferred = remember
+
+    at = AppTest.from_file(os.path.join(workdir, "vittatkal.py"), default_timeout=120)
+    at.secrets["admin"] = {"pass": ADMIN_PASS}
+    at.secrets["email"] = {"sender": "check@localhost", "password": "", "receiver": "check@localhost",
+                           "host": "127.0.0.1", "port": 1}
+    at.secrets["storage"] = {"backend": args.backend}
+    at.query_params["admin"] = "true"
+    at.run()
+    at.text_input[0].input(ADMIN_PASS).run()
+
+    failed = 0
+    for label, table in TABLES.items():
+        for fmt in ("csv", "jsonl"):
+            at.selectbox(key="export_table").select(label).run()
+            at.selectbox(key="export_format").select(fmt).run()
+            button = at.download_button(key="export_run")
+            file_id = button.proto.deferred_file_id
+            button.click().run()
+            try:
+                if at.exception:
+                    raise RuntimeError(at.exception[0].value)
+                manager = managers[file_id]
+                url = manager.execute_deferred(file_id)
+                content = manager._storage.get_file(url.rsplit("/", 1)[-1].split(".")[0]).content
+                first = content.decode("utf-8").splitlines()[0] if content else ""
+                if fmt == "csv" and not first:
+                    raise ValueError("empty file")
+                if fmt == "jsonl" and content:
+                    json.loads(first)
+                print(f"✅ {table}.{fmt}: {len(content)} bytes")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {table}.{fmt}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
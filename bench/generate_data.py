@@ -0,0 +1,176 @@
+"""Synthetic dataset generator for benchmarks and load tests.
+
+Produces realistic requests, booked-log entries and settlements for a given
+number of booking groups. Groups have 1-6 passengers, mostly 1-2. Journey
+dates are skewed towards weekends, the Onam / Christmas / summer holiday
+peaks and the next few weeks. Output is deterministic for a given seed.
+
+    python bench/generate_data.py --groups 10000 --backend csv --out /tmp/vitatkal-10k
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fileio import atomic_write_csv  # noqa: E402
+from ledger import encode_splits  # noqa: E402
+from migrations import latest_version  # noqa: E402
+from storage import (BOOKED_LOG_COLUMNS, REQUEST_COLUMNS, SETTLEMENT_COLUMNS,  # noqa: E402
+                     DEFAULT_AGENTS, open_storage)
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+FIRST_NAMES = [
+    "Aravind", "Nazmil", "Christy", "Anjali", "Arjun", "Fathima", "Rahul", "Sneha", "Mohammed", "Divya",
+    "Akhil", "Aiswarya", "Vishnu", "Neha", "Abdul", "Lakshmi", "Joel", "Meera", "Sreejith", "Ayesha",
+    "Gokul", "Reshma", "Nikhil", "Parvathy", "Shahid", "Athira", "Jithin", "Nimisha", "Faisal", "Keerthana",
+]
+LAST_NAMES = [
+    "K", "M", "P", "Nair", "Menon", "Thomas", "Joseph", "Rahman", "Pillai", "Varghese",
+    "Kurian", "Haris", "Krishnan", "Das", "George", "Ali", "Mathew", "Babu", "Raj", "Kumar",
+]
+# (boarding, destination, weight): Malabar to the metros dominates
+ROUTES = [
+    ("CLT", "MAS", 18), ("CLT", "SBC", 14), ("KPD", "CLT", 8), ("CLT", "TVC", 9), ("CAN", "MAS", 7),
+    ("ERS", "SBC", 8), ("TCR", "MAS", 5), ("PGT", "MAS", 5), ("CLT", "NDLS", 3), ("MAQ", "CLT", 4),
+    ("CLT", "ERS", 6), ("TVC", "MAS", 4), ("CAN", "SBC", 5), ("CLT", "CSMT", 2), ("SRR", "HYB", 2),
+]
+CLASSES = (["Sleeper", "3A", "2A", "1A", "CC", "2S"], [0.48, 0.27, 0.1, 0.02, 0.05, 0.08])
+PASSENGERS = ([1, 2, 3, 4, 5, 6], [0.45, 0.25, 0.15, 0.09, 0.04, 0.02])
+AGENT_WEIGHTS = [0.5, 0.3, 0.2]
+
+
+def journey_weights(days):
+    weekday = np.array([d.weekday() for d in days])
+    month_day = np.array([(d.month, d.day) for d in days])
+    weights = np.where(weekday >= 4, 1.6, 1.0)  # Fri-Sun travel
+    onam = (month_day[:, 0] == 8) & (month_day[:, 1] >= 20) | (month_day[:, 0] == 9) & (month_day[:, 1] <= 10)
+    christmas = (month_day[:, 0] == 12) & (month_day[:, 1] >= 18) | (month_day[:, 0] == 1) & (month_day[:, 1] <= 3)
+    summer = np.isin(month_day[:, 0], [4, 5])
+    weights = weights * np.where(onam, 3.0, 1.0) * np.where(christmas, 2.5, 1.0) * np.where(summer, 1.5, 1.0)
+    return weights / weights.sum()
+
+
+def generate(groups, seed=7, today=None):
+    """Return (requests, booked_log, settlements) DataFrames for `groups` booking groups."""
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+
+    # Journey dates across the past year and the next 60 days
+    days = [today - timedelta(days=365) + timedelta(days=i) for i in range(426)]
+    journey = pd.to_datetime(rng.choice(days, size=groups, p=journey_weights(days)))
+    # Requests arrive at the Tatkal window (the day before) or a few days ahead
+    lead = rng.choice([1, 1, 1, 2, 3, 5, 7], size=groups)
+    submitted = journey - pd.to_timedelta(lead, unit="D")
+
+    passengers = rng.choice(PASSENGERS[0], size=groups, p=PASSENGERS[1])
+    route = rng.choice(len(ROUTES), size=groups, p=np.array([r[2] for r in ROUTES]) / sum(r[2] for r in ROUTES))
+    train_class = rng.choice(CLASSES[0], size=groups, p=CLASSES[1])
+    phone = rng.integers(6_000_000_000, 9_999_999_999, size=groups).astype(str)
+    past = journey.date < today
+    booked = rng.random(groups) < np.where(past, 0.9, 0.3)
+    status = np.where(booked, "Booked ✅", "Pending")
+    ms = (submitted.asi8 // 1_000_000) + 36_000_000  # 10:00 on the submission day
+    group_ids = [f"G{m + i // 1000:013d}{i % 1000:03d}{h:04x}"
+                 for i, (m, h) in enumerate(zip(ms, rng.integers(0, 0xFFFF, size=groups)))]
+
+    # One row per passenger
+    owner = np.repeat(np.arange(groups), passengers)
+    rows = len(owner)
+    first = rng.choice(FIRST_NAMES, size=rows)
+    last = rng.choice(LAST_NAMES, size=rows)
+    requests = pd.DataFrame({
+        "Name": np.char.add(np.char.add(first, " "), last),
+        "Age": rng.integers(3, 80, size=rows),
+        "Gender": rng.choice(["Male", "Female"], size=rows),
+        "Class": train_class[owner],
+        "Boarding Station": np.array([r[0] for r in ROUTES])[route][owner],
+        "Destination": np.array([r[1] for r in ROUTES])[route][owner],
+        "Phone": phone[owner],
+        "Date of Journey": journey.strftime("%Y-%m-%d")[owner],
+        "Date": submitted.strftime("%Y-%m-%d")[owner],
+        "Status": status[owner],
+        "GroupID": np.array(group_ids)[owner],
+    }, columns=REQUEST_COLUMNS)
+
+    # A booked-log entry per booked group, named after its first passenger
+    lead_rows = requests.drop_duplicates("GroupID")
+    booked_groups = lead_rows[booked]
+    agents = list(DEFAULT_AGENTS)
+    booked_agent = rng.choice(agents, size=len(booked_groups), p=AGENT_WEIGHTS)
+    template = rng.random(len(booked_groups)) < 0.8  # most bookings use the default 50/25/25
+    booked_log = pd.DataFrame({
+        "Customer Name": booked_groups["Name"].to_numpy(),
+        "Date of Journey": booked_groups["Date of Journey"].to_numpy(),
+        "Agent": booked_agent,
+        "Profit": passengers[booked] * rng.integers(8, 16, size=len(booked_groups)) * 10.0,
+        "Splits": np.where(template, encode_splits({a: DEFAULT_AGENTS[a]["split"] for a in agents}),
+                           encode_splits(dict(zip(agents, [40, 30, 30])))),
+        "GroupID": booked_groups["GroupID"].to_numpy(),
+    }, columns=BOOKED_LOG_COLUMNS)
+
+    # Settlements: part-payments per agent per past month, covering most of
+    # the agent's share; busier datasets settle in more, smaller payments
+    months = pd.to_datetime(booked_log["Date of Journey"]).dt.to_period("M")
+    monthly = booked_log.groupby(months)["Profit"].sum()
+    settlements = []
+    for month, profit in monthly.items():
+        if month.to_timestamp().date() > today:
+            continue
+        for agent in agents:
+            parts = int(rng.integers(1, 4)) * max(1, groups // 4000)
+            for part in range(parts):
+                settlements.append({
+                    "Agent": agent,
+                    "Amount": round(profit / len(agents) * rng.uniform(0.7, 1.0) / parts, -1),
+                    "Date": (month.to_timestamp() + pd.Timedelta(days=int(rng.integers(5, 28)))).strftime("%Y-%m-%d"),
+                    "Notes": f"Part payment {part + 1}",
+                })
+    return requests, booked_log, pd.DataFrame(settlements, columns=SETTLEMENT_COLUMNS)
+
+
+def write_dataset(out_dir, backend, requests, booked_log, settlements):
+    """Write the frames as a fully migrated data directory for `backend`."""
+    os.makedirs(out_dir, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(out_dir)
+    try:
+        storage = open_storage(backend)
+        if backend == "csv":
+            atomic_write_csv(requests, storage.requests_file)
+            atomic_write_csv(booked_log, storage.booked_log_file)
+            atomic_write_csv(settlements, storage.settlement_file)
+        else:
+            def records(df):
+                return df.astype(object).where(pd.notna(df), None).to_dict("records")
+            storage.add_requests(records(requests))
+            storage._insert("booked_log", BOOKED_LOG_COLUMNS, records(booked_log))
+            storage._insert("settlements", SETTLEMENT_COLUMNS, records(settlements))
+        storage.save_agents(DEFAULT_AGENTS)
+        storage.set_schema_version(latest_version())
+    finally:
+        os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", default="1k", help="number of groups, or one of " + ", ".join(SIZES))
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", required=True, help="data directory to create")
+    args = parser.parse_args()
+
+    groups = SIZES.get(args.groups) or int(args.groups)
+    requests, booked_log, settlements = generate(groups, seed=args.seed)
+    write_dataset(args.out, args.backend, requests, booked_log, settlements)
+    print(f"✅ {groups} groups / {len(requests)} passengers / {len(booked_log)} booked / "
+          f"{len(settlements)} settlements written to {args.out} ({args.backend})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Headless benchmark suite for the data paths and pages.
+
+For each backend and dataset size it generates a synthetic data directory
+(see generate_data.py) and times the following:
+- the storage calls behind load_data / save_booking / the status mutations
+- the finance aggregation, both the raw vectorised pass and the
+  materialised ledger
+- a full render of the user form and the admin panel through Streamlit's
+  AppTest
+- archiving past months, then the hot-only load and one lazy archived month
+
+Every combination runs in its own process so caches and open connections
+never leak between datasets. Results go to a JSON report. Two reports can
+be compared across commits:
+
+    python bench/run_bench.py --sizes 1k 10k --backends csv sqlite
+    python bench/run_bench.py --compare bench/reports/<old>.json bench/reports/<new>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from multiprocessing import Process, Queue
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from generate_data import SIZES, generate, write_dataset  # noqa: E402
+
+REPORTS_DIR = os.path.join(ROOT, "bench", "reports")
+ADMIN_PASS = "bench"
+BULK = 20  # groups per bulk action
+REGRESSION = 1.2  # flag benchmarks that got 20% slower in --compare
+
+
+def measure(fn, repeat, setup=None):
+    samples = []
+    for i in range(repeat):
+        args = setup(i) if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarise(name, samples):
+    s = pd.Series(samples) * 1000
+    return {"benchmark": name, "n": len(samples), "median_ms": round(s.median(), 3),
+            "p95_ms": round(s.quantile(0.95), 3), "min_ms": round(s.min(), 3), "max_ms": round(s.max(), 3)}
+
+
+# ---------- Data paths ----------
+def bench_storage(backend, repeat):
+    from cache import CachedStorage
+    from ledger import AgentLedger, compute_balances, default_shares
+    from rollups import Rollups
+    from booking_index import GroupIndex
+    from storage import open_storage, new_group_id
+
+    def app_storage():
+        # Same stack get_storage() builds
+        return CachedStorage(open_storage(backend), listeners=[AgentLedger(), Rollups()])
+
+    results = []
+    results.append(summarise("load_data.cold", measure(lambda: app_storage().load_requests(), repeat)))
+    storage = app_storage()
+    storage.load_requests()
+    results.append(summarise("load_data.cached", measure(storage.load_requests, repeat)))
+    results.append(summarise("group_index.build", measure(lambda: GroupIndex(storage.load_requests()), repeat)))
+
+    # Materialised views are rebuilt once up front so mutations time the incremental path
+    results.append(summarise("views.rebuild", measure(
+        lambda: (AgentLedger().rebuild(storage), Rollups().rebuild(storage)), 1)))
+
+    def new_group(i):
+        group_id = new_group_id()
+        return ([{"Name": f"Bench {i}", "Age": 30, "Gender": "Male", "Class": "Sleeper",
+                  "Boarding Station": "CLT", "Destination": "MAS", "Phone": "9000000000",
+                  "Date of Journey": "2026-01-15", "Date": "2026-01-14", "Status": "Pending",
+                  "GroupID": group_id}],)
+    results.append(summarise("save_booking", measure(storage.add_requests, repeat, new_group)))
+
+    pending = storage.load_requests("Pending")["GroupID"].drop_duplicates().tolist()
+    targets = iter(pending)
+    results.append(summarise("mark_as_booked", measure(
+        lambda g: storage.set_group_status(g, "Booked ✅"), repeat, lambda i: (next(targets),))))
+    booked = iter(pending[:repeat])
+    results.append(summarise("mark_as_pending", measure(
+        lambda g: storage.set_group_status(g, "Pending"), repeat, lambda i: (next(booked),))))
+    doomed = iter(pending[repeat:])
+    results.append(summarise("delete_booking", measure(storage.delete_group, repeat, lambda i: (next(doomed),))))
+    bulk = iter([pending[2 * repeat + BULK * i:2 * repeat + BULK * (i + 1)] for i in range(repeat)])
+    results.append(summarise(f"bulk_mark_as_booked.{BULK}", measure(
+        lambda ids: storage.set_groups_status(ids, "Booked ✅"), repeat, lambda i: (next(bulk),))))
+
+    results.append(summarise("finance.compute", measure(
+        lambda: compute_balances(storage.load_booked_log(), storage.load_settlements(),
+                                 default_shares(storage.load_agents())), repeat)))
+    results.append(summarise("finance.materialised", measure(lambda: AgentLedger().balances(storage), repeat)))
+    results.append(summarise("rollups.frame", measure(lambda: Rollups().frame(storage), repeat)))
+    return results
+
+
+# ---------- Pages ----------
+# Streamlit runs every tab body on each script run, so one admin render
+# covers all four admin tabs.
+def bench_pages(backend, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    def app(admin=False):
+        at = AppTest.from_file(os.path.join(ROOT, "vittatkal.py"), default_timeout=900)
+        at.secrets["admin"] = {"pass": ADMIN_PASS}
+        at.secrets["email"] = {"sender": "bench@localhost", "password": "", "receiver": "bench@localhost",
+                               "host": "127.0.0.1", "port": 1}
+        at.secrets["storage"] = {"backend": backend}
+        if admin:
+            at.query_params["admin"] = "true"
+        return at
+
+    def check(at):
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    def render_user():
+        check(app().run())
+
+    def admin_login():
+        at = app(admin=True).run()
+        at.text_input[0].input(ADMIN_PASS)
+        return (at,)
+
+    def render_admin(at):
+        check(at.run())
+
+    return [
+        summarise("render.user_form.first", measure(render_user, 1)),
+        summarise("render.user_form", measure(render_user, repeat)),
+        summarise("render.admin.first", measure(render_admin, 1, lambda i: admin_login())),
+        summarise("render.admin", measure(render_admin, repeat, lambda i: admin_login())),
+    ]
+
+
+# ---------- Month partitions ----------
+# Runs last: archives every journey before the current month, then times the
+# hot-only load and a lazy load of one archived month.
+def bench_archive(backend, repeat):
+    from archive import archive_before
+    from cache import CachedStorage
+    from storage import open_storage
+
+    results = [summarise("archive.before_this_month", measure(
+        lambda: archive_before(open_storage(backend), datetime.now().strftime("%Y-%m")), 1))]
+    results.append(summarise("load_data.hot", measure(lambda: open_storage(backend).load_requests(), repeat)))
+    months = open_storage(backend).archived_months("booked_log")
+    if months:
+        results.append(summarise("load_archived.month", measure(
+            lambda: CachedStorage(open_storage(backend)).load_archived("booked_log", [months[-1]]), repeat)))
+    return results
+
+
+def run_case(backend, size, repeat, pages, queue):
+    workdir = tempfile.mkdtemp(prefix=f"vitatkal-bench-{backend}-{size}-")
+    frames = generate(SIZES[size])
+    write_dataset(workdir, backend, *frames)
+    os.chdir(workdir)
+
+    results = bench_storage(backend, repeat)
+    if pages:
+        results += bench_pages(backend, repeat)
+    results += bench_archive(backend, repeat)
+    for r in results:
+        r.update(backend=backend, size=size, groups=SIZES[size], rows=len(frames[0]))
+    queue.put(results)
+
+
+def git_commit():
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                             cwd=ROOT, text=True).strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run(args):
+    import streamlit
+
+    sha, dirty = git_commit()
+    report = {
+        "commit": sha,
+        "dirty": dirty,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for size in args.sizes:
+        for backend in args.backends:
+            queue = Queue()
+            proc = Process(target=run_case, args=(backend, size, args.repeat, not args.no_pages, queue))
+            proc.start()
+            results = queue.get()
+            proc.join()
+            report["results"] += results
+            for r in results:
+                print(f"{backend:6} {size:>4} {r['benchmark']:28} median {r['median_ms']:10.2f} ms  p95 {r['p95_ms']:10.2f} ms")
+
+    out = args.out or os.path.join(REPORTS_DIR, f"{(sha or 'nocommit')[:10]}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Report written to {out}")
+
+
+def compare(base_file, new_file):
+    def frame(path):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        df = pd.DataFrame(report["results"]).set_index(["backend", "size", "benchmark"])["median_ms"]
+        return report.get("commit") or path, df
+
+    base_name, base = frame(base_file)
+    new_name, new = frame(new_file)
+    table = pd.DataFrame({"base_ms": base, "new_ms": new}).dropna()
+    table["ratio"] = (table["new_ms"] / table["base_ms"]).round(2)
+    print(f"base {base_name[:10]}  vs  new {new_name[:10]}")
+    print(table.to_string())
+    slower = table[table["ratio"] > REGRESSION]
+    if not slower.empty:
+        print(f"❌ {len(slower)} benchmark(s) more than {REGRESSION:.0%} of base")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["1k", "10k"])
+    parser.add_argument("--backends", nargs="+", choices=["csv", "sqlite"], default=["csv", "sqlite"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-pages", action="store_true", help="skip the AppTest page renders")
+    parser.add_argument("--out", help="report path (default bench/reports/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two reports and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare))
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Concurrent-submission stress test for the 10:00 IST burst.
+
+Fires hundreds of booking submissions from several processes, each with
+several threads, at one data directory. Then checks that no submission was
+lost and that no two submissions were merged into one group.
+
+    python bench/stress_submit.py --backend csv --processes 4 --threads 8 --per-thread 25
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from storage import open_storage, new_group_id  # noqa: E402
+
+
+def make_group(worker, n):
+    group_id = new_group_id()
+    passengers = random.randint(1, 4)
+    return group_id, [{
+        "Name": f"W{worker}-S{n}-P{p}",
+        "Age": 30,
+        "Gender": "Male",
+        "Class": random.choice(["Sleeper", "3A", "2A"]),
+        "Boarding Station": "CLT",
+        "Destination": "MAS",
+        "Phone": f"9{worker:04d}{n:05d}",
+        "Date of Journey": "2026-01-15",
+        "Date": "2026-01-14",
+        "Status": "Pending",
+        "GroupID": group_id,
+    } for p in range(passengers)]
+
+
+def run_process(proc, args):
+    os.chdir(args.workdir)
+    storage = open_storage(args.backend)
+    if args.backend == "csv":
+        storage.journal.compact_every = args.compact_every
+
+    def submit(thread):
+        worker = proc * 100 + thread
+        for n in range(args.per_thread):
+            _, rows = make_group(worker, n)
+            storage.add_requests(rows)
+
+    threads = [threading.Thread(target=submit, args=(t,)) for t in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--per-thread", type=int, default=25)
+    parser.add_argument("--compact-every", type=int, default=200)
+    parser.add_argument("--workdir", default=None)
+    args = parser.parse_args()
+    args.workdir = args.workdir or tempfile.mkdtemp(prefix="vitatkal-stress-")
+
+    expected = args.processes * args.threads * args.per_thread
+    start = time.perf_counter()
+    procs = [Process(target=run_process, args=(p, args)) for p in range(args.processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    os.chdir(args.workdir)
+    df = open_storage(args.backend).load_requests()
+    groups = df.groupby("GroupID")
+    # A merged group would mix names from different submissions (W<worker>-S<n>)
+    merged = sum(1 for _, g in groups if g["Name"].str.rsplit("-", n=1).str[0].nunique() > 1)
+    submitted = df["Name"].str.rsplit("-", n=1).str[0].nunique()
+
+    print(f"backend={args.backend} submissions={expected} in {elapsed:.2f}s ({expected / elapsed:.0f}/s)")
+    print(f"groups stored={groups.ngroups} distinct submissions={submitted} merged={merged} workdir={args.workdir}")
+    if groups.ngroups != expected or submitted != expected or merged:
+        print("❌ Lost or merged submissions")
+        sys.exit(1)
+    print("✅ No submissions lost or merged")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import bisect
+import threading
+from collections import deque
+
+import pandas as pd
+
+from metrics import span
+
+VIEW_UPCOMING_PENDING = "Upcoming + Pending"
+VIEW_UPCOMING = "Upcoming"
+VIEW_PENDING = "Pending"
+VIEW_BOOKED = "Booked"
+VIEW_ALL = "All"
+VIEWS = [VIEW_UPCOMING_PENDING, VIEW_UPCOMING, VIEW_PENDING, VIEW_BOOKED, VIEW_ALL]
+HISTORY = 1000  # change-feed events remembered for changed_since
+
+
+# ---------- Per-group index over the requests table ----------
+# Built once per data version: one summary row per group, plus a sorted
+# token list for prefix search on passenger names, phone and group ID.
+class GroupIndex:
+    def __init__(self, df, cursor=None):
+        self.rows = _dated(df)
+        self.groups = _summary(self.rows)
+        self.tokens = sorted(_tokens(self.rows))
+        self.keys = [token for token, _ in self.tokens]
+        self.cursor = cursor  # change-feed position the index reflects
+
+    # A new index with change-feed events applied; only the groups they
+    # touch are re-summarised and re-tokenised
+    def patch(self, events, cursor):
+        submitted, status, deleted = {}, {}, set()
+        for event in events:
+            for group_id in event["group_ids"]:
+                if event["op"] == "submit":
+                    submitted[group_id] = event["rows"]
+                    deleted.discard(group_id)
+                elif event["op"] == "status":
+                    status[group_id] = event["status"]
+                elif event["op"] == "delete":
+                    submitted.pop(group_id, None)
+                    status.pop(group_id, None)
+                    deleted.add(group_id)
+
+        # Replaced or deleted groups already in the index are dropped first
+        removed = {g for g in set(submitted) | deleted if g in self.groups.index}
+        rows, groups, tokens, keys = self.rows, self.groups, self.tokens, self.keys
+        if removed:
+            rows = rows[~rows["GroupID"].isin(removed)]
+            groups = groups[~groups.index.isin(removed)]
+            tokens = [t for t in tokens if t[1] not in removed]
+            keys = [token for token, _ in tokens]
+
+        added = [row for group in submitted.values() for row in group]
+        if added:
+            # Same dtypes as the typed frame, so the concat is a plain copy
+            rows, added = _conform(rows, _dated(pd.DataFrame(added).reindex(columns=rows.columns)))
+            rows = pd.concat([rows, added], ignore_index=True) if not rows.empty else added
+            new_groups = _summary(added)
+            groups, new_groups = _conform(groups, new_groups.reindex(columns=groups.columns))
+            groups = pd.concat([groups, new_groups]) if not groups.empty else new_groups
+            new_tokens = sorted(_tokens(added))
+            if len(new_tokens) > 1000:
+                tokens = sorted(tokens + new_tokens)
+                keys = [token for token, _ in tokens]
+            else:
+                tokens, keys = list(tokens), list(keys)
+                for token in new_tokens:
+                    i = bisect.bisect_left(tokens, token)
+                    tokens.insert(i, token)
+                    keys.insert(i, token[0])
+        if status:
+            rows = _with_status(rows, rows["GroupID"], status)
+            groups = _with_status(groups, groups.index, status)
+
+        index = GroupIndex.__new__(GroupIndex)
+        index.rows, index.groups, index.tokens, index.keys = rows, groups, tokens, keys
+        index.cursor = cursor
+        return index
+
+    @property
+    def nbytes(self):
+        return int(self.rows.memory_usage(deep=True).sum() + self.groups.memory_usage(deep=True).sum()) + 100 * len(self.keys)
+
+    def search(self, query):
+        matches = None
+        for word in query.lower().split():
+            start = bisect.bisect_left(self.keys, word)
+            end = bisect.bisect_left(self.keys, word + "\uffff")
+            found = {group_id for _, group_id in self.tokens[start:end]}
+            matches = found if matches is None else matches & found
+        return matches or set()
+
+    def select(self, view, query="", today=None, booked_status="Booked ✅"):
+        groups = self.groups
+        if query.strip():
+            groups = groups[groups.index.isin(self.search(query))]
+
+        today = pd.Timestamp(today or pd.Timestamp.now().date())
+        upcoming = groups["Date of Journey"] >= today
+        pending = groups["Status"] != booked_status
+        if view == VIEW_UPCOMING_PENDING:
+            groups = groups[upcoming & pending]
+        elif view == VIEW_UPCOMING:
+            groups = groups[upcoming]
+        elif view == VIEW_PENDING:
+            groups = groups[pending]
+        elif view == VIEW_BOOKED:
+            groups = groups[~pending]
+
+        # Upcoming views read soonest-first; history reads newest-first
+        ascending = view in (VIEW_UPCOMING_PENDING, VIEW_UPCOMING)
+        return groups.sort_values("Date of Journey", ascending=ascending, kind="stable")
+
+    def page_rows(self, group_ids):
+        return self.rows[self.rows["GroupID"].isin(group_ids)]
+
+
+def _dated(df):
+    df = df.assign(**{"Date of Journey": pd.to_datetime(df["Date of Journey"], errors="coerce")})
+    return df.dropna(subset=["Date of Journey", "GroupID"])
+
+
+def _summary(rows):
+    by_group = rows.groupby("GroupID", sort=False)
+    groups = by_group.first()
+    groups["Passengers"] = by_group.size()
+    return groups
+
+
+def _conform(base, added):
+    # Cast new rows to the base frame's dtypes; categoricals gain any new values
+    for col, dtype in base.dtypes.items():
+        if col not in added or added[col].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            new = [v for v in added[col].dropna().unique() if v not in dtype.categories]
+            if new:
+                base = base.assign(**{col: base[col].cat.add_categories(new)})
+                dtype = base.dtypes[col]
+            added = added.assign(**{col: added[col].astype(dtype)})
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            added = added.assign(**{col: pd.to_datetime(added[col], errors="coerce").astype(dtype)})
+        elif pd.api.types.is_numeric_dtype(dtype):
+            added = added.assign(**{col: pd.to_numeric(added[col], errors="coerce")})
+    return base, added
+
+
+def _with_status(df, group_ids, status):
+    # Only the rows of groups in `status` are looked up and changed
+    mask = group_ids.isin(list(status))
+    if not mask.any():
+        return df
+    column = df["Status"].copy()
+    new = [v for v in set(status.values()) if isinstance(column.dtype, pd.CategoricalDtype) and v not in column.cat.categories]
+    if new:
+        column = column.cat.add_categories(new)
+    column[mask] = [status[g] for g in group_ids[mask]]
+    return df.assign(Status=column)
+
+
+def _tokens(rows):
+    tokens = set()
+    for group_id, name, phone in zip(rows["GroupID"], rows["Name"], rows["Phone"]):
+        for word in str(name).lower().split():
+            tokens.add((word, group_id))
+        tokens.add((str(phone), group_id))
+        tokens.add((str(group_id).lower(), group_id))
+    return tokens
+
+
+# ---------- Live index over the change feed ----------
+# One per process, shared by every admin session. A refresh with nothing
+# written costs a version check; otherwise only the feed events since the
+# index's cursor are read and patched in. It falls back to a full rebuild
+# when the feed can't account for every write (first use, journal
+# compaction past the cursor, a pruned SQLite change log, migrations).
+class LiveGroupIndex:
+    def __init__(self, history=HISTORY):
+        self.index = None
+        self.version = None
+        self.changes = deque(maxlen=history)  # (seq, group_ids), oldest first
+        self.floor = None  # oldest cursor changed_since can still answer
+        self.lock = threading.Lock()
+
+    def refresh(self, storage, load):
+        with self.lock:
+            version = storage.version("requests")
+            if self.index is not None and version == self.version:
+                return self.index
+            events = None
+            if self.index is not None:
+                cursor, events = storage.changes_since(self.index.cursor)
+            if events is None:
+                # Cursor first: a write racing the load is replayed again
+                # next time, which is harmless as events are idempotent
+                cursor = storage.change_cursor()
+                with span("build.requests.group_index"):
+                    self.index = GroupIndex(load(), cursor)
+                self.changes.clear()
+                self.floor = cursor
+            elif events:
+                with span("patch.requests.group_index"):
+                    self.index = self.index.patch(events, cursor)
+                for event in events:
+                    if len(self.changes) == self.changes.maxlen:
+                        self.floor = self.changes[0][0]
+                    self.changes.append((event["seq"], event["group_ids"]))
+            self.version = version
+            return self.index
+
+    # Groups written after `cursor`, or None if that is older than this
+    # process can tell (the caller should rerender in full)
+    def changed_since(self, cursor):
+        with self.lock:
+            if cursor is None or self.floor is None or cursor < self.floor:
+                return None
+            return {g for seq, group_ids in self.changes if seq > cursor for g in group_ids}
@@ -0,0 +1,340 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from metrics import incr, span
+from snapshot import to_typed
+from storage import Storage, match_any
+
+MAX_ENTRIES = 32
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# ---------- Version-keyed LRU cache ----------
+# Entries remember the table version they were built from; a lookup with a
+# different version is a miss. Size is bounded by entry count and bytes.
+class FrameCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, version, loader):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                incr("cache_hits_total", table=key[0])
+                return _copy(entry[1])
+            self.misses += 1
+            incr("cache_misses_total", table=key[0])
+
+        value = loader()
+        with self.lock:
+            self._drop(key)
+            size = _size(value)
+            if size <= self.max_bytes:
+                self.entries[key] = (version, value, size)
+                self.bytes += size
+                while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                    self._drop(next(iter(self.entries)))
+        return _copy(value)
+
+    def invalidate(self, table=None):
+        with self.lock:
+            for key in [k for k in self.entries if table is None or k[0] == table]:
+                self._drop(key)
+
+    def _drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+
+def _copy(value):
+    return value.copy() if isinstance(value, (pd.DataFrame, dict)) else value
+
+
+def _size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return getattr(value, "nbytes", 64)
+
+
+# ---------- Current rows per group ----------
+# What a status change or delete is about to replace, for the listeners'
+# deltas. The requests table is read once, sorted by GroupID; groups written
+# since are kept aside, followed from the change feed. A write then finds
+# its old rows without reloading the table. After REBUILD_AFTER changed
+# groups, the next lookup reads the table afresh.
+REBUILD_AFTER = 1000
+
+
+class GroupRows:
+    def __init__(self, rebuild_after=REBUILD_AFTER):
+        self.rebuild_after = rebuild_after
+        self.base = None     # requests as of the build, sorted by GroupID
+        self.ids = None      # its GroupID column, for binary search
+        self.changed = {}    # group_id -> rows written since the build ([] once deleted)
+        self.cursor = None
+        self.lock = threading.Lock()
+
+    def get(self, storage, group_ids):
+        with self.lock:
+            self._refresh(storage)
+            return [dict(row) for group_id in dict.fromkeys(group_ids) for row in self._rows(group_id)]
+
+    def _refresh(self, storage):
+        events = None
+        if self.cursor is not None and len(self.changed) < self.rebuild_after:
+            cursor, events = storage.changes_since(self.cursor)
+        if events is None:
+            cursor = storage.change_cursor()
+            with span("build.requests.group_rows"):
+                df = storage.load_requests()
+                df = df[df["GroupID"].notna()]
+                self.base = df.assign(GroupID=df["GroupID"].astype(str)).sort_values("GroupID", kind="stable")
+                self.ids = self.base["GroupID"].to_numpy()
+            self.changed = {}
+        else:
+            for event in events:
+                for group_id in event["group_ids"]:
+                    if event["op"] == "submit":
+                        self.changed[group_id] = event["rows"]
+                    elif event["op"] == "status":
+                        self.changed[group_id] = [dict(row, Status=event["status"]) for row in self._rows(group_id)]
+                    elif event["op"] == "delete":
+                        self.changed[group_id] = []
+        self.cursor = cursor
+
+    def _rows(self, group_id):
+        if group_id in self.changed:
+            return self.changed[group_id]
+        start = self.ids.searchsorted(group_id, side="left")
+        end = self.ids.searchsorted(group_id, side="right")
+        return self.base.iloc[start:end].to_dict("records")
+
+
+# ---------- Caching wrapper around any storage backend ----------
+class CachedStorage(Storage):
+    def __init__(self, inner, cache=None, listeners=(), snapshots=()):
+        self.inner = inner
+        self.cache = cache or FrameCache()
+        self.listeners = list(listeners)
+        self.snapshots = {snapshot.table: snapshot for snapshot in snapshots}
+        self.group_rows = GroupRows()
+        self.write_lock = threading.RLock()
+
+    def _cached(self, table, name, *args):
+        def load():
+            with span(f"load.{table}.{name}"):
+                return getattr(self.inner, name)(*args)
+
+        return self.cache.get((table, name, args), self.inner.version(table), load)
+
+    def version(self, table):
+        return self.inner.version(table)
+
+    # Structures derived from a table (indexes, rollups) share its versioning;
+    # "archive" versions by the archive manifest instead
+    def derived(self, table, name, builder):
+        def build():
+            with span(f"build.{table}.{name}"):
+                return builder()
+
+        version = self.inner.archive_version() if table == "archive" else self.inner.version(table)
+        return self.cache.get((table, name, ()), version, build)
+
+    # Reads
+    def load_requests(self, status=None):
+        return self._cached("requests", "load_requests", status)
+
+    def get_group(self, group_id):
+        return self._cached("requests", "get_group", group_id)
+
+    def count_groups(self, status=None):
+        return self._cached("requests", "count_groups", status)
+
+    def load_booked_log(self):
+        return self._cached("booked_log", "load_booked_log")
+
+    def load_settlements(self):
+        return self._cached("settlements", "load_settlements")
+
+    def load_agents(self):
+        return self._cached("agents", "load_agents")
+
+    # Typed frame (parsed dates, categoricals) for admin reads, from the
+    # table's columnar snapshot when one is configured
+    def load_typed(self, table):
+        def load():
+            with span(f"load.{table}.typed"):
+                if table in self.snapshots:
+                    return self.snapshots[table].load(self.inner)
+                source = self.inner.load_requests() if table == "requests" else self.inner.load_booked_log()
+                return to_typed(source, table)
+
+        return self.cache.get((table, "load_typed", ()), self.inner.version(table), load)
+
+    # Archived months are loaded lazily, one cached partition per month
+    def archived_months(self, table):
+        return self.inner.archived_months(table)
+
+    def load_archived(self, table, months):
+        def load(month):
+            with span(f"load.archive.{table}"):
+                return self.inner.load_archived(table, [month])
+
+        frames = [self.cache.get(("archive", table, (month,)), self.inner.archive_version(), lambda: load(month))
+                  for month in months]
+        return pd.concat(frames, ignore_index=True) if frames else self.inner.load_archived(table, [])
+
+    def archive_version(self):
+        return self.inner.archive_version()
+
+    # Writes invalidate the table they touch and tell listeners (materialised
+    # views such as the agent ledger) which rows changed. Old rows are only
+    # looked up when some listener follows that table. Writes from this
+    # process are serialised so each listener sees the versions its delta
+    # started from; interleaved sessions would otherwise force full rebuilds.
+    def _apply(self, table, write, old_rows=lambda: [], new_rows=lambda old: []):
+        with self.write_lock:
+            interested = [l for l in self.listeners if table in l.TABLES]
+            old = list(old_rows()) if interested else []
+            befores = [{t: self.inner.version(t) for t in l.TABLES} for l in interested]
+            with span(f"write.{table}"):
+                result = write()
+            self.cache.invalidate(table)
+            new = list(new_rows(old)) if interested else []
+            for listener, before in zip(interested, befores):
+                with span(f"view.{type(listener).__name__}"):
+                    listener.on_change(self, table, old, new, before)
+            return result
+
+    def _rows(self, df, row_ids):
+        return [df.loc[i].to_dict() for i in row_ids if i in df.index]
+
+    def add_requests(self, rows):
+        incr("submissions_total")
+        incr("passengers_total", len(rows))
+        return self._apply("requests", lambda: self.inner.add_requests(rows),
+                           new_rows=lambda old: rows)
+
+    def add_request_groups(self, groups):
+        rows = [row for group in groups for row in group]
+        incr("submissions_total", len(groups))
+        incr("passengers_total", len(rows))
+        return self._apply("requests", lambda: self.inner.add_request_groups(groups),
+                           new_rows=lambda old: rows)
+
+    def set_group_status(self, group_id, status):
+        incr("status_changes_total")
+        return self._apply("requests", lambda: self.inner.set_group_status(group_id, status),
+                           old_rows=lambda: self._groups([group_id]),
+                           new_rows=lambda old: [dict(r, Status=status) for r in old])
+
+    def delete_group(self, group_id):
+        incr("deletes_total")
+        return self._apply("requests", lambda: self.inner.delete_group(group_id),
+                           old_rows=lambda: self._groups([group_id]))
+
+    def set_groups_status(self, group_ids, status):
+        incr("status_changes_total", len(group_ids))
+        return self._apply("requests", lambda: self.inner.set_groups_status(group_ids, status),
+                           old_rows=lambda: self._groups(group_ids),
+                           new_rows=lambda old: [dict(r, Status=status) for r in old])
+
+    def delete_groups(self, group_ids):
+        incr("deletes_total", len(group_ids))
+        return self._apply("requests", lambda: self.inner.delete_groups(group_ids),
+                           old_rows=lambda: self._groups(group_ids))
+
+    # Streamed straight from the backend; exports bypass the cache
+    def iter_table(self, table, chunksize):
+        return self.inner.iter_table(table, chunksize)
+
+    # Change feed (see Storage.changes_since); read straight through
+    def change_cursor(self):
+        return self.inner.change_cursor()
+
+    def changes_since(self, cursor):
+        with span("feed.requests"):
+            return self.inner.changes_since(cursor)
+
+    # Rows of the groups a write is about to change, without a table reload
+    def _groups(self, group_ids):
+        return self.group_rows.get(self.inner, group_ids)
+
+    def add_booked_log(self, entry):
+        return self._apply("booked_log", lambda: self.inner.add_booked_log(entry),
+                           new_rows=lambda old: [entry])
+
+    def add_booked_log_many(self, entries):
+        return self._apply("booked_log", lambda: self.inner.add_booked_log_many(entries),
+                           new_rows=lambda old: entries)
+
+    def update_booked_log(self, row_id, entry):
+        return self._apply("booked_log", lambda: self.inner.update_booked_log(row_id, entry),
+                           old_rows=lambda: self._rows(self.load_booked_log(), [row_id]),
+                           new_rows=lambda old: [dict(r, **entry) for r in old])
+
+    def delete_booked_log(self, row_id):
+        return self._apply("booked_log", lambda: self.inner.delete_booked_log(row_id),
+                           old_rows=lambda: self._rows(self.load_booked_log(), [row_id]))
+
+    # GroupID -> booked-log row ids, rebuilt once per booked_log version
+    def booked_log_index(self):
+        def build():
+            df = self.load_booked_log()
+            return {group_id: list(rows) for group_id, rows in df.groupby("GroupID").groups.items()}
+
+        return self.derived("booked_log", "group_index", build)
+
+    def delete_booked_log_groups(self, group_ids):
+        def keyed():
+            index = self.booked_log_index()
+            return self._rows(self.load_booked_log(), [i for g in group_ids for i in index.get(g, [])])
+
+        return self._apply("booked_log", lambda: self.inner.delete_booked_log_groups(group_ids),
+                           old_rows=keyed)
+
+    def delete_booked_log_rows(self, row_ids):
+        return self._apply("booked_log", lambda: self.inner.delete_booked_log_rows(row_ids),
+                           old_rows=lambda: self._rows(self.load_booked_log(), row_ids))
+
+    def delete_booked_log_matching(self, criteria):
+        return self.delete_booked_log_matching_any([criteria])
+
+    def delete_booked_log_matching_any(self, criteria_list):
+        def matching():
+            df = self.load_booked_log()
+            return df[match_any(df, criteria_list)].to_dict("records")
+
+        return self._apply("booked_log", lambda: self.inner.delete_booked_log_matching_any(criteria_list),
+                           old_rows=matching)
+
+    def add_settlement(self, entry):
+        return self._apply("settlements", lambda: self.inner.add_settlement(entry),
+                           new_rows=lambda old: [entry])
+
+    def update_settlement(self, row_id, entry):
+        return self._apply("settlements", lambda: self.inner.update_settlement(row_id, entry),
+                           old_rows=lambda: self._rows(self.load_settlements(), [row_id]),
+                           new_rows=lambda old: [dict(r, **entry) for r in old])
+
+    def delete_settlement(self, row_id):
+        return self._apply("settlements", lambda: self.inner.delete_settlement(row_id),
+                           old_rows=lambda: self._rows(self.load_settlements(), [row_id]))
+
+    def add_settlements(self, entries):
+        return self._apply("settlements", lambda: self.inner.add_settlements(entries),
+                           new_rows=lambda old: entries)
+
+    def save_agents(self, agent_dict):
+        return self._apply("agents", lambda: self.inner.save_agents(agent_dict))
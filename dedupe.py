@@ -0,0 +1,135 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from metrics import incr, span
+from stations import normalise_station
+
+DEDUPE_WINDOW = 30 * 60  # seconds a submission counts as a repeat of an earlier one
+GROUP_ID_TIME = re.compile(r"^G(\d{13})")
+
+
+# ---------- Submission fingerprints ----------
+# Who, when and where: phone, journey date, route, class and the passenger
+# names in any order. A double-clicked or retried submission has the same
+# fingerprint as the first one, whatever GroupID the form minted for it.
+def fingerprint(rows):
+    first = rows[0]
+    names = sorted(" ".join(str(row.get("Name") or "").split()).casefold() for row in rows)
+    parts = [
+        re.sub(r"\D", "", str(first.get("Phone") or ""))[-10:],
+        str(first.get("Date of Journey") or "")[:10],
+        normalise_station(first.get("Boarding Station")),
+        normalise_station(first.get("Destination")),
+        str(first.get("Class") or "").strip(),
+    ]
+    return hashlib.blake2b("\x1f".join(parts + names).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Submit time (epoch seconds) from a GroupID minted by new_group_id; None
+# for older IDs, which are never matched
+def submitted_at(group_id):
+    match = GROUP_ID_TIME.match(str(group_id))
+    return int(match.group(1)) / 1000 if match else None
+
+
+# ---------- Duplicate index ----------
+# One per process. Holds the fingerprints of groups submitted within the
+# window, so a lookup is a dict hit and memory is bounded by the submission
+# rate, not the table. Kept current from the requests change feed like the
+# live group index: new submissions are added, deleted groups dropped, and
+# anything the feed can't account for rebuilds it from the table.
+class DuplicateIndex:
+    def __init__(self, window=DEDUPE_WINDOW):
+        self.window = window
+        self.entries = OrderedDict()  # fingerprint -> (group_id, submitted_at), oldest first
+        self.by_group = {}            # group_id -> fingerprint
+        self.cursor = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    # The GroupID of an earlier submission within the window that `rows`
+    # repeat, or None after reserving the fingerprint for `rows` (so a second
+    # click racing the first write still finds it). Call release() if the
+    # reserved submission is then not saved.
+    def claim(self, storage, rows, now=None):
+        now = time.time() if now is None else now
+        key = fingerprint(rows)
+        with self.lock:
+            if self.window <= 0:
+                return None
+            self._refresh(storage, now)
+            group_id = rows[0]["GroupID"]
+            hit = self.entries.get(key)
+            if hit is not None and hit[1] >= now - self.window:
+                if hit[0] == group_id:
+                    return None
+                incr("duplicate_submissions_total")
+                return hit[0]
+            if hit is not None:
+                self._remove(hit[0])
+            self._add(key, group_id, now)
+            return None
+
+    def release(self, rows):
+        with self.lock:
+            self._remove(rows[0]["GroupID"])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _refresh(self, storage, now):
+        version = storage.version("requests")
+        if version != self.version:
+            events = None
+            if self.cursor is not None:
+                cursor, events = storage.changes_since(self.cursor)
+            if events is None:
+                cursor = storage.change_cursor()
+                with span("build.requests.duplicate_index"):
+                    self._build(storage.load_requests(), now)
+            else:
+                for event in events:
+                    if event["op"] == "submit":
+                        group_id = event["group_ids"][0]
+                        self._add(fingerprint(event["rows"]), group_id, submitted_at(group_id))
+                    elif event["op"] == "delete":
+                        for group_id in event["group_ids"]:
+                            self._remove(group_id)
+            self.cursor = cursor
+            self.version = version
+        self._expire(now)
+
+    def _build(self, df, now):
+        self.entries.clear()
+        self.by_group.clear()
+        if df.empty:
+            return
+        times = df["GroupID"].astype(str).str.extract(GROUP_ID_TIME, expand=False)
+        times = pd.to_numeric(times, errors="coerce") / 1000
+        recent = df[times >= now - self.window].assign(_at=times)
+        for group_id, rows in recent.sort_values("_at", kind="stable").groupby("GroupID", sort=False):
+            self._add(fingerprint(rows.to_dict("records")), group_id, rows["_at"].iloc[0])
+
+    def _add(self, key, group_id, at):
+        if at is None or key in self.entries:
+            return  # pre-window IDs aren't tracked; the first submission wins
+        self.entries[key] = (group_id, at)
+        self.by_group[group_id] = key
+
+    def _remove(self, group_id):
+        key = self.by_group.pop(group_id, None)
+        if key is not None:
+            self.entries.pop(key, None)
+
+    def _expire(self, now):
+        while self.entries:
+            key, (group_id, at) = next(iter(self.entries.items()))
+            if at >= now - self.window:
+                break
+            del self.entries[key]
+            self.by_group.pop(group_id, None)
@@ -0,0 +1,94 @@
+import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from metrics import incr
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+# Read once at import: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+# ---------- Locking ----------
+# A per-path RLock serialises threads (Streamlit sessions) in this process and
+# an flock on "<path>.lock" serialises other processes sharing the data files.
+class _PathLock:
+    def __init__(self):
+        self.rlock = threading.RLock()
+        self.depth = 0
+
+
+def _path_lock(path):
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        if key not in _path_locks:
+            _path_locks[key] = _PathLock()
+        return _path_locks[key]
+
+
+@contextmanager
+def locked(path):
+    lock = _path_lock(path)
+    with lock.rlock:
+        handle = None
+        if fcntl is not None and lock.depth == 0:
+            handle = open(path + ".lock", "a")
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        lock.depth += 1
+        try:
+            yield
+        finally:
+            lock.depth -= 1
+            if handle is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+
+
+# ---------- Atomic writes (temp file + rename) ----------
+# mkstemp creates 0600: give the temp file the mode of the file it replaces,
+# or the umask default for a new one, so other readers keep their access
+def keep_mode(tmp_path, path):
+    try:
+        mode_bits = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode_bits = 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode_bits)
+
+
+@contextmanager
+def atomic_open(path, mode="w", encoding="utf-8"):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding, newline="" if "b" not in mode else None) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        keep_mode(tmp_path, path)
+        os.replace(tmp_path, path)
+        incr("bytes_written_total", os.path.getsize(path), file=os.path.basename(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_csv(df, path):
+    with atomic_open(path) as f:
+        df.to_csv(f, index=False)
+
+
+def atomic_write_json(data, path):
+    with atomic_open(path) as f:
+        json.dump(data, f)
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+MAX_OPEN = 30  # in-progress group actions kept per admin session
+
+
+# ---------- In-progress group actions ----------
+# One per admin session (in st.session_state), instead of a session key per
+# group ever shown. An entry is a group whose "Mark as Booked" form is open:
+# the status it was opened at, and the agent, profit and split picked so
+# far, so the form comes back as it was when the group is shown again.
+# Entries live while their group keeps that status. Groups on the current
+# page are touched on every render, and past MAX_OPEN the ones that have
+# been off the page longest are dropped.
+class GroupActions:
+    def __init__(self, cap=MAX_OPEN):
+        self.cap = cap
+        self.entries = OrderedDict()  # group_id -> {"status", "agent", "profit", "splits"}, least recently shown first
+
+    def get(self, group_id):
+        return self.entries.get(group_id)
+
+    def open(self, group_id, status):
+        self.entries[group_id] = {"status": status}
+        self.entries.move_to_end(group_id)
+        self._evict()
+
+    def update(self, group_id, **values):
+        if group_id in self.entries:
+            self.entries[group_id].update(values)
+
+    def close(self, group_id):
+        self.entries.pop(group_id, None)
+
+    # statuses: group_id -> current status for every group (the live group
+    # index); visible: the group IDs on the page being rendered
+    def refresh(self, statuses, visible):
+        for group_id, entry in list(self.entries.items()):
+            if statuses.get(group_id) != entry["status"]:
+                del self.entries[group_id]  # booked, reverted or deleted since it was opened
+        for group_id in visible:
+            if group_id in self.entries:
+                self.entries.move_to_end(group_id)
+        self._evict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _evict(self):
+        while len(self.entries) > self.cap:
+            self.entries.popitem(last=False)
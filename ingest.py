@@ -0,0 +1,174 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from metrics import incr, span
+from storage import REQUEST_COLUMNS
+
+INGEST_FILE = "vitatkal_ingest.db"
+BATCH_MAX = 200            # submissions per group commit
+LINGER = 0.02              # let a burst gather this long before committing
+POLL_INTERVAL = 1          # seconds between queue polls when idle
+STALE_CLAIM = 60           # a batch claimed this long ago by a dead writer is recovered
+KEEP_COMMITTED = 24 * 3600 # receipts stay queryable for a day after commit
+REQUIRED_FIELDS = ["Name", "Phone", "Boarding Station", "Destination", "Date of Journey"]
+
+
+def validate_rows(rows):
+    # One submission: rows for a single group, known columns, required fields filled
+    if not rows:
+        raise ValueError("Submission has no passengers")
+    group_ids = {row.get("GroupID") for row in rows}
+    if len(group_ids) != 1 or not next(iter(group_ids)):
+        raise ValueError("Submission rows must share one GroupID")
+    unknown = set().union(*rows) - set(REQUEST_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    for field in REQUIRED_FIELDS:
+        if any(not str(row.get(field) or "").strip() for row in rows):
+            raise ValueError(f"Missing {field}")
+    return next(iter(group_ids))
+
+
+# ---------- Durable ingestion queue ----------
+# Accepted submissions are committed to a small SQLite queue (WAL, so an
+# accepted receipt survives a process restart) and later moved into the
+# main store by the writer. The receipt is the submission's GroupID.
+class IngestQueue:
+    def __init__(self, path=INGEST_FILE):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest (
+                    id INTEGER PRIMARY KEY,
+                    receipt TEXT NOT NULL UNIQUE,
+                    rows TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    claim TEXT,
+                    claimed_at REAL,
+                    committed_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ingest_status ON ingest (status, id)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, rows):
+        receipt = validate_rows(rows)
+        with self._conn() as conn:
+            # A resubmitted receipt (double click, retry) is accepted once
+            conn.execute("INSERT OR IGNORE INTO ingest (receipt, rows, created_at) VALUES (?, ?, ?)",
+                         (receipt, json.dumps(rows, ensure_ascii=False, default=str), time.time()))
+        return receipt
+
+    def claim(self, limit=BATCH_MAX):
+        token = uuid.uuid4().hex
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE ingest SET status = 'committing', claim = ?, claimed_at = ? WHERE id IN "
+                "(SELECT id FROM ingest WHERE status = 'queued' ORDER BY id LIMIT ?)",
+                (token, time.time(), limit)
+            )
+        rows = self._conn().execute("SELECT id, receipt, rows FROM ingest WHERE claim = ? ORDER BY id", (token,))
+        return [(row_id, receipt, json.loads(data)) for row_id, receipt, data in rows.fetchall()]
+
+    def mark_committed(self, ids):
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany("UPDATE ingest SET status = 'committed', committed_at = ? WHERE id = ?", [(now, i) for i in ids])
+            conn.execute("DELETE FROM ingest WHERE status = 'committed' AND committed_at < ?", (now - KEEP_COMMITTED,))
+
+    def requeue(self, ids):
+        with self._conn() as conn:
+            conn.executemany("UPDATE ingest SET status = 'queued', claim = NULL WHERE id = ?", [(i,) for i in ids])
+
+    def stale_claims(self, older_than=STALE_CLAIM):
+        return self._conn().execute(
+            "SELECT id, receipt FROM ingest WHERE status = 'committing' AND claimed_at < ?",
+            (time.time() - older_than,)
+        ).fetchall()
+
+    def status(self, receipt):
+        row = self._conn().execute("SELECT status FROM ingest WHERE receipt = ?", (receipt,)).fetchone()
+        return row[0] if row else None
+
+    def counts(self):
+        return dict(self._conn().execute("SELECT status, COUNT(*) FROM ingest GROUP BY status").fetchall())
+
+
+# ---------- Single writer with group commit ----------
+# Drains the queue in batches; each batch is one storage write (one journal
+# append + fsync, or one SQLite transaction) however many submissions it holds.
+class IngestWorker(threading.Thread):
+    def __init__(self, queue, storage, batch_max=BATCH_MAX):
+        super().__init__(daemon=True, name="vitatkal-ingest")
+        self.queue = queue
+        self.storage = storage
+        self.batch_max = batch_max
+        self.wakeup = threading.Event()
+
+    def submit(self, rows):
+        receipt = self.queue.enqueue(rows)
+        incr("ingest_enqueued_total")
+        self.wakeup.set()
+        return receipt
+
+    def run(self):
+        while True:
+            try:
+                committed = self.drain_once()
+            except Exception as e:
+                print(f"❌ Ingest worker error: {e}")
+                committed = 0
+            if not committed:
+                self.recover()
+                if self.wakeup.wait(POLL_INTERVAL):
+                    time.sleep(LINGER)
+                self.wakeup.clear()
+
+    def drain_once(self):
+        batch = self.queue.claim(self.batch_max)
+        if not batch:
+            return 0
+        ids = [row_id for row_id, _, _ in batch]
+        try:
+            with span("ingest.commit"):
+                self.storage.add_request_groups([rows for _, _, rows in batch])
+        except Exception:
+            self.queue.requeue(ids)
+            raise
+        self.queue.mark_committed(ids)
+        incr("ingest_batches_total")
+        incr("ingest_committed_total", len(batch))
+        return len(batch)
+
+    # A writer that died between the storage write and mark_committed leaves
+    # its batch "committing"; commit-or-requeue it by checking the store.
+    def recover(self, older_than=STALE_CLAIM):
+        stale = self.queue.stale_claims(older_than)
+        if not stale:
+            return
+        done = [row_id for row_id, receipt in stale if not self.storage.get_group(receipt).empty]
+        self.queue.mark_committed(done)
+        self.queue.requeue([row_id for row_id, _ in stale if row_id not in done])
+        print(f"✅ Recovered {len(stale)} in-flight submission(s) ({len(done)} already stored)")
+
+    def wait_idle(self, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            counts = self.queue.counts()
+            if not counts.get("queued") and not counts.get("committing"):
+                return True
+            time.sleep(0.01)
+        return False
@@ -0,0 +1,234 @@
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from fileio import atomic_open, atomic_write_csv, locked
+from metrics import incr
+
+JOURNAL_FILE = "vitatkal_journal.jsonl"
+COMPACT_EVERY = 500
+
+
+# ---------- Append-only request journal ----------
+# Every submit / status change / delete is one appended JSON line. The CSV
+# snapshot holds everything up to the last compaction; current state is the
+# snapshot with the journal replayed on top of it.
+class Journal:
+    def __init__(self, snapshot_file, columns, journal_file=JOURNAL_FILE, compact_every=COMPACT_EVERY):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.meta_file = journal_file + ".meta"
+        self.columns = columns
+        self.compact_every = compact_every
+        self._compacting = False
+
+        events = self._parse(self._read_journal())
+        self.seq = max([self._snapshot_seq()] + [e["seq"] for e in events])
+        self.pending = len(events)
+
+    # Held across the snapshot and journal files, by threads and processes alike
+    def locked(self):
+        return locked(self.journal_file)
+
+    # ---------- Writes ----------
+    def append(self, op, **fields):
+        return self.append_many([{"op": op, **fields}])
+
+    # Group commit: several events written together with a single fsync
+    def append_many(self, events):
+        with self.locked():
+            # Another process may have appended (or compacted) since our last write
+            seq = max(self.seq, self._tail_seq())
+            now = time.time()
+            lines = []
+            for fields in events:
+                seq += 1
+                lines.append(json.dumps({"seq": seq, "ts": now, **fields}, ensure_ascii=False, default=str) + "\n")
+            data = "".join(lines).encode("utf-8")
+            with open(self.journal_file, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            incr("bytes_written_total", len(data), file=os.path.basename(self.journal_file))
+            self.seq = seq
+            self.pending += len(events)
+            if self.pending >= self.compact_every and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact, daemon=True).start()
+            return self.seq
+
+    # ---------- Reads ----------
+    def load(self):
+        with self.locked():
+            snapshot = self._read_snapshot()
+            raw_events = self._read_journal()
+        incr("bytes_read_total", len(snapshot), file=os.path.basename(self.snapshot_file))
+        incr("bytes_read_total", len(raw_events), file=os.path.basename(self.journal_file))
+        return self.replay(self._snapshot_frame(snapshot), self._parse(raw_events))
+
+    def replay(self, df, events):
+        new_rows, status, deleted = self._fold(events, set(df["GroupID"].dropna()))
+        df = self._patch(df, status, deleted)
+        if new_rows:
+            added = self._patch(pd.DataFrame([row for rows in new_rows.values() for row in rows], columns=self.columns), status, ())
+            df = pd.concat([df, added], ignore_index=True) if not df.empty else added
+        return df.reset_index(drop=True)
+
+    # Current state in chunks, for exports: the snapshot is streamed from a
+    # handle opened under the lock (compaction replaces the file, so the
+    # handle stays consistent) with the journal applied; new submissions last
+    def iter_chunks(self, chunksize):
+        with self.locked():
+            has_snapshot = os.path.exists(self.snapshot_file) and os.path.getsize(self.snapshot_file) > 0
+            handle = open(self.snapshot_file, "rb") if has_snapshot else None
+            events = self._parse(self._read_journal())
+        new_rows, status, deleted = self._fold(events, ())
+        seen = set()
+        if handle is not None:
+            with handle:
+                for chunk in pd.read_csv(handle, chunksize=chunksize, dtype={"Phone": str, "GroupID": str}):
+                    chunk = chunk.reindex(columns=self.columns)
+                    seen.update(chunk["GroupID"].dropna())
+                    yield self._patch(chunk, status, deleted)
+        rows = [row for group_id, rows in new_rows.items() if group_id not in seen for row in rows]
+        if rows:
+            yield self._patch(pd.DataFrame(rows, columns=self.columns), status, ())
+
+    def _fold(self, events, known):
+        new_rows = {}
+        status = {}
+        deleted = set()
+
+        for event in events:
+            op = event["op"]
+            # Bulk admin actions write one event carrying every group_id
+            group_ids = event.get("group_ids") or [event.get("group_id")]
+            if op == "submit":
+                group_id = event["rows"][0]["GroupID"]
+                if group_id in known or group_id in new_rows:
+                    continue  # already folded into the snapshot
+                new_rows[group_id] = event["rows"]
+                deleted.discard(group_id)
+            elif op == "status":
+                for group_id in group_ids:
+                    status[group_id] = event["status"]
+            elif op == "delete":
+                for group_id in group_ids:
+                    new_rows.pop(group_id, None)
+                    status.pop(group_id, None)
+                    deleted.add(group_id)
+        return new_rows, status, deleted
+
+    @staticmethod
+    def _patch(df, status, deleted):
+        if deleted:
+            df = df[~df["GroupID"].isin(deleted)]
+        if status:
+            override = df["GroupID"].map(status)
+            df = df.assign(Status=override.fillna(df["Status"]))
+        return df
+
+    # ---------- Change feed ----------
+    # The journal's seq numbers order every requests write. Events after a
+    # cursor can be answered as long as compaction hasn't folded them away.
+    def cursor(self):
+        with self.locked():
+            return max(self.seq, self._tail_seq())
+
+    def changes_since(self, cursor):
+        with self.locked():
+            base = self._snapshot_seq()
+            events = self._parse(self._read_journal())
+        current = max([base] + [e["seq"] for e in events])
+        if cursor is None or cursor < base or cursor > current:
+            return current, None
+        return current, [_feed_event(e) for e in events if e["seq"] > cursor]
+
+    # ---------- Compaction ----------
+    def compact(self):
+        try:
+            with self.locked():
+                upto = max(self.seq, self._tail_seq())
+                snapshot = self._read_snapshot()
+                raw_events = self._read_journal()
+
+            # Folding runs outside the lock so submissions keep appending.
+            events = [e for e in self._parse(raw_events) if e["seq"] <= upto]
+            df = self.replay(self._snapshot_frame(snapshot), events)
+
+            with self.locked():
+                if self._snapshot_seq() >= upto:
+                    return  # another process already compacted this far
+                atomic_write_csv(df, self.snapshot_file)
+                with atomic_open(self.meta_file) as f:
+                    json.dump({"seq": upto}, f)
+                tail = [e for e in self._parse(self._read_journal()) if e["seq"] > upto]
+                with atomic_open(self.journal_file) as f:
+                    for event in tail:
+                        f.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+                self.pending = len(tail)
+            print(f"✅ Journal compacted up to seq {upto}")
+        except Exception as e:
+            print(f"❌ Journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    # ---------- Helpers ----------
+    def _snapshot_seq(self):
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, encoding="utf-8") as f:
+                return json.load(f).get("seq", 0)
+        return 0
+
+    def _tail_seq(self):
+        try:
+            with open(self.journal_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 64 * 1024))
+                events = self._parse(f.read())
+        except FileNotFoundError:
+            events = []
+        return events[-1]["seq"] if events else self._snapshot_seq()
+
+    def _read_snapshot(self):
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, "rb") as f:
+                return f.read()
+        return b""
+
+    def _read_journal(self):
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, "rb") as f:
+                return f.read()
+        return b""
+
+    def _snapshot_frame(self, raw):
+        if not raw.strip():
+            return pd.DataFrame(columns=self.columns)
+        df = pd.read_csv(io.BytesIO(raw), dtype={"Phone": str, "GroupID": str})
+        return df.reindex(columns=self.columns)
+
+    @staticmethod
+    def _parse(raw):
+        events = []
+        for line in raw.decode("utf-8", errors="replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # torn final line from a crash mid-append
+        return events
+
+
+def _feed_event(event):
+    if event["op"] == "submit":
+        return {"seq": event["seq"], "op": "submit", "group_ids": [event["rows"][0]["GroupID"]], "rows": event["rows"]}
+    feed = {"seq": event["seq"], "op": event["op"], "group_ids": event.get("group_ids") or [event.get("group_id")]}
+    if event["op"] == "status":
+        feed["status"] = event["status"]
+    return feed
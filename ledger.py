@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from archive import load_with_archive
+from views import MaterializedView
+
+BALANCES_FILE = "agent_balances.json"
+
+
+# ---------- Vectorised ledger ----------
+# Each booking stores its profit split as JSON in the Splits column,
+# {"<agent>": fraction}. A booking without one (older manual entries) falls
+# back to the default shares from the agent registry (percentages).
+def default_shares(agents):
+    return {agent: float(info["split"]) / 100 for agent, info in agents.items()}
+
+
+def encode_splits(percentages):
+    return json.dumps({agent: pct / 100 for agent, pct in percentages.items() if pct}, ensure_ascii=False)
+
+
+def parse_splits(value):
+    if not isinstance(value, str) or not value.strip():
+        return {}
+    try:
+        splits = json.loads(value)
+    except json.JSONDecodeError:
+        return {}
+    return {agent: float(share) for agent, share in splits.items()} if isinstance(splits, dict) else {}
+
+
+def split_long(log_df):
+    # Long format: one row per (booking position, agent) with that agent's share
+    splits = [parse_splits(v) for v in log_df["Splits"]] if "Splits" in log_df else [{}] * len(log_df)
+    return pd.DataFrame({
+        "Booking": np.repeat(np.arange(len(splits)), [len(s) for s in splits]),
+        "Agent": [agent for s in splits for agent in s],
+        "Share": [share for s in splits for share in s.values()],
+    })
+
+
+def agent_earnings(log_df, shares):
+    # One weighted group-by over the long format, however many agents there are
+    profit = pd.to_numeric(log_df["Profit"], errors="coerce").fillna(0).to_numpy()
+    long = split_long(log_df)
+    earned = pd.Series(profit[long["Booking"].to_numpy()] * long["Share"].to_numpy()).groupby(long["Agent"].to_numpy()).sum()
+    explicit = np.zeros(len(profit), dtype=bool)
+    explicit[long["Booking"].to_numpy()] = True
+    fallback = pd.Series(shares, dtype=float) * profit[~explicit].sum()
+    earned = earned.add(fallback, fill_value=0.0)
+    # Registry order first; agents no longer listed keep their history
+    return earned.reindex(list(shares) + [a for a in earned.index if a not in shares], fill_value=0.0)
+
+
+def agent_settled(settled_df, agents):
+    amounts = pd.to_numeric(settled_df["Amount"], errors="coerce").fillna(0)
+    settled = amounts.groupby(settled_df["Agent"]).sum()
+    # Registry order first; agents no longer listed keep their history
+    return settled.reindex(list(agents) + [a for a in settled.index if a not in agents], fill_value=0.0)
+
+
+def compute_balances(log_df, settled_df, shares):
+    earned = agent_earnings(log_df, shares)
+    settled = agent_settled(settled_df, shares)
+    frame = pd.DataFrame({"Earned": earned, "Settled": settled}).fillna(0.0)
+    frame["Due"] = frame["Earned"] - frame["Settled"]
+    return frame
+
+
+# ---------- Materialised per-agent balances ----------
+# agent_balances.json holds running earned/settled totals per agent. Writes
+# made through the app apply a delta; anything else triggers a full
+# vectorised rebuild (see views.MaterializedView).
+class AgentLedger(MaterializedView):
+    TABLES = ("booked_log", "settlements", "agents")
+
+    def __init__(self, path=BALANCES_FILE):
+        super().__init__(path)
+
+    def balances(self, storage):
+        state = self.state(storage)
+        frame = pd.DataFrame({"Earned": state["earned"], "Settled": state["settled"]}).fillna(0.0)
+        frame["Due"] = frame["Earned"] - frame["Settled"]
+        return frame
+
+    def compute(self, storage):
+        shares = default_shares(storage.load_agents())
+        frame = compute_balances(load_with_archive(storage, "booked_log"), storage.load_settlements(), shares)
+        return {
+            "earned": frame["Earned"].round(6).to_dict(),
+            "settled": frame["Settled"].round(6).to_dict(),
+        }
+
+    def apply(self, state, storage, table, old_rows, new_rows):
+        if table == "agents":
+            state.update(self.compute(storage))  # default shares changed
+            return
+        if table == "booked_log":
+            shares = default_shares(storage.load_agents())
+            delta = self._earned(new_rows, shares).sub(self._earned(old_rows, shares), fill_value=0)
+            totals = state["earned"]
+        else:
+            delta = self._settled(new_rows).sub(self._settled(old_rows), fill_value=0)
+            totals = state["settled"]
+
+        for agent, amount in delta.items():
+            totals[agent] = round(totals.get(agent, 0.0) + float(amount), 6)
+
+    def _earned(self, rows, shares):
+        if not rows:
+            return pd.Series(dtype=float)
+        return agent_earnings(pd.DataFrame(rows), shares)
+
+    def _settled(self, rows):
+        if not rows:
+            return pd.Series(dtype=float)
+        df = pd.DataFrame(rows)
+        return pd.to_numeric(df["Amount"], errors="coerce").fillna(0).groupby(df["Agent"]).sum()
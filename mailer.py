@@ -0,0 +1,124 @@
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from metrics import incr, span
+from outbox import OUTBOX_FILE, Outbox  # noqa: F401 (re-exported)
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+
+POLL_INTERVAL = 2          # seconds between outbox polls when idle
+IDLE_DISCONNECT = 60       # close the SMTP connection after this long with nothing to send
+DIGEST_WINDOW = 15         # hold a burst this long so it can go out as one digest
+DIGEST_THRESHOLD = 3       # coalesce when at least this many messages are waiting
+DIGEST_MAX = 25            # messages per digest email
+
+
+# ---------- Background sender ----------
+class MailWorker(threading.Thread):
+    def __init__(self, outbox, sender, password, receiver, host=SMTP_HOST, port=SMTP_PORT,
+                 starttls=True, digest=True):
+        super().__init__(daemon=True, name="vitatkal-mailer")
+        self.outbox = outbox
+        self.sender = sender
+        self.password = password
+        self.receiver = receiver
+        self.host = host
+        self.port = int(port)
+        self.starttls = starttls
+        self.digest = digest
+        self.server = None
+        self.last_used = 0.0
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                sent = self.drain_once()
+            except Exception as e:
+                print(f"❌ Mail worker error: {e}")
+                sent = 0
+            if not sent:
+                if self.server is not None and time.time() - self.last_used > IDLE_DISCONNECT:
+                    self._disconnect()
+                self.wakeup.wait(POLL_INTERVAL)
+                self.wakeup.clear()
+
+    def notify(self):
+        self.wakeup.set()
+
+    def drain_once(self):
+        batch = self.outbox.ready()
+        if not batch:
+            return 0
+
+        if self.digest and len(batch) < DIGEST_MAX and time.time() - batch[0][3] < DIGEST_WINDOW:
+            return 0  # let the burst build up a little longer
+
+        sent = 0
+        for ids, subject, body in self._coalesce(batch):
+            try:
+                self._send(subject, body)
+            except (smtplib.SMTPException, OSError) as e:
+                print(f"❌ Failed to send email: {e}")
+                incr("email_failures_total")
+                self._disconnect()
+                self.outbox.mark_failed(ids, e)
+                break
+            self.outbox.mark_sent(ids)
+            incr("emails_sent_total")
+            incr("notifications_sent_total", len(ids))
+            sent += len(ids)
+        return sent
+
+    def _coalesce(self, batch):
+        if not self.digest or len(batch) < DIGEST_THRESHOLD:
+            return [([row[0]], row[1], row[2]) for row in batch]
+
+        messages = []
+        for start in range(0, len(batch), DIGEST_MAX):
+            chunk = batch[start:start + DIGEST_MAX]
+            subject = f"🚨 {len(chunk)} New Vitatkal Booking Requests"
+            body = "\n\n".join(f"===== {row[1]} =====\n{row[2]}" for row in chunk)
+            messages.append(([row[0] for row in chunk], subject, body))
+        return messages
+
+    # One authenticated connection is reused across messages
+    def _connection(self):
+        if self.server is not None:
+            try:
+                self.server.noop()
+                return self.server
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+
+        with span("smtp.connect"):
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+            if self.starttls:
+                server.starttls()
+            if self.password:
+                server.login(self.sender, self.password)
+        self.server = server
+        return server
+
+    def _disconnect(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+    def _send(self, subject, body):
+        msg = MIMEMultipart()
+        msg["From"] = self.sender
+        msg["To"] = self.receiver
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+        with span("smtp.send"):
+            self._connection().send_message(msg)
+        self.last_used = time.time()
+        print("✅ Email sent successfully")
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+METRICS_FILE = "vitatkal_metrics.jsonl"
+PROM_FILE = "vitatkal_metrics.prom"
+PREFIX = "vitatkal"
+FLUSH_INTERVAL = 10           # seconds between exports
+SERVE_HOST = "127.0.0.1"      # /metrics is local only unless a host is configured
+WINDOW = 1000                 # recent samples kept per span for p50 / p95
+MAX_FILE_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+
+
+# ---------- In-process metrics ----------
+# Spans time one phase of a rerun (a load, a tab render, a write, an SMTP
+# send); counters accumulate submissions, status changes, bytes and cache
+# hits. Recording only touches memory; a background thread exports to a
+# rotating JSON-lines file and a Prometheus text file (and optionally serves
+# the same text over HTTP).
+class Metrics:
+    def __init__(self, window=WINDOW):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.totals = defaultdict(lambda: [0, 0.0])  # span -> [count, seconds]
+        self.counters = defaultdict(float)           # (name, labels) -> value
+        self.pending = deque(maxlen=10 * window)     # span events not yet exported
+        self.log = None
+        self.prom_file = None
+        self.started = False
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.samples[name].append(seconds)
+            totals = self.totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            self.pending.append({"ts": round(time.time(), 3), "span": name, "ms": round(seconds * 1000, 3)})
+
+    def incr(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    # ---------- Views ----------
+    def summary(self):
+        with self.lock:
+            samples = {name: list(values) for name, values in self.samples.items()}
+            totals = {name: list(values) for name, values in self.totals.items()}
+        rows = []
+        for name, values in samples.items():
+            ms = pd.Series(values) * 1000
+            rows.append({"Phase": name, "Count": totals[name][0], "p50 (ms)": round(ms.quantile(0.5), 2),
+                         "p95 (ms)": round(ms.quantile(0.95), 2), "Max (ms)": round(ms.max(), 2)})
+        columns = ["Phase", "Count", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+        return pd.DataFrame(rows, columns=columns).sort_values("Phase", ignore_index=True)
+
+    def counter_frame(self):
+        with self.lock:
+            items = list(self.counters.items())
+        rows = [{"Counter": name, "Labels": ", ".join(f"{k}={v}" for k, v in labels), "Value": value}
+                for (name, labels), value in sorted(items)]
+        return pd.DataFrame(rows, columns=["Counter", "Labels", "Value"])
+
+    def prometheus(self):
+        with self.lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+            totals = {name: list(values) for name, values in self.totals.items()}
+            counters = sorted(self.counters.items())
+
+        lines = [f"# TYPE {PREFIX}_span_seconds summary"]
+        for name, values in sorted(samples.items()):
+            for q in (0.5, 0.95):
+                value = values[min(len(values) - 1, int(q * len(values)))]
+                lines.append(f'{PREFIX}_span_seconds{{phase="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_sum{{phase="{name}"}} {totals[name][1]:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_count{{phase="{name}"}} {totals[name][0]}')
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {PREFIX}_{name} counter")
+                typed.add(name)
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{PREFIX}_{name}{{{label_text}}} {value:g}" if labels else f"{PREFIX}_{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    # ---------- Export ----------
+    def start(self, metrics_file=METRICS_FILE, prom_file=PROM_FILE, port=None, interval=FLUSH_INTERVAL, host=SERVE_HOST):
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+
+        handler = RotatingFileHandler(metrics_file, maxBytes=MAX_FILE_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log = logging.getLogger(f"{PREFIX}.metrics")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        self.log.addHandler(handler)
+        self.prom_file = prom_file
+
+        threading.Thread(target=self._flush_loop, args=(interval,), daemon=True, name="vitatkal-metrics").start()
+        if port:
+            self._serve(host, int(port))
+
+    def flush(self):
+        with self.lock:
+            events = list(self.pending)
+            self.pending.clear()
+            counters = {f"{name}{dict(labels) if labels else ''}": value for (name, labels), value in self.counters.items()}
+        if self.log is not None:
+            for event in events:
+                self.log.info(json.dumps(event))
+            self.log.info(json.dumps({"ts": round(time.time(), 3), "counters": counters}))
+        if self.prom_file:
+            # Plain temp file + rename so exports don't count towards the data-file byte counters
+            directory = os.path.dirname(os.path.abspath(self.prom_file))
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.prom_file) + ".", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+            from fileio import keep_mode  # fileio imports this module
+            keep_mode(tmp_path, self.prom_file)
+            os.replace(tmp_path, self.prom_file)
+
+    def _flush_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Metrics export failed: {e}")
+
+    def _serve(self, host, port):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="vitatkal-metrics-http").start()
+        print(f"✅ Metrics served on {host}:{port}/metrics")
+
+
+METRICS = Metrics()
+span = METRICS.span
+incr = METRICS.incr
@@ -0,0 +1,222 @@
+import os
+import sys
+
+import pandas as pd
+
+from fileio import atomic_write_csv, locked
+from ledger import default_shares, encode_splits
+from storage import CsvStorage, SqliteStorage, BOOKED_LOG_COLUMNS, REQUEST_COLUMNS, _quote
+
+STRAY_REQUESTS_FILE = "tatkal_requests.csv"
+MIGRATION_LOCK = "vitatkal_migrations"
+
+# ---------- Migration registry ----------
+# Each migration runs exactly once per data store; the store records the
+# highest version applied (vitatkal_schema.json for CSV, user_version for SQLite).
+MIGRATIONS = {}
+
+
+def migration(version):
+    def register(fn):
+        MIGRATIONS[version] = fn
+        return fn
+    return register
+
+
+def latest_version():
+    return max(MIGRATIONS)
+
+
+def run_migrations(storage):
+    if storage.schema_version() >= latest_version():
+        return []
+
+    applied = []
+    with locked(MIGRATION_LOCK):
+        current = storage.schema_version()  # another process may have migrated meanwhile
+        for version in sorted(v for v in MIGRATIONS if v > current):
+            MIGRATIONS[version](storage)
+            storage.set_schema_version(version)
+            applied.append(version)
+            print(f"✅ Applied migration {version}: {MIGRATIONS[version].__name__}")
+    return applied
+
+
+# ---------- Migrations ----------
+@migration(1)
+def add_group_ids(storage):
+    # Older request files predate GroupID (and may have stray columns);
+    # legacy rows each become their own group.
+    if isinstance(storage, CsvStorage):
+        with storage.journal.locked():
+            if not os.path.exists(storage.requests_file):
+                return
+            df = pd.read_csv(storage.requests_file, dtype={"Phone": str, "GroupID": str})
+            df = df.reindex(columns=REQUEST_COLUMNS)
+            missing = df["GroupID"].isna() | (df["GroupID"] == "")
+            df.loc[missing, "GroupID"] = [f"GL{i}" for i in df.index[missing]]
+            atomic_write_csv(df, storage.requests_file)
+    elif isinstance(storage, SqliteStorage):
+        with storage._write("requests") as conn:
+            conn.execute('UPDATE requests SET "GroupID" = \'GL\' || id WHERE "GroupID" IS NULL OR "GroupID" = \'\'')
+
+
+@migration(2)
+def reconcile_stray_requests(storage, stray_file=STRAY_REQUESTS_FILE):
+    # tatkal_requests.csv was written by an older build under a different name.
+    # Fold any rows we don't already have into the main store, then retire it.
+    if not os.path.exists(stray_file):
+        return
+
+    stray = pd.read_csv(stray_file, dtype=str).reindex(columns=REQUEST_COLUMNS)
+    key_columns = [c for c in REQUEST_COLUMNS if c != "GroupID"]
+
+    def keys(df):
+        return df[key_columns].astype(str).replace({"nan": "", "None": ""}).agg("|".join, axis=1)
+
+    existing = set(keys(storage.load_requests()))
+    stray = stray[~keys(stray).isin(existing)]
+    stray = stray.astype(object).where(pd.notna(stray), None)
+    for i, row in enumerate(stray.to_dict("records")):
+        row["GroupID"] = f"GS{i}"
+        row["Status"] = row["Status"] or "Pending"
+        storage.add_requests([row])
+
+    os.replace(stray_file, stray_file + ".migrated")
+    print(f"✅ Reconciled {len(stray)} request(s) from {stray_file}")
+
+
+@migration(3)
+def link_booked_log_to_groups(storage):
+    # booked_log rows used to carry no GroupID; give the column to every
+    # store and backfill it by best-effort matching to the requests.
+    if isinstance(storage, SqliteStorage):
+        with storage._write("booked_log") as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(booked_log)")}
+            if "GroupID" not in columns:
+                conn.execute('ALTER TABLE booked_log ADD COLUMN "GroupID" TEXT')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_booked_group ON booked_log ("GroupID")')
+        # Only the matching columns: the legacy table predates Splits (migration 4)
+        log = storage._query('SELECT id, "Customer Name", "Date of Journey", "GroupID" FROM booked_log ORDER BY id',
+                             index_col="id")
+        group_ids = match_booked_groups(log, storage.load_requests())
+        with storage._write("booked_log") as conn:
+            conn.executemany('UPDATE booked_log SET "GroupID" = ? WHERE id = ?',
+                             [(g, int(i)) for i, g in group_ids.dropna().items()])
+    elif isinstance(storage, CsvStorage):
+        with locked(storage.booked_log_file):
+            log = raw_booked_log(storage)
+            if "GroupID" not in log:
+                log["GroupID"] = None
+            group_ids = match_booked_groups(log, storage.load_requests())
+            atomic_write_csv(log.assign(GroupID=group_ids), storage.booked_log_file)
+    else:
+        return
+    print(f"✅ Linked {group_ids.notna().sum()} of {len(log)} booked-log row(s) to their request group")
+
+
+def match_booked_groups(log, requests):
+    # A log row was written from a group's lead passenger, so match on
+    # (Customer Name, Date of Journey) against each group's first row.
+    # Booked groups are preferred, then older ones; each group is used
+    # once, and duplicate log rows beyond the candidates go to the last one.
+    result = log["GroupID"].astype(object) if "GroupID" in log else pd.Series(None, index=log.index, dtype=object)
+    missing = result.isna() | (result.astype(str) == "")
+    if not missing.any() or requests.empty:
+        return result
+
+    def day(dates):
+        return pd.to_datetime(dates, errors="coerce").dt.strftime("%Y-%m-%d")
+
+    leads = requests.drop_duplicates("GroupID").dropna(subset=["GroupID"])
+    leads = leads.assign(day=day(leads["Date of Journey"]),
+                         booked=leads["Status"].astype(str).str.startswith("Booked"))
+    leads = leads.sort_values(["booked", "GroupID"], ascending=[False, True], kind="stable")
+    taken = set(result[~missing])
+    candidates = {}
+    for name, doj, group_id in zip(leads["Name"], leads["day"], leads["GroupID"]):
+        if group_id not in taken:
+            candidates.setdefault((name, doj), []).append(group_id)
+
+    pending = log[missing]
+    for (name, doj), rows in pending.groupby([pending["Customer Name"], day(pending["Date of Journey"])]):
+        groups = candidates.get((name, doj))
+        if groups:
+            for n, row_id in enumerate(rows.index):
+                result[row_id] = groups[min(n, len(groups) - 1)]
+    return result
+
+
+@migration(4)
+def booked_log_splits_as_json(storage):
+    # Per-agent Split_<name> columns become one Splits JSON column, so adding
+    # an agent needs no schema change; agents get icon / colour / order.
+    if isinstance(storage, SqliteStorage):
+        with storage._write("agents") as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(agents)")}
+            for column, kind in (("icon", "TEXT"), ("color", "TEXT"), ("position", "INTEGER")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE agents ADD COLUMN {column} {kind}")
+        if storage._conn().execute("SELECT COUNT(*) FROM agents").fetchone()[0]:
+            storage.save_agents(storage.load_agents())
+        shares = default_shares(storage.load_agents())
+
+        with storage._write("booked_log") as conn:
+            if "Splits" not in {row[1] for row in conn.execute("PRAGMA table_info(booked_log)")}:
+                log = fold_split_columns(pd.read_sql_query("SELECT * FROM booked_log ORDER BY id", conn), shares)
+                columns = ["id"] + BOOKED_LOG_COLUMNS
+                rows = log[columns].astype(object).where(pd.notna(log[columns]), None)
+                conn.execute("ALTER TABLE booked_log RENAME TO booked_log_legacy")
+                conn.execute('CREATE TABLE booked_log (id INTEGER PRIMARY KEY, "Customer Name" TEXT, '
+                             '"Date of Journey" TEXT, "Agent" TEXT, "Profit" REAL, "Splits" TEXT, "GroupID" TEXT)')
+                conn.executemany(f"INSERT INTO booked_log ({', '.join(_quote(c) for c in columns)}) "
+                                 f"VALUES ({', '.join('?' for _ in columns)})", rows.itertuples(index=False, name=None))
+                conn.execute("DROP TABLE booked_log_legacy")
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_booked_name ON booked_log ("Customer Name", "Date of Journey")')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_booked_group ON booked_log ("GroupID")')
+    elif isinstance(storage, CsvStorage):
+        if os.path.exists(storage.agents_file):
+            storage.save_agents(storage.load_agents())
+        shares = default_shares(storage.load_agents())
+        with locked(storage.booked_log_file):
+            log = raw_booked_log(storage)
+            if "Splits" not in log or any(c.startswith("Split_") for c in log):
+                atomic_write_csv(fold_split_columns(log, shares), storage.booked_log_file)
+    else:
+        return
+
+    # Archived partitions are read raw: Archive.load with the new columns would drop Split_*
+    for month in storage.archived_months("booked_log"):
+        log = storage.archive.load("booked_log", [month], None)
+        if "Splits" not in log:
+            storage.archive.write("booked_log", month, fold_split_columns(log, shares))
+    print("✅ Booked-log splits stored as JSON")
+
+
+def fold_split_columns(log, shares):
+    # A row with no Split_ values keeps falling back to the default shares
+    # (Splits empty); a partly filled row gets the defaults for its gaps.
+    split_columns = [c for c in log.columns if c.startswith("Split_")]
+    matrix = log[split_columns].apply(pd.to_numeric, errors="coerce")
+    matrix.columns = [c[len("Split_"):] for c in split_columns]
+    filled = matrix.fillna(pd.Series(shares))
+    has_split = matrix.notna().any(axis=1)
+    log = log.assign(Splits=[
+        encode_splits({agent: share * 100 for agent, share in row.items() if pd.notna(share)}) if has else None
+        for row, has in zip(filled.to_dict("records"), has_split)
+    ])
+    return log.reindex(columns=[c for c in ["id"] if c in log] + BOOKED_LOG_COLUMNS)
+
+
+def raw_booked_log(storage):
+    # The CSV as written, legacy columns included (load_booked_log reindexes)
+    if not os.path.exists(storage.booked_log_file) or os.path.getsize(storage.booked_log_file) == 0:
+        return pd.DataFrame(columns=BOOKED_LOG_COLUMNS)
+    return pd.read_csv(storage.booked_log_file, dtype={"GroupID": str})
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "csv"
+    store = SqliteStorage() if backend == "sqlite" else CsvStorage()
+    applied = run_migrations(store)
+    print(f"Schema at version {store.schema_version()} ({len(applied)} migration(s) applied)")
@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+import time
+
+OUTBOX_FILE = "vitatkal_outbox.db"
+BACKOFF_BASE = 5           # first retry delay in seconds, doubled per attempt
+BACKOFF_MAX = 15 * 60
+MAX_ATTEMPTS = 10
+READY_BATCH = 100          # messages fetched per poll
+KEEP_SENT = 24 * 3600      # sent mail stays listed for a day, then is deleted
+
+
+# ---------- Persistent outbox ----------
+class Outbox:
+    def __init__(self, path=OUTBOX_FILE):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    next_attempt REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    last_error TEXT,
+                    sent_at REAL
+                )
+            """)
+            # Outboxes from before sent mail was pruned lack sent_at
+            if "sent_at" not in {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}:
+                conn.execute("ALTER TABLE outbox ADD COLUMN sent_at REAL")
+            # The worker's poll, the prune and the counts all filter on status first
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_ready ON outbox (status, next_attempt)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, subject, body):
+        now = time.time()
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (subject, body, created_at, next_attempt) VALUES (?, ?, ?, ?)",
+                (subject, body, now, now)
+            )
+        return cur.lastrowid
+
+    def ready(self, limit=READY_BATCH):
+        return self._conn().execute(
+            "SELECT id, subject, body, created_at, attempts FROM outbox "
+            "WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time(), limit)
+        ).fetchall()
+
+    def mark_sent(self, ids):
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany("UPDATE outbox SET status = 'sent', last_error = NULL, sent_at = ? WHERE id = ?",
+                             [(now, i) for i in ids])
+            # Rows sent before sent_at existed (NULL) go on the first prune
+            conn.execute("DELETE FROM outbox WHERE status = 'sent' AND IFNULL(sent_at, 0) < ?", (now - KEEP_SENT,))
+
+    def mark_failed(self, ids, error):
+        now = time.time()
+        with self._conn() as conn:
+            for message_id in ids:
+                attempts = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (message_id,)).fetchone()[0] + 1
+                status = "dead" if attempts >= MAX_ATTEMPTS else "pending"
+                delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+                conn.execute(
+                    "UPDATE outbox SET attempts = ?, status = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                    (attempts, status, now + delay, str(error), message_id)
+                )
+
+    def pending(self):
+        return self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def counts(self):
+        return dict(self._conn().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
@@ -0,0 +1,75 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import incr
+
+# Submissions allowed per key: a burst, refilled at `per_minute`
+LIMITS = {
+    "phone": {"burst": 3, "per_minute": 1},
+    "session": {"burst": 5, "per_minute": 2},
+}
+MAX_BUCKETS = 100_000  # memory cap; past it the least recently used bucket goes first
+
+
+# ---------- Token buckets ----------
+# One process-wide limiter, with a bucket per (kind, key), e.g. ("phone",
+# "9876543210"). A bucket is [tokens, last update]; tokens refill
+# continuously up to the burst, and a submission spends one from every
+# bucket it touches. Buckets are kept least recently used first. One left
+# alone long enough to refill completely is no different from a missing
+# one, so it is dropped on the next call; MAX_BUCKETS bounds the rest.
+class RateLimiter:
+    def __init__(self, limits=LIMITS, max_buckets=MAX_BUCKETS):
+        self.limits = {kind: (limit["burst"], limit["per_minute"] / 60) for kind, limit in limits.items()}
+        self.idle = max((burst / rate for burst, rate in self.limits.values()), default=0)
+        self.max_buckets = max_buckets
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    # Spends a token from each keyed bucket and returns 0, or, if any of them
+    # is empty, spends nothing and returns the seconds until all have one.
+    # Keys are kind=value, e.g. acquire(phone="9876543210", session=sid);
+    # an empty value is not limited.
+    def acquire(self, now=None, **keys):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self._evict(now)
+            buckets, wait, limited = [], 0.0, None
+            for kind, key in keys.items():
+                if not key or kind not in self.limits:
+                    continue
+                burst, rate = self.limits[kind]
+                bucket = self.buckets.pop((kind, key), None) or [burst, now]
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                self.buckets[(kind, key)] = bucket  # most recently used last
+                buckets.append(bucket)
+                if bucket[0] < 1 and (1 - bucket[0]) / rate > wait:
+                    wait, limited = (1 - bucket[0]) / rate, kind
+            if limited:
+                incr("rate_limited_total", key=limited)
+                return wait
+            for bucket in buckets:
+                bucket[0] -= 1
+            return 0.0
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def _evict(self, now):
+        while self.buckets:
+            _, (_, updated) = next(iter(self.buckets.items()))
+            if updated > now - self.idle and len(self.buckets) < self.max_buckets:
+                break
+            self.buckets.popitem(last=False)
+
+
+# "1 minute", "40 seconds": how long the form tells a limited user to wait
+def wait_text(seconds):
+    seconds = math.ceil(seconds)
+    if seconds >= 60:
+        minutes = math.ceil(seconds / 60)
+        return f"{minutes} minute{'s' if minutes > 1 else ''}"
+    return f"{seconds} second{'s' if seconds > 1 else ''}"
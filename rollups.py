@@ -0,0 +1,102 @@
+import sys
+
+import pandas as pd
+
+from archive import load_with_archive
+from views import MaterializedView
+
+ROLLUPS_FILE = "vitatkal_rollups.json"
+ANY_AGENT = "*"
+BOOKED = "Booked"
+
+
+# ---------- Summary rollups ----------
+# Cells keyed "agent|month|status" holding group / passenger counts and
+# profit. Requests have no agent yet, so they roll up under "*" with their
+# status; booked-log entries roll up under their agent with status "Booked".
+# Month is the journey month (YYYY-MM), "" when the date is missing.
+def cell_key(agent, month, status):
+    return f"{agent}|{month}|{status}"
+
+
+def split_key(key):
+    return tuple(key.split("|", 2))
+
+
+def _months(dates):
+    return pd.to_datetime(dates, errors="coerce").dt.strftime("%Y-%m").fillna("")
+
+
+def request_cells(rows):
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return {}
+    groups = df.groupby("GroupID", sort=False).agg(
+        doj=("Date of Journey", "first"), status=("Status", "first"), passengers=("Name", "size"))
+    groups["key"] = [cell_key(ANY_AGENT, m, s) for m, s in zip(_months(groups["doj"]), groups["status"].fillna(""))]
+    summed = groups.groupby("key").agg(groups=("passengers", "size"), passengers=("passengers", "sum"))
+    return {k: {"groups": int(r.groups), "passengers": int(r.passengers), "profit": 0.0} for k, r in summed.iterrows()}
+
+
+def booked_cells(rows):
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return {}
+    keys = [cell_key(a, m, BOOKED) for a, m in zip(df["Agent"].fillna(""), _months(df["Date of Journey"]))]
+    profit = pd.to_numeric(df["Profit"], errors="coerce").fillna(0.0)
+    summed = profit.groupby(keys).agg(["size", "sum"])
+    return {k: {"groups": int(r["size"]), "passengers": 0, "profit": round(float(r["sum"]), 6)} for k, r in summed.iterrows()}
+
+
+class Rollups(MaterializedView):
+    TABLES = ("requests", "booked_log")
+
+    def __init__(self, path=ROLLUPS_FILE):
+        super().__init__(path)
+
+    def compute(self, storage):
+        cells = request_cells(load_with_archive(storage, "requests").to_dict("records"))
+        cells.update(booked_cells(load_with_archive(storage, "booked_log").to_dict("records")))
+        return {"cells": cells}
+
+    def apply(self, state, storage, table, old_rows, new_rows):
+        to_cells = request_cells if table == "requests" else booked_cells
+        cells = state["cells"]
+        for sign, rows in ((-1, old_rows), (1, new_rows)):
+            for key, values in to_cells(rows).items():
+                cell = cells.setdefault(key, {"groups": 0, "passengers": 0, "profit": 0.0})
+                for field, value in values.items():
+                    cell[field] = round(cell[field] + sign * value, 6)
+                if not cell["groups"] and not cell["passengers"]:
+                    del cells[key]
+
+    # ---------- Readers ----------
+    def frame(self, storage):
+        cells = self.state(storage)["cells"]
+        rows = [(*split_key(k), v["groups"], v["passengers"], v["profit"]) for k, v in cells.items()]
+        return pd.DataFrame(rows, columns=["Agent", "Month", "Status", "Groups", "Passengers", "Profit"])
+
+    def check(self, storage):
+        # Compare the stored rollup with one recomputed from the raw data
+        stored = self.state(storage)["cells"]
+        fresh = self.compute(storage)["cells"]
+        return {k: (stored.get(k), fresh.get(k)) for k in set(stored) | set(fresh) if stored.get(k) != fresh.get(k)}
+
+
+if __name__ == "__main__":
+    from storage import open_storage
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("rebuild", "check"):
+        print("Usage: python rollups.py rebuild|check [csv|sqlite]")
+        sys.exit(1)
+    store = open_storage(sys.argv[2] if len(sys.argv) > 2 else "csv")
+    rollups = Rollups()
+    if sys.argv[1] == "rebuild":
+        cells = rollups.rebuild(store)["cells"]
+        print(f"✅ Rebuilt {len(cells)} rollup cell(s)")
+    else:
+        mismatches = rollups.check(store)
+        for key, (stored, fresh) in sorted(mismatches.items()):
+            print(f"❌ {key}: stored={stored} raw={fresh}")
+        print("✅ Rollups match raw data" if not mismatches else f"{len(mismatches)} mismatched cell(s)")
+        sys.exit(1 if mismatches else 0)
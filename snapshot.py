@@ -0,0 +1,100 @@
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from fileio import atomic_open, locked
+from metrics import incr
+
+SNAPSHOT_FILE = "vitatkal_{table}.arrow"
+VERSION_KEY = b"vitatkal_version"
+
+# Column types in the typed frames; anything not listed stays as loaded
+CATEGORIES = {
+    "requests": ["Gender", "Class", "Boarding Station", "Destination", "Status"],
+    "booked_log": ["Agent"],
+}
+DATES = {
+    "requests": ["Date of Journey", "Date"],
+    "booked_log": ["Date of Journey"],
+}
+NUMBERS = {
+    "requests": ["Age"],
+    "booked_log": ["Profit"],
+}
+STRINGS = {
+    "requests": ["Name", "Phone", "GroupID"],
+    "booked_log": ["Customer Name", "Splits", "GroupID"],
+}
+
+
+def to_typed(df, table):
+    # Dates parsed once, low-cardinality text as categoricals, ids as strings
+    columns = {}
+    for col in DATES[table]:
+        if col in df:
+            columns[col] = pd.to_datetime(df[col], errors="coerce")
+    for col in NUMBERS[table]:
+        if col in df:
+            columns[col] = pd.to_numeric(df[col], errors="coerce")
+    for col in STRINGS[table]:
+        if col in df:
+            columns[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    for col in CATEGORIES[table]:
+        if col in df:
+            columns[col] = df[col].astype("category")
+    return df.assign(**columns)
+
+
+# ---------- Columnar snapshot ----------
+# A typed copy of one table in Arrow IPC file format (uncompressed, so it is
+# memory-mapped rather than parsed). The file records the table version it
+# was built from; a read at any other version rebuilds it from the source of
+# truth first, so the snapshot is never newer or older than what it claims.
+class ColumnarSnapshot:
+    def __init__(self, table, path=None):
+        self.table = table
+        self.path = path or SNAPSHOT_FILE.format(table=table)
+
+    def load(self, storage):
+        version = _normalise(storage.version(self.table))
+        with locked(self.path):
+            if self._stored_version() == version:
+                return self._read()
+            df = to_typed(self._source(storage), self.table)
+            self._write(df, version)
+            return df
+
+    def _source(self, storage):
+        return storage.load_requests() if self.table == "requests" else storage.load_booked_log()
+
+    def _stored_version(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with pa.memory_map(self.path) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None  # partial or foreign file: rebuild
+        raw = metadata.get(VERSION_KEY)
+        return json.loads(raw) if raw else None
+
+    def _read(self):
+        with pa.memory_map(self.path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        incr("bytes_read_total", table.nbytes, file=os.path.basename(self.path))
+        return table.to_pandas()
+
+    def _write(self, df, version):
+        # Row-id indexes (booked log) are kept; a plain RangeIndex is stored as metadata
+        table = pa.Table.from_pandas(df, preserve_index=None)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), VERSION_KEY: json.dumps(version)})
+        with atomic_open(self.path, "wb") as f:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _normalise(version):
+    # Round-trip through JSON so tuples compare equal to stored lists
+    return json.loads(json.dumps(version))
@@ -0,0 +1,91 @@
+import bisect
+import os
+import re
+import sys
+from functools import lru_cache
+
+import pandas as pd
+
+STATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stations.csv")
+LABEL_CODE = re.compile(r"^([A-Z]{1,5}) — ")  # "CLT — Kozhikode", as the form lists them
+
+
+def _key(text):
+    # Case, punctuation and spacing don't matter: "Pt. Deen Dayal" == "pt deen dayal"
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text)).casefold().split())
+
+
+# ---------- Station index ----------
+# Built once per process from the bundled station table (code, name, "|"-
+# separated aliases). Exact lookups are a dict hit on code, name or alias.
+# Prefix completion is a bisect into one sorted key list, like the group
+# index's name search: every code, name, alias and each word-start of a
+# multi-word name ("bengaluru" finds "KSR Bengaluru").
+class StationIndex:
+    def __init__(self, stations):
+        self.names = dict(zip(stations["code"], stations["name"]))
+        self.exact = {}
+        entries = set()
+        for code, name, aliases in stations[["code", "name", "aliases"]].itertuples(index=False):
+            keys = [_key(name)] + [_key(a) for a in str(aliases or "").split("|") if a.strip()]
+            for key in keys:
+                self.exact.setdefault(key, code)
+            words = _key(name).split()
+            keys += [_key(code)] + [" ".join(words[i:]) for i in range(1, len(words))]
+            entries.update((key, code) for key in keys if key)
+        self.exact.update((_key(code), code) for code in self.names)  # a code beats a name
+        self.entries = sorted(entries)
+        self.keys = [key for key, _ in self.entries]
+
+    def __len__(self):
+        return len(self.names)
+
+    def label(self, code):
+        return f"{code} — {self.names[code]}" if code in self.names else code
+
+    def labels(self):
+        return [self.label(code) for code in sorted(self.names, key=self.names.get)]
+
+    # Canonical code for a code, name, alias or form label; None if unknown
+    def lookup(self, text):
+        text = str(text or "").strip()
+        match = LABEL_CODE.match(text)
+        if match and match.group(1) in self.names:
+            return match.group(1)
+        return self.exact.get(_key(text))
+
+    # Up to `limit` station codes for what has been typed so far; an exact
+    # code or name comes first, then matches in key order
+    def complete(self, prefix, limit=10):
+        key = _key(prefix)
+        if not key:
+            return []
+        found = []
+        exact = self.exact.get(key)
+        if exact:
+            found.append(exact)
+        i = bisect.bisect_left(self.keys, key)
+        while i < len(self.keys) and len(found) < limit and self.keys[i].startswith(key):
+            code = self.entries[i][1]
+            if code not in found:
+                found.append(code)
+            i += 1
+        return found
+
+
+@lru_cache(maxsize=None)
+def station_index(path=STATIONS_FILE):
+    return StationIndex(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+
+# Code for a known station, otherwise what was typed in capitals (small
+# stations missing from the table still go through)
+def normalise_station(text):
+    text = str(text or "").strip()
+    return station_index().lookup(text) or text.upper()
+
+
+if __name__ == "__main__":
+    index = station_index()
+    for query in sys.argv[1:] or ["calicut"]:
+        print(f"{query!r}: {normalise_station(query)} | " + ", ".join(index.label(c) for c in index.complete(query)))
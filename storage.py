@@ -0,0 +1,707 @@
+import json
+import os
+import sqlite3
+import sys
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from archive import ARCHIVE_DIR, Archive
+from fileio import atomic_open, atomic_write_csv, atomic_write_json, locked
+from journal import Journal
+from metrics import incr
+
+CSV_FILE = "vitatkal_requests.csv"
+AGENTS_FILE = "agents.json"
+BOOKED_LOG_FILE = "booked_log.csv"
+SETTLEMENT_FILE = "settlement_log.csv"
+SQLITE_FILE = "vitatkal.db"
+SCHEMA_FILE = "vitatkal_schema.json"
+CHANGE_LOG_KEEP = 5000  # requests writes kept in the SQLite change feed
+
+REQUEST_COLUMNS = [
+    "Name", "Age", "Gender", "Class", "Boarding Station",
+    "Destination", "Phone", "Date of Journey", "Date", "Status", "GroupID"
+]
+# Splits holds each booking's profit shares as JSON, {"<agent>": fraction}
+BOOKED_LOG_COLUMNS = ["Customer Name", "Date of Journey", "Agent", "Profit", "Splits", "GroupID"]
+SETTLEMENT_COLUMNS = ["Agent", "Amount", "Date", "Notes"]
+TABLE_COLUMNS = {"requests": REQUEST_COLUMNS, "booked_log": BOOKED_LOG_COLUMNS, "settlements": SETTLEMENT_COLUMNS}
+CLASSES = ["Sleeper", "3A", "2A", "1A", "CC", "2S"]
+GENDERS = ["Male", "Female", "Other"]
+
+# ---------- Agent registry ----------
+# agents.json (or the SQLite agents table) lists every agent in display
+# order with a default profit split (percent), a card icon and a colour.
+DEFAULT_AGENTS = {
+    "Aravind": {"split": 50, "icon": "🧔", "color": "#FFADAD"},
+    "Nazmil": {"split": 25, "icon": "👨‍💼", "color": "#FFD6A5"},
+    "Christy": {"split": 25, "icon": "👨‍🎓", "color": "#B5EAD7"},
+}
+AGENT_ICON = "🧑‍💼"
+AGENT_COLORS = ["#FFADAD", "#FFD6A5", "#B5EAD7", "#CAFFBF", "#9BF6FF", "#A0C4FF", "#BDB2FF", "#FFC6FF"]
+
+
+def agent_registry(raw):
+    # {name: {"split", "icon", "color"}}; also reads the older {name: split} form
+    registry = {}
+    for i, (name, info) in enumerate(raw.items()):
+        if not isinstance(info, dict):
+            info = {"split": info}
+        known = DEFAULT_AGENTS.get(name, {})
+        registry[str(name)] = {
+            "split": float(info.get("split") or 0),
+            "icon": _text(info.get("icon")) or known.get("icon", AGENT_ICON),
+            "color": _text(info.get("color")) or known.get("color", AGENT_COLORS[i % len(AGENT_COLORS)]),
+        }
+    return registry
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else ""
+
+
+# ---------- Group IDs ----------
+# Time-ordered and collision-free: millisecond timestamp, a per-process
+# sequence for IDs minted in the same millisecond, and a random suffix so
+# separate processes cannot collide. Lexically sortable by creation time.
+_id_lock = threading.Lock()
+_id_state = {"ms": 0, "seq": 0}
+
+
+def new_group_id():
+    with _id_lock:
+        ms = max(int(time.time() * 1000), _id_state["ms"])
+        if ms == _id_state["ms"]:
+            _id_state["seq"] += 1
+            if _id_state["seq"] > 999:
+                ms += 1
+                _id_state["seq"] = 0
+        else:
+            _id_state["seq"] = 0
+        _id_state["ms"] = ms
+        return f"G{ms:013d}{_id_state['seq']:03d}{secrets.token_hex(2)}"
+
+
+def match_any(df, criteria_list):
+    # Rows equal (as strings) to every column of at least one criteria dict
+    matched = pd.Series(False, index=df.index)
+    for criteria in criteria_list:
+        match = pd.Series(True, index=df.index)
+        for col, value in criteria.items():
+            match &= df[col].astype(str) == str(value)
+        matched |= match
+    return matched
+
+
+# ---------- Storage interface ----------
+# Booked-log and settlement frames are indexed by a backend row id, which is
+# what the update/delete methods take.
+class Storage:
+    TABLES = ("requests", "booked_log", "settlements", "agents")
+
+    # Cheap change marker for a table; differs whenever its data changed
+    def version(self, table):
+        raise NotImplementedError
+
+    def load_requests(self, status=None):
+        raise NotImplementedError
+
+    def get_group(self, group_id):
+        raise NotImplementedError
+
+    def count_groups(self, status=None):
+        raise NotImplementedError
+
+    def add_requests(self, rows):
+        raise NotImplementedError
+
+    # Several submissions (each a list of rows sharing a GroupID) in one write
+    def add_request_groups(self, groups):
+        raise NotImplementedError
+
+    def set_group_status(self, group_id, status):
+        raise NotImplementedError
+
+    def delete_group(self, group_id):
+        raise NotImplementedError
+
+    # Bulk variants: one write (one journal event / one transaction) for many groups
+    def set_groups_status(self, group_ids, status):
+        raise NotImplementedError
+
+    def delete_groups(self, group_ids):
+        raise NotImplementedError
+
+    # Change feed over requests: every write gets the next sequence number.
+    # changes_since(cursor) returns (latest cursor, events after cursor), each
+    # event {"seq", "op": submit|status|delete, "group_ids"} plus "rows"
+    # (submit) or "status". Events are None when the feed can no longer
+    # account for every write since the cursor; callers then reload.
+    def change_cursor(self):
+        raise NotImplementedError
+
+    def changes_since(self, cursor):
+        raise NotImplementedError
+
+    def load_booked_log(self):
+        raise NotImplementedError
+
+    def add_booked_log(self, entry):
+        raise NotImplementedError
+
+    def add_booked_log_many(self, entries):
+        raise NotImplementedError
+
+    def update_booked_log(self, row_id, entry):
+        raise NotImplementedError
+
+    def delete_booked_log(self, row_id):
+        raise NotImplementedError
+
+    def delete_booked_log_matching(self, criteria):
+        raise NotImplementedError
+
+    # Deletes rows matching any of several criteria dicts
+    def delete_booked_log_matching_any(self, criteria_list):
+        raise NotImplementedError
+
+    # Deletes the log rows of exactly these bookings, keyed by GroupID
+    def delete_booked_log_groups(self, group_ids):
+        raise NotImplementedError
+
+    def delete_booked_log_rows(self, row_ids):
+        raise NotImplementedError
+
+    def load_settlements(self):
+        raise NotImplementedError
+
+    def add_settlement(self, entry):
+        raise NotImplementedError
+
+    def add_settlements(self, entries):
+        raise NotImplementedError
+
+    def update_settlement(self, row_id, entry):
+        raise NotImplementedError
+
+    def delete_settlement(self, row_id):
+        raise NotImplementedError
+
+    def load_agents(self):
+        raise NotImplementedError
+
+    def save_agents(self, agent_dict):
+        raise NotImplementedError
+
+    # Streams requests, booked_log or settlements as DataFrames of at most
+    # `chunksize` rows (no row ids), without building the whole table
+    def iter_table(self, table, chunksize):
+        raise NotImplementedError
+
+    # Data schema version, advanced by migrations.py
+    def schema_version(self):
+        raise NotImplementedError
+
+    def set_schema_version(self, version):
+        raise NotImplementedError
+
+    # Past months moved to read-only partitions (archive.py); both backends
+    # keep them as files next to their data
+    def archived_months(self, table):
+        return self.archive.months(table)
+
+    def load_archived(self, table, months):
+        columns = REQUEST_COLUMNS if table == "requests" else BOOKED_LOG_COLUMNS
+        return self.archive.load(table, months, columns)
+
+    def archive_version(self):
+        return self.archive.version()
+
+
+# ---------- CSV backend ----------
+class CsvStorage(Storage):
+    def __init__(self, requests_file=CSV_FILE, booked_log_file=BOOKED_LOG_FILE,
+                 settlement_file=SETTLEMENT_FILE, agents_file=AGENTS_FILE, schema_file=SCHEMA_FILE,
+                 archive_dir=ARCHIVE_DIR):
+        self.requests_file = requests_file
+        self.schema_file = schema_file
+        self.booked_log_file = booked_log_file
+        self.settlement_file = settlement_file
+        self.agents_file = agents_file
+        self.journal = Journal(requests_file, REQUEST_COLUMNS)
+        self.archive = Archive(archive_dir)
+
+    def version(self, table):
+        files = {
+            "requests": [self.requests_file, self.journal.journal_file],
+            "booked_log": [self.booked_log_file],
+            "settlements": [self.settlement_file],
+            "agents": [self.agents_file],
+        }[table]
+        marker = []
+        for path in files:
+            try:
+                stat = os.stat(path)
+                marker.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                marker.append(None)
+        return tuple(marker)
+
+    # Requests go through the append-only journal
+    def load_requests(self, status=None):
+        df = self.journal.load()
+        if status is not None:
+            df = df[df["Status"] == status]
+        return df
+
+    def get_group(self, group_id):
+        df = self.journal.load()
+        return df[df["GroupID"] == group_id]
+
+    def count_groups(self, status=None):
+        return self.load_requests(status)["GroupID"].nunique()
+
+    def add_requests(self, rows):
+        self.journal.append("submit", rows=rows)
+
+    def add_request_groups(self, groups):
+        self.journal.append_many([{"op": "submit", "rows": rows} for rows in groups])
+
+    def set_group_status(self, group_id, status):
+        self.journal.append("status", group_id=group_id, status=status)
+
+    def delete_group(self, group_id):
+        self.journal.append("delete", group_id=group_id)
+
+    def set_groups_status(self, group_ids, status):
+        self.journal.append("status", group_ids=list(group_ids), status=status)
+
+    def delete_groups(self, group_ids):
+        self.journal.append("delete", group_ids=list(group_ids))
+
+    def change_cursor(self):
+        return self.journal.cursor()
+
+    def changes_since(self, cursor):
+        return self.journal.changes_since(cursor)
+
+    # Booked log
+    def load_booked_log(self):
+        return self._read(self.booked_log_file, BOOKED_LOG_COLUMNS)
+
+    def add_booked_log(self, entry):
+        self._append(self.booked_log_file, BOOKED_LOG_COLUMNS, [entry])
+
+    def add_booked_log_many(self, entries):
+        self._append(self.booked_log_file, BOOKED_LOG_COLUMNS, entries)
+
+    def update_booked_log(self, row_id, entry):
+        self._update(self.booked_log_file, BOOKED_LOG_COLUMNS, row_id, entry)
+
+    def delete_booked_log(self, row_id):
+        self._delete(self.booked_log_file, BOOKED_LOG_COLUMNS, row_id)
+
+    def delete_booked_log_matching(self, criteria):
+        self.delete_booked_log_matching_any([criteria])
+
+    def delete_booked_log_matching_any(self, criteria_list):
+        with locked(self.booked_log_file):
+            df = self.load_booked_log()
+            atomic_write_csv(df[~match_any(df, criteria_list)], self.booked_log_file)
+
+    def delete_booked_log_groups(self, group_ids):
+        with locked(self.booked_log_file):
+            df = self.load_booked_log()
+            match = df["GroupID"].isin(list(group_ids))
+            if match.any():
+                atomic_write_csv(df[~match], self.booked_log_file)
+
+    def delete_booked_log_rows(self, row_ids):
+        with locked(self.booked_log_file):
+            df = self.load_booked_log()
+            atomic_write_csv(df.drop(index=list(row_ids)).reset_index(drop=True), self.booked_log_file)
+
+    # Settlements
+    def load_settlements(self):
+        return self._read(self.settlement_file, SETTLEMENT_COLUMNS)
+
+    def add_settlement(self, entry):
+        self._append(self.settlement_file, SETTLEMENT_COLUMNS, [entry])
+
+    def add_settlements(self, entries):
+        self._append(self.settlement_file, SETTLEMENT_COLUMNS, entries)
+
+    def update_settlement(self, row_id, entry):
+        self._update(self.settlement_file, SETTLEMENT_COLUMNS, row_id, entry)
+
+    def delete_settlement(self, row_id):
+        self._delete(self.settlement_file, SETTLEMENT_COLUMNS, row_id)
+
+    # Agents
+    def load_agents(self):
+        if os.path.exists(self.agents_file):
+            with open(self.agents_file, encoding="utf-8") as f:
+                return agent_registry(json.load(f))
+        return agent_registry(DEFAULT_AGENTS)
+
+    def save_agents(self, agent_dict):
+        with locked(self.agents_file), atomic_open(self.agents_file) as f:
+            json.dump(agent_registry(agent_dict), f, ensure_ascii=False, indent=2)
+
+    def schema_version(self):
+        if os.path.exists(self.schema_file):
+            with open(self.schema_file, encoding="utf-8") as f:
+                return json.load(f).get("version", 0)
+        return 0
+
+    def set_schema_version(self, version):
+        with locked(self.schema_file):
+            atomic_write_json({"version": version}, self.schema_file)
+
+    def iter_table(self, table, chunksize):
+        if table == "requests":
+            yield from self.journal.iter_chunks(chunksize)
+            return
+        path = self.booked_log_file if table == "booked_log" else self.settlement_file
+        with locked(path):
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                return
+            handle = open(path, "rb")  # rewrites replace the file; this handle keeps its snapshot
+        with handle:
+            for chunk in pd.read_csv(handle, chunksize=chunksize, dtype={"GroupID": str}):
+                yield chunk.reindex(columns=TABLE_COLUMNS[table])
+
+    # Helpers
+    def _read(self, path, columns):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            incr("bytes_read_total", os.path.getsize(path), file=os.path.basename(path))
+            return pd.read_csv(path)
+        return pd.DataFrame(columns=columns)
+
+    # Appends are a single small write under the lock; rewrites go through a temp file
+    def _append(self, path, columns, entries):
+        with locked(path):
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size > 0:
+                header = list(pd.read_csv(path, nrows=0).columns)
+                pd.DataFrame(entries).reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
+            else:
+                pd.DataFrame(entries).reindex(columns=columns).to_csv(path, index=False)
+            incr("bytes_written_total", os.path.getsize(path) - size, file=os.path.basename(path))
+
+    def _update(self, path, columns, row_id, entry):
+        with locked(path):
+            df = self._read(path, columns)
+            for col, value in entry.items():
+                df.at[row_id, col] = value
+            atomic_write_csv(df, path)
+
+    def _delete(self, path, columns, row_id):
+        with locked(path):
+            df = self._read(path, columns)
+            atomic_write_csv(df.drop(index=row_id).reset_index(drop=True), path)
+
+
+# ---------- SQLite backend ----------
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteStorage(Storage):
+    def __init__(self, path=SQLITE_FILE, archive_dir=ARCHIVE_DIR):
+        self.path = path
+        self._local = threading.local()
+        self.archive = Archive(archive_dir)
+        self._init_schema()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        def cols(names, types):
+            return ", ".join(f"{_quote(n)} {types.get(n, 'TEXT')}" for n in names)
+
+        conn = self._conn()
+        with conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS requests (id INTEGER PRIMARY KEY, "
+                         f"{cols(REQUEST_COLUMNS, {'Age': 'INTEGER'})})")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS booked_log (id INTEGER PRIMARY KEY, "
+                         f"{cols(BOOKED_LOG_COLUMNS, {'Profit': 'REAL'})})")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS settlements (id INTEGER PRIMARY KEY, "
+                         f"{cols(SETTLEMENT_COLUMNS, {'Amount': 'REAL'})})")
+            conn.execute("CREATE TABLE IF NOT EXISTS agents (name TEXT PRIMARY KEY, split REAL, icon TEXT, color TEXT, position INTEGER)")
+            conn.execute("CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            conn.execute('CREATE TABLE IF NOT EXISTS request_changes (seq INTEGER NOT NULL, op TEXT NOT NULL, '
+                         '"GroupID" TEXT, "Status" TEXT)')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_request_changes_seq ON request_changes (seq)")
+            conn.executemany("INSERT OR IGNORE INTO versions (name, version) VALUES (?, 0)", [(t,) for t in self.TABLES])
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_requests_group ON requests ("GroupID")')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_requests_status ON requests ("Status")')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_requests_doj ON requests ("Date of Journey")')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_booked_name ON booked_log ("Customer Name", "Date of Journey")')
+            # A pre-GroupID booked_log gets the column and its index from migration 3
+            if "GroupID" in {row[1] for row in conn.execute("PRAGMA table_info(booked_log)")}:
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_booked_group ON booked_log ("GroupID")')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_settlements_agent ON settlements ("Agent")')
+
+    # Every write runs in one transaction that also bumps the table's version
+    @contextmanager
+    def _write(self, table):
+        conn = self._conn()
+        with conn:
+            yield conn
+            conn.execute("UPDATE versions SET version = version + 1 WHERE name = ?", (table,))
+
+    def version(self, table):
+        return self._conn().execute("SELECT version FROM versions WHERE name = ?", (table,)).fetchone()[0]
+
+    def _query(self, sql, params=(), index_col=None):
+        return pd.read_sql_query(sql, self._conn(), params=params, index_col=index_col)
+
+    def _insert(self, table, columns, rows):
+        with self._write(table) as conn:
+            self._insert_rows(conn, table, columns, rows)
+
+    def _insert_rows(self, conn, table, columns, rows):
+        names = ", ".join(_quote(c) for c in columns)
+        marks = ", ".join("?" for _ in columns)
+        conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({marks})",
+                         [tuple(row.get(c) for c in columns) for row in rows])
+
+    # Change feed: a requests write is logged under the version it produces,
+    # one row per group touched. Called after the write's own statements, so
+    # the transaction already holds the write lock when it reads the version.
+    def _log_changes(self, conn, op, group_ids, status=None):
+        seq = conn.execute("SELECT version FROM versions WHERE name = 'requests'").fetchone()[0] + 1
+        conn.executemany('INSERT INTO request_changes (seq, op, "GroupID", "Status") VALUES (?, ?, ?, ?)',
+                         [(seq, op, g, status) for g in group_ids])
+        if seq % 100 == 0:
+            conn.execute("DELETE FROM request_changes WHERE seq <= ?", (seq - CHANGE_LOG_KEEP,))
+
+    def _update_row(self, table, row_id, entry):
+        sets = ", ".join(f"{_quote(c)} = ?" for c in entry)
+        with self._write(table) as conn:
+            conn.execute(f"UPDATE {table} SET {sets} WHERE id = ?", (*entry.values(), int(row_id)))
+
+    def _delete_row(self, table, row_id):
+        with self._write(table) as conn:
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (int(row_id),))
+
+    # Requests
+    def load_requests(self, status=None):
+        select = ", ".join(_quote(c) for c in REQUEST_COLUMNS)
+        if status is None:
+            return self._query(f"SELECT {select} FROM requests ORDER BY id")
+        return self._query(f'SELECT {select} FROM requests WHERE "Status" = ? ORDER BY id', (status,))
+
+    def get_group(self, group_id):
+        select = ", ".join(_quote(c) for c in REQUEST_COLUMNS)
+        return self._query(f'SELECT {select} FROM requests WHERE "GroupID" = ? ORDER BY id', (group_id,))
+
+    def count_groups(self, status=None):
+        if status is None:
+            row = self._conn().execute('SELECT COUNT(DISTINCT "GroupID") FROM requests').fetchone()
+        else:
+            row = self._conn().execute('SELECT COUNT(DISTINCT "GroupID") FROM requests WHERE "Status" = ?', (status,)).fetchone()
+        return row[0]
+
+    def add_requests(self, rows):
+        self.add_request_groups([rows])
+
+    def add_request_groups(self, groups):
+        with self._write("requests") as conn:
+            self._insert_rows(conn, "requests", REQUEST_COLUMNS, [row for rows in groups for row in rows])
+            self._log_changes(conn, "submit", [rows[0]["GroupID"] for rows in groups])
+
+    def set_group_status(self, group_id, status):
+        self.set_groups_status([group_id], status)
+
+    def delete_group(self, group_id):
+        self.delete_groups([group_id])
+
+    def set_groups_status(self, group_ids, status):
+        with self._write("requests") as conn:
+            conn.executemany('UPDATE requests SET "Status" = ? WHERE "GroupID" = ?', [(status, g) for g in group_ids])
+            self._log_changes(conn, "status", group_ids, status)
+
+    def delete_groups(self, group_ids):
+        with self._write("requests") as conn:
+            conn.executemany('DELETE FROM requests WHERE "GroupID" = ?', [(g,) for g in group_ids])
+            self._log_changes(conn, "delete", group_ids)
+
+    def change_cursor(self):
+        return self.version("requests")
+
+    def changes_since(self, cursor):
+        current = self.version("requests")
+        if cursor is None or cursor > current:
+            return current, None
+        log = self._query('SELECT seq, op, "GroupID", "Status" FROM request_changes WHERE seq > ? AND seq <= ? '
+                          'ORDER BY seq, rowid', (cursor, current))
+        if set(log["seq"]) != set(range(cursor + 1, current + 1)):
+            return current, None  # pruned, or written outside the feed (migrations)
+
+        # Submitted groups are read back as they are now; later events still apply in order
+        submitted = log.loc[log["op"] == "submit", "GroupID"].unique().tolist()
+        select = ", ".join(_quote(c) for c in REQUEST_COLUMNS)
+        rows = {}
+        for start in range(0, len(submitted), 500):
+            chunk = submitted[start:start + 500]
+            found = self._query(f'SELECT {select} FROM requests WHERE "GroupID" IN ({", ".join("?" for _ in chunk)}) '
+                                f'ORDER BY id', tuple(chunk))
+            for group_id, group in found.groupby("GroupID", sort=False):
+                rows[group_id] = group.astype(object).where(pd.notna(group), None).to_dict("records")
+
+        events = []
+        for (seq, op), batch in log.groupby(["seq", "op"], sort=False):
+            if op == "submit":
+                events += [{"seq": int(seq), "op": op, "group_ids": [g], "rows": rows.get(g, [])} for g in batch["GroupID"]]
+            else:
+                event = {"seq": int(seq), "op": op, "group_ids": batch["GroupID"].tolist()}
+                if op == "status":
+                    event["status"] = batch["Status"].iloc[0]
+                events.append(event)
+        return current, events
+
+    # Booked log
+    def load_booked_log(self):
+        select = ", ".join(_quote(c) for c in BOOKED_LOG_COLUMNS)
+        df = self._query(f"SELECT id, {select} FROM booked_log ORDER BY id", index_col="id")
+        df.index.name = None
+        return df
+
+    def add_booked_log(self, entry):
+        self._insert("booked_log", BOOKED_LOG_COLUMNS, [entry])
+
+    def add_booked_log_many(self, entries):
+        self._insert("booked_log", BOOKED_LOG_COLUMNS, entries)
+
+    def update_booked_log(self, row_id, entry):
+        self._update_row("booked_log", row_id, entry)
+
+    def delete_booked_log(self, row_id):
+        self._delete_row("booked_log", row_id)
+
+    def delete_booked_log_matching(self, criteria):
+        self.delete_booked_log_matching_any([criteria])
+
+    def delete_booked_log_matching_any(self, criteria_list):
+        with self._write("booked_log") as conn:
+            for criteria in criteria_list:
+                where = " AND ".join(f"{_quote(c)} = ?" for c in criteria)
+                conn.execute(f"DELETE FROM booked_log WHERE {where}", tuple(criteria.values()))
+
+    def delete_booked_log_groups(self, group_ids):
+        with self._write("booked_log") as conn:
+            conn.executemany('DELETE FROM booked_log WHERE "GroupID" = ?', [(g,) for g in group_ids])
+
+    def delete_booked_log_rows(self, row_ids):
+        with self._write("booked_log") as conn:
+            conn.executemany("DELETE FROM booked_log WHERE id = ?", [(int(i),) for i in row_ids])
+
+    # Settlements
+    def load_settlements(self):
+        select = ", ".join(_quote(c) for c in SETTLEMENT_COLUMNS)
+        df = self._query(f"SELECT id, {select} FROM settlements ORDER BY id", index_col="id")
+        df.index.name = None
+        return df
+
+    def add_settlement(self, entry):
+        self._insert("settlements", SETTLEMENT_COLUMNS, [entry])
+
+    def add_settlements(self, entries):
+        self._insert("settlements", SETTLEMENT_COLUMNS, entries)
+
+    def update_settlement(self, row_id, entry):
+        self._update_row("settlements", row_id, entry)
+
+    def delete_settlement(self, row_id):
+        self._delete_row("settlements", row_id)
+
+    # Agents
+    def load_agents(self):
+        rows = self._conn().execute("SELECT name, split, icon, color FROM agents ORDER BY position, rowid").fetchall()
+        if not rows:
+            return agent_registry(DEFAULT_AGENTS)
+        return agent_registry({name: {"split": split, "icon": icon, "color": color} for name, split, icon, color in rows})
+
+    def save_agents(self, agent_dict):
+        registry = agent_registry(agent_dict)
+        with self._write("agents") as conn:
+            conn.execute("DELETE FROM agents")
+            conn.executemany("INSERT INTO agents (name, split, icon, color, position) VALUES (?, ?, ?, ?, ?)",
+                             [(name, a["split"], a["icon"], a["color"], i) for i, (name, a) in enumerate(registry.items())])
+
+    def schema_version(self):
+        return self._conn().execute("PRAGMA user_version").fetchone()[0]
+
+    # Own connection and read transaction: one consistent snapshot however
+    # slowly the caller consumes it
+    def iter_table(self, table, chunksize):
+        select = ", ".join(_quote(c) for c in TABLE_COLUMNS[table])
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("BEGIN")
+            yield from pd.read_sql_query(f"SELECT {select} FROM {table} ORDER BY id", conn, chunksize=chunksize)
+        finally:
+            conn.close()
+
+    def set_schema_version(self, version):
+        self._conn().execute(f"PRAGMA user_version = {int(version)}")
+
+
+def open_storage(backend="csv", **options):
+    if backend == "sqlite":
+        return SqliteStorage(**options)
+    if backend == "csv":
+        return CsvStorage(**options)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+# ---------- One-shot CSV -> SQLite migrator ----------
+def migrate_csv_to_sqlite(db_path=SQLITE_FILE, source=None):
+    from migrations import latest_version, run_migrations
+
+    source = source or CsvStorage()
+    run_migrations(source)  # copy current-format data only
+    target = SqliteStorage(db_path)
+    conn = target._conn()
+    if conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0]:
+        raise RuntimeError(f"{db_path} already has requests; refusing to migrate twice")
+
+    def records(df, columns):
+        df = df.reindex(columns=columns).astype(object)
+        return df.where(pd.notna(df), None).to_dict("records")
+
+    # One submission per group, so the change feed names every migrated group
+    groups = {}
+    for row in records(source.load_requests(), REQUEST_COLUMNS):
+        groups.setdefault(row["GroupID"], []).append(row)
+    if groups:
+        target.add_request_groups(list(groups.values()))
+    target._insert("booked_log", BOOKED_LOG_COLUMNS, records(source.load_booked_log(), BOOKED_LOG_COLUMNS))
+    target._insert("settlements", SETTLEMENT_COLUMNS, records(source.load_settlements(), SETTLEMENT_COLUMNS))
+    target.save_agents(source.load_agents())
+    # Copied data is already current: stamp it so nothing migrates it again
+    target.set_schema_version(latest_version())
+    return target
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        db = sys.argv[2] if len(sys.argv) > 2 else SQLITE_FILE
+        migrate_csv_to_sqlite(db)
+        print(f"✅ Migrated CSV data into {db}")
+    else:
+        print("Usage: python storage.py migrate [db_path]")
+        sys.exit(1)
@@ -0,0 +1,202 @@
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import time as clock
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from dedupe import GROUP_ID_TIME, submitted_at
+from metrics import incr, span
+
+IST = pytz.timezone("Asia/Kolkata")
+AC_CLASSES = {"1A", "2A", "3A", "3E", "CC", "EC"}
+AC_OPENS = clock(10)       # AC Tatkal opens at 10:00 IST the day before the journey
+NON_AC_OPENS = clock(11)   # sleeper and second sitting at 11:00
+CLAIM_TIMEOUT = 10 * 60    # a popped group not booked by then goes back in the queue
+BOOKED = "Booked ✅"
+
+
+# IST datetime the Tatkal window for a journey opens
+def window_opens(journey_date, train_class):
+    day = pd.Timestamp(journey_date).date() - timedelta(days=1)
+    opens = AC_OPENS if str(train_class).strip().upper() in AC_CLASSES else NON_AC_OPENS
+    return IST.localize(datetime.combine(day, opens))
+
+
+# Heap key: window open time (epoch seconds), then bigger groups first (the
+# harder ones to seat once the quota thins out), then first come first served
+def queue_key(journey_date, train_class, passengers, group_id, submitted=None):
+    when = submitted_at(group_id) or submitted or math.inf
+    return (window_opens(journey_date, train_class).timestamp(), -int(passengers), when, str(group_id))
+
+
+# ---------- Tatkal-window queue ----------
+# One per process, shared by every admin session: a heap of the pending
+# groups in booking order. It follows the requests change feed like the
+# live group index. New submissions are pushed, groups booked or deleted
+# drop out, and groups reverted to pending come back. Superseded heap
+# entries are skipped when they reach the top (lazy deletion). Popping a
+# group claims it for one admin, so two admins never get the same group;
+# a claim that isn't booked within CLAIM_TIMEOUT, or is put back, returns
+# the group to the queue. Groups whose journey date has passed are left
+# out, or dropped as they surface. Claims live in this process only.
+class TatkalQueue:
+    def __init__(self, claim_timeout=CLAIM_TIMEOUT):
+        self.claim_timeout = claim_timeout
+        self.heap = []      # (key, group_id); key = queue_key(...)
+        self.keys = {}      # group_id -> key, every group in the table
+        self.waiting = set()  # pending groups neither claimed nor departed
+        self.claimed = {}   # group_id -> claimed at (time.time())
+        self.cursor = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    # `load_index` returns a GroupIndex (per-group summary plus the feed
+    # cursor it reflects); it is only called when the feed can't be followed
+    def refresh(self, storage, load_index, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            version = storage.version("requests")
+            if version != self.version:
+                events = None
+                if self.cursor is not None:
+                    cursor, events = storage.changes_since(self.cursor)
+                if events is None:
+                    index = load_index()
+                    cursor = index.cursor
+                    with span("build.requests.tatkal_queue"):
+                        self._build(index.groups, now)
+                else:
+                    self._apply(events)
+                self.cursor = cursor
+                self.version = version
+            self._expire(now)
+        return self
+
+    # The group to book next, claimed for the caller; None if nothing is waiting
+    def pop(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            group_id = self._head(now)
+            if group_id is not None:
+                heapq.heappop(self.heap)
+                self.waiting.discard(group_id)
+                self.claimed[group_id] = now
+                incr("tatkal_queue_pops_total")
+            return group_id
+
+    # Put a claimed group back, e.g. when the admin skips it
+    def release(self, group_id):
+        with self.lock:
+            if self.claimed.pop(group_id, None) is not None:
+                self._push(group_id)
+
+    # The next `n` (key, group_id) in order, without claiming them
+    def peek(self, n=5, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            taken = []
+            while len(taken) < n and self._head(now) is not None:
+                taken.append(heapq.heappop(self.heap))
+            for entry in taken:
+                heapq.heappush(self.heap, entry)
+            return taken
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def _head(self, now):
+        # Skips superseded entries and departed journeys; the heap top is
+        # then the next group in order
+        departed = _yesterday_midnight(now)
+        while self.heap:
+            key, group_id = self.heap[0]
+            if group_id in self.waiting and self.keys.get(group_id) == key:
+                if key[0] >= departed:
+                    return group_id
+                self.waiting.discard(group_id)  # journey has left; nothing to book
+            heapq.heappop(self.heap)
+        return None
+
+    def _build(self, groups, now):
+        self.keys.clear()
+        self.waiting.clear()
+        pending = groups["Status"] != BOOKED
+        still_pending = set(groups.index[pending])
+        self.claimed = {g: at for g, at in self.claimed.items() if g in still_pending}
+        if not groups.empty:
+            # queue_key for every group at once
+            ac = groups["Class"].astype(str).str.strip().str.upper().isin(AC_CLASSES).to_numpy()
+            clock_time = np.where(ac, _since_midnight(AC_OPENS), _since_midnight(NON_AC_OPENS))
+            opens = _epoch(groups["Date of Journey"].dt.normalize() - pd.Timedelta(days=1) + pd.to_timedelta(clock_time))
+            # Legacy GroupIDs carry no submit time; fall back to the day submitted
+            ids = groups.index.astype(str)
+            submitted = pd.to_numeric(ids.str.extract(GROUP_ID_TIME, expand=False), errors="coerce").to_numpy() / 1000
+            submitted = np.where(np.isnan(submitted), _epoch(pd.to_datetime(groups["Date"], errors="coerce")), submitted)
+            submitted = np.where(np.isnan(submitted), math.inf, submitted)
+            passengers = -groups["Passengers"].to_numpy(dtype="int64")
+            self.keys = dict(zip(groups.index, zip(opens.tolist(), passengers.tolist(), submitted.tolist(), ids)))
+            waiting = pending.to_numpy() & (opens >= _yesterday_midnight(now)) & ~groups.index.isin(list(self.claimed))
+            self.waiting = set(groups.index[waiting])
+        self.heap = [(self.keys[g], g) for g in self.waiting]
+        heapq.heapify(self.heap)
+
+    def _apply(self, events):
+        for event in events:
+            if event["op"] == "submit":
+                rows = event["rows"]
+                first = rows[0]
+                group_id = event["group_ids"][0]
+                doj = pd.to_datetime(first.get("Date of Journey"), errors="coerce")
+                if pd.isna(doj):
+                    continue
+                self.keys[group_id] = queue_key(doj, first.get("Class"), len(rows), group_id)
+                if first.get("Status") != BOOKED:
+                    self._push(group_id)
+            elif event["op"] == "status":
+                for group_id in event["group_ids"]:
+                    if event["status"] == BOOKED:
+                        self.waiting.discard(group_id)
+                        self.claimed.pop(group_id, None)
+                    elif group_id not in self.claimed:
+                        self._push(group_id)
+            elif event["op"] == "delete":
+                for group_id in event["group_ids"]:
+                    self.keys.pop(group_id, None)
+                    self.waiting.discard(group_id)
+                    self.claimed.pop(group_id, None)
+        if len(self.heap) > 2 * len(self.waiting) + 1000:
+            # Mostly superseded entries: rebuild rather than let them pile up
+            self.heap = [(self.keys[g], g) for g in self.waiting]
+            heapq.heapify(self.heap)
+
+    def _push(self, group_id):
+        key = self.keys.get(group_id)
+        if key is not None and group_id not in self.waiting:
+            self.waiting.add(group_id)
+            heapq.heappush(self.heap, (key, group_id))
+
+    def _expire(self, now):
+        for group_id, at in list(self.claimed.items()):
+            if at < now - self.claim_timeout:
+                del self.claimed[group_id]
+                self._push(group_id)
+
+
+# Windows opening before this (epoch seconds) belong to journeys before today
+def _yesterday_midnight(now):
+    today = datetime.fromtimestamp(now, IST).date()
+    return IST.localize(datetime.combine(today - timedelta(days=1), clock(0))).timestamp()
+
+
+def _since_midnight(at):
+    return pd.Timedelta(hours=at.hour, minutes=at.minute)
+
+
+# Epoch seconds (NaN for NaT) of naive IST datetimes
+def _epoch(naive):
+    return ((pd.DatetimeIndex(naive).tz_localize(IST) - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy()
@@ -0,0 +1,383 @@
+import argparse
+import csv
+import json
+import re
+import sys
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+from ledger import encode_splits, parse_splits
+from stations import normalise_station
+from storage import CLASSES, GENDERS, TABLE_COLUMNS, new_group_id
+
+CHUNK_ROWS = 5000   # rows parsed per chunk
+BATCH = 500         # submissions (or log / settlement rows) per storage commit
+STATUSES = ["Pending", "Booked ✅"]
+DATE_COLUMN = {"requests": "Date of Journey", "booked_log": "Date of Journey", "settlements": "Date"}
+CLASS_ALIASES = {"SL": "Sleeper", "SLEEPER": "Sleeper", "3AC": "3A", "2AC": "2A", "1AC": "1A"}
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S"]  # ISO, then day first
+GENDER_ALIASES = {"M": "Male", "F": "Female", "O": "Other"}
+
+
+# ---------- Reading ----------
+# CSV or JSON-lines from a path or an open binary file (an upload), one chunk
+# at a time. Every value arrives as text (or None); the chunk index is the
+# source line number, for the rejects report.
+def read_chunks(source, fmt=None, chunksize=CHUNK_ROWS):
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    fmt = fmt or ("jsonl" if str(name).endswith((".jsonl", ".ndjson", ".json")) else "csv")
+    if fmt == "jsonl":
+        reader = pd.read_json(source, lines=True, chunksize=chunksize, dtype=False, convert_dates=False)
+        line = 1
+    else:
+        reader = pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+        line = 2  # after the header
+    for chunk in reader:
+        chunk = chunk.astype(object).where(pd.notna(chunk), None)
+        chunk.index = range(line, line + len(chunk))
+        line += len(chunk)
+        yield chunk
+
+
+# ---------- Row validation ----------
+# Each cleaner returns the row as it will be stored, or raises ValueError
+# with the reason it is rejected.
+def _text(row, column):
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+
+def _required(row, column):
+    value = _text(row, column)
+    if not value:
+        raise ValueError(f"Missing {column}")
+    return value
+
+
+def _date(value, column):
+    parsed = _parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid {column}: {value!r}")
+    return parsed
+
+
+@lru_cache(maxsize=4096)  # a file has few distinct dates, and pandas parsing is slow per value
+def _parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    try:
+        parsed = pd.to_datetime(value, dayfirst=True)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(parsed) else parsed.strftime("%Y-%m-%d")
+
+
+def _number(value, column, minimum=0):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {column}: {value!r}")
+    if pd.isna(number) or number < minimum:
+        raise ValueError(f"Invalid {column}: {value!r}")
+    return number
+
+
+def clean_phone(value):
+    digits = re.sub(r"[\s\-().]", "", value)
+    if digits.startswith("+91"):
+        digits = digits[3:]
+    elif len(digits) == 12 and digits.startswith("91"):
+        digits = digits[2:]
+    if not digits.isdigit() or len(digits) != 10:
+        raise ValueError(f"Invalid Phone: {value!r}")
+    return digits
+
+
+def group_key(row):
+    # Which submission a row without a GroupID belongs to; normalised as far
+    # as the row allows, so an invalid passenger still lands in its group
+    def best(clean, value):
+        try:
+            return clean(value)
+        except ValueError:
+            return value
+    train_class = _text(row, "Class").upper()
+    return (best(clean_phone, _text(row, "Phone")),
+            best(lambda v: _date(v, "Date of Journey"), _text(row, "Date of Journey")),
+            normalise_station(_text(row, "Boarding Station")),
+            normalise_station(_text(row, "Destination")),
+            CLASS_ALIASES.get(train_class, train_class))
+
+
+def clean_request(row, today):
+    # Same rules as the booking form: every starred field, a 10-digit phone
+    train_class = _required(row, "Class")
+    train_class = CLASS_ALIASES.get(train_class.upper(), train_class)
+    if train_class not in CLASSES:
+        raise ValueError(f"Invalid Class: {train_class!r}")
+    gender = _required(row, "Gender").capitalize()
+    gender = GENDER_ALIASES.get(gender.upper(), gender)
+    if gender not in GENDERS:
+        raise ValueError(f"Invalid Gender: {gender!r}")
+    age = _number(_required(row, "Age"), "Age", minimum=1)
+    if age > 100 or age != int(age):
+        raise ValueError(f"Invalid Age: {_text(row, 'Age')!r}")
+    status = _text(row, "Status") or "Pending"
+    status = "Booked ✅" if status.lower().startswith("booked") else status.capitalize()
+    if status not in STATUSES:
+        raise ValueError(f"Invalid Status: {status!r}")
+    return {
+        "Name": _required(row, "Name"),
+        "Age": int(age),
+        "Gender": gender,
+        "Class": train_class,
+        "Boarding Station": normalise_station(_required(row, "Boarding Station")),
+        "Destination": normalise_station(_required(row, "Destination")),
+        "Phone": clean_phone(_required(row, "Phone")),
+        "Date of Journey": _date(_required(row, "Date of Journey"), "Date of Journey"),
+        "Date": _date(_text(row, "Date"), "Date") if _text(row, "Date") else today,
+        "Status": status,
+        "GroupID": _text(row, "GroupID"),
+    }
+
+
+def clean_booked_log(row, agents):
+    agent = _required(row, "Agent")
+    if agent not in agents:
+        raise ValueError(f"Unknown Agent: {agent!r}")
+    splits = _text(row, "Splits")
+    legacy = {c[len("Split_"):]: _text(row, c) for c in row if c.startswith("Split_") and _text(row, c)}
+    if splits:
+        shares = parse_splits(splits)
+        if not shares:
+            raise ValueError(f"Invalid Splits: {splits!r}")
+    else:
+        # Older exports carry one Split_<agent> fraction per agent
+        shares = {name: _number(value, f"Split_{name}") for name, value in legacy.items()}
+    if shares:
+        if set(shares) - set(agents):
+            raise ValueError(f"Unknown agent in Splits: {', '.join(sorted(set(shares) - set(agents)))}")
+        if round(sum(shares.values()), 4) != 1:
+            raise ValueError("Splits must total 100%")
+    return {
+        "Customer Name": _required(row, "Customer Name"),
+        "Date of Journey": _date(_required(row, "Date of Journey"), "Date of Journey"),
+        "Agent": agent,
+        "Profit": _number(_required(row, "Profit"), "Profit"),
+        "Splits": encode_splits({name: share * 100 for name, share in shares.items()}) if shares else None,
+        "GroupID": _text(row, "GroupID") or None,
+    }
+
+
+def clean_settlement(row, agents):
+    agent = _required(row, "Agent")
+    if agent not in agents:
+        raise ValueError(f"Unknown Agent: {agent!r}")
+    amount = _number(_required(row, "Amount"), "Amount")
+    if amount == 0:
+        raise ValueError("Amount must be more than zero")
+    return {
+        "Agent": agent,
+        "Amount": amount,
+        "Date": _date(_required(row, "Date"), "Date"),
+        "Notes": _text(row, "Notes"),
+    }
+
+
+# ---------- Streaming import ----------
+# Rows are validated chunk by chunk and committed BATCH at a time, so an
+# import is a few appends / transactions instead of one per row. Requests
+# are grouped into submissions: consecutive rows with the same GroupID, or
+# without one, the same phone, journey date, route and class, which get a
+# new GroupID. A group with any rejected passenger is rejected whole, as is
+# a GroupID already in the store (so re-running an import adds nothing).
+# Rejected rows go to `rejects` (a text file) as CSV: line, reason and the
+# row in the table's columns.
+def import_rows(storage, table, source, fmt=None, rejects=None, chunksize=CHUNK_ROWS, batch=BATCH):
+    summary = {"table": table, "read": 0, "imported": 0, "rejected": 0, "groups": 0, "commits": 0, "reasons": {}}
+    writer = None
+    pending = []
+
+    def reject(line, row, reason):
+        nonlocal writer
+        summary["rejected"] += 1
+        summary["reasons"][reason.split(":")[0]] = summary["reasons"].get(reason.split(":")[0], 0) + 1
+        if rejects is not None:
+            if writer is None:
+                # The table's own columns, whatever the first rejected row
+                # carried, so the file can be fixed and imported again
+                writer = csv.DictWriter(rejects, ["Line", "Reason"] + TABLE_COLUMNS[table],
+                                        restval="", extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({**{k: "" if v is None else v for k, v in row.items()}, "Line": line, "Reason": reason})
+
+    def commit(force=False):
+        if pending and (force or len(pending) >= batch):
+            if table == "requests":
+                storage.add_request_groups(pending)
+                summary["imported"] += sum(len(group) for group in pending)
+                summary["groups"] += len(pending)
+            elif table == "booked_log":
+                storage.add_booked_log_many(pending)
+                summary["imported"] += len(pending)
+            else:
+                storage.add_settlements(pending)
+                summary["imported"] += len(pending)
+            summary["commits"] += 1
+            pending.clear()
+
+    if table == "requests":
+        today = datetime.now().strftime("%Y-%m-%d")
+        taken = set(storage.load_requests()["GroupID"].dropna())
+        months = storage.archived_months("requests")
+        if months:
+            taken.update(storage.load_archived("requests", months)["GroupID"].dropna())
+        group = {"key": None, "rows": []}  # the submission being gathered: (line, raw, cleaned or error)
+
+        def flush():
+            rows = group["rows"]
+            if not rows:
+                return
+            errors = [error for _, _, _, error in rows if error]
+            group_id = rows[0][2]["GroupID"] if not errors else ""
+            if not errors and group_id in taken:
+                errors = [f"GroupID already exists: {group_id}"]
+            for line, raw, _, error in rows:
+                if errors:
+                    reject(line, raw, error or f"Group rejected: {errors[0]}")
+            if not errors:
+                group_id = group_id or new_group_id()
+                taken.add(group_id)
+                pending.append([dict(cleaned, GroupID=group_id) for _, _, cleaned, _ in rows])
+                commit()
+            group["rows"] = []
+
+        for chunk in read_chunks(source, fmt, chunksize):
+            for line, raw in zip(chunk.index, chunk.to_dict("records")):
+                summary["read"] += 1
+                try:
+                    cleaned, error = clean_request(raw, today), None
+                except ValueError as e:
+                    cleaned, error = None, str(e)
+                key = _text(raw, "GroupID") or group_key(raw)
+                if key != group["key"]:
+                    flush()
+                    group["key"] = key
+                group["rows"].append((line, raw, cleaned, error))
+        flush()
+    else:
+        agents = storage.load_agents()
+        clean = clean_booked_log if table == "booked_log" else clean_settlement
+        for chunk in read_chunks(source, fmt, chunksize):
+            for line, raw in zip(chunk.index, chunk.to_dict("records")):
+                summary["read"] += 1
+                try:
+                    pending.append(clean(raw, agents))
+                except ValueError as e:
+                    reject(line, raw, str(e))
+                    continue
+                commit()
+    commit(force=True)
+    print(f"✅ Imported {summary['imported']} {table} row(s) in {summary['commits']} commit(s), "
+          f"rejected {summary['rejected']}")
+    return summary
+
+
+# ---------- Streaming export ----------
+# Yields the output text a chunk at a time; archived months within the date
+# range are included. Filters: start / end (inclusive, on the journey date,
+# or the payment date for settlements), agent (booked_log, settlements) and
+# status (requests).
+def export_rows(storage, table, fmt="csv", start=None, end=None, agent=None, status=None,
+                archived=True, chunksize=CHUNK_ROWS):
+    if agent and table == "requests":
+        raise ValueError("Requests have no agent to filter by")
+    if status and table != "requests":
+        raise ValueError("Only requests have a status to filter by")
+    columns = TABLE_COLUMNS[table]
+    date_column = DATE_COLUMN[table]
+    start = pd.Timestamp(start) if start else None
+    end = pd.Timestamp(end) if end else None
+
+    def chunks():
+        yield from storage.iter_table(table, chunksize)
+        if archived and table in ("requests", "booked_log"):
+            for month in storage.archived_months(table):
+                first = pd.Timestamp(month + "-01")
+                if (end is None or first <= end) and (start is None or first + pd.offsets.MonthEnd(1) >= start):
+                    yield storage.load_archived(table, [month])
+
+    header = True
+    for chunk in chunks():
+        chunk = chunk.reindex(columns=columns)
+        if start is not None or end is not None:
+            dates = pd.to_datetime(chunk[date_column], errors="coerce")
+            keep = dates.notna()
+            if start is not None:
+                keep &= dates >= start
+            if end is not None:
+                keep &= dates <= end
+            chunk = chunk[keep]
+        if agent:
+            chunk = chunk[chunk["Agent"] == agent]
+        if status:
+            chunk = chunk[chunk["Status"] == status]
+        if chunk.empty:
+            continue
+        if fmt == "jsonl":
+            records = chunk.astype(object).where(pd.notna(chunk), None).to_dict("records")
+            yield "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        else:
+            yield chunk.to_csv(index=False, header=header)
+            header = False
+    if header and fmt == "csv":
+        yield pd.DataFrame(columns=columns).to_csv(index=False)
+
+
+def write_export(storage, table, f, **filters):
+    rows = 0
+    for text in export_rows(storage, table, **filters):
+        f.write(text)
+        rows += text.count("\n")
+    return rows
+
+
+if __name__ == "__main__":
+    from storage import open_storage
+
+    parser = argparse.ArgumentParser(description="Streaming import / export of requests, bookings and settlements")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("table", choices=list(TABLE_COLUMNS))
+    parser.add_argument("file", help="CSV or JSONL file; - exports to stdout")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--rejects", help="import: where to write rejected rows (default: <file>.rejects.csv)")
+    parser.add_argument("--from", dest="start", help="export: first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="export: last date, YYYY-MM-DD")
+    parser.add_argument("--agent", help="export: booked_log / settlements of one agent")
+    parser.add_argument("--status", help="export: requests with this status")
+    args = parser.parse_args()
+
+    store = open_storage(args.backend)
+    if args.action == "import":
+        rejects_file = args.rejects or args.file + ".rejects.csv"
+        with open(rejects_file, "w", encoding="utf-8", newline="") as out:
+            result = import_rows(store, args.table, args.file, args.format, rejects=out)
+        if result["rejected"]:
+            print(f"❌ {result['rejected']} row(s) rejected, see {rejects_file}")
+            for reason, count in sorted(result["reasons"].items(), key=lambda item: -item[1]):
+                print(f"   {count:>6}  {reason}")
+    else:
+        fmt = args.format or ("jsonl" if args.file.endswith(".jsonl") else "csv")
+        filters = dict(fmt=fmt, start=args.start, end=args.end, agent=args.agent, status=args.status)
+        if args.file == "-":
+            write_export(store, args.table, sys.stdout, **filters)
+        else:
+            with open(args.file, "w", encoding="utf-8", newline="") as out:
+                count = write_export(store, args.table, out, **filters)
+            print(f"✅ Exported to {args.file} ({count} line(s))")
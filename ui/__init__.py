@@ -0,0 +1,3 @@
+# Pages and shared services for vittatkal.py. The entry point imports a page
+# only when it is shown, so the public form never loads the admin panel or
+# the mail code.
@@ -0,0 +1,50 @@
+import streamlit as st
+
+from metrics import span
+from rollups import ANY_AGENT
+from ui.admin import agents, booking_requests, finances, next_up, perf, summary
+from ui.admin.data import load_agent_balances, load_booked_log, load_rollups
+
+
+# ---------- ADMIN PANEL ----------
+def render():
+    st.title("🛡️ VITATKAL ADMIN PANEL")
+    admin_pass = st.text_input("ENTER ADMIN ACCESS CODE", type="password")
+
+    if admin_pass != st.secrets["admin"]["pass"]:
+        if admin_pass:
+            st.error("⛔ ACCESS DENIED")
+        return
+
+    st.success("✅ ACCESS GRANTED")
+
+    # One typed booked log shared by the dashboard, agent and finance tabs
+    booked_log = load_booked_log()
+    with span("load.balances"):
+        balances = load_agent_balances()
+    with span("load.rollups"):
+        rollups = load_rollups()
+    request_rollups = rollups[rollups["Agent"] == ANY_AGENT]
+    booked_rollups = rollups[rollups["Agent"] != ANY_AGENT]
+
+    tab1, tab_next, tab2, tab3, tab4, tab5 = st.tabs(
+        ["📋 Booking Requests", "🎯 Next Up", "📊 Summary Dashboard", "👤 Agent Dashboard", "💳 Finances", "⏱ Perf"]
+    )
+
+    with tab1, span("render.requests"):
+        booking_requests.render(request_rollups)
+
+    with tab_next, span("render.next_up"):
+        next_up.render()
+
+    with tab2, span("render.summary"):
+        summary.render(booked_log, booked_rollups)
+
+    with tab3, span("render.agents"):
+        agents.render(balances, booked_rollups)
+
+    with tab4, span("render.finances"):
+        finances.render(balances)
+
+    with tab5:
+        perf.render()
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from ui.services import load_agents, save_agents
+
+# ---------- Agent Dashboard tab ----------
+def render(balances, booked_rollups):
+    st.subheader("👥 Agent Dashboard")
+    # ---------- Style: CSS Hover Effects + Card Design ----------
+    st.markdown("""
+        <style>
+            .agent-card {
+                border-radius: 15px;
+                padding: 20px 10px 15px 10px;
+                text-align: center;
+                min-height: 240px;
+                box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+                transition: transform 0.2s ease, box-shadow 0.3s ease;
+            }
+            .agent-card:hover {
+                transform: scale(1.02);
+                box-shadow: 0 6px 16px rgba(0,0,0,0.3);
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # ---------- Agent Configs (agents.json registry) ----------
+    agents = load_agents()
+
+    # ---------- Per-agent booking counts (rollups) ----------
+    this_month = datetime.now().strftime("%Y-%m")
+    agent_rollups = booked_rollups.groupby("Agent")["Groups"].sum()
+    agent_month_rollups = booked_rollups[booked_rollups["Month"] == this_month].groupby("Agent")["Groups"].sum()
+
+    # ---------- Agent Card Renderer ----------
+    def render_agent_card(agent, col, icon, color):
+        # Ticket counts based on direct bookings only
+        total_tickets = int(agent_rollups.get(agent, 0))
+        this_month_count = int(agent_month_rollups.get(agent, 0))
+
+        # Profit split, from the shared agent ledger
+        total_profit = balances.at[agent, "Earned"] if agent in balances.index else 0
+
+
+        col.markdown(f"""
+        <div class="agent-card" style="background-color: {color};">
+            <div style="font-size: 40px; margin-bottom: 10px;">{icon}</div>
+            <div style="font-size: 20px; font-weight: bold; color: #000;">{agent}</div>
+            <hr style="border: 0.5px solid #666; width: 60%; margin: 10px auto;">
+            <div style="font-size: 15px; color: #000; text-align: left; padding-left: 15px;">
+                🎟️ <b>Total Tickets:</b> {total_tickets}<br>
+                📅 <b>This Month:</b> {this_month_count}<br>
+                💰 <b>Earnings:</b> ₹{total_profit:.2f}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+    # ---------- Layout: 3 Cards per Row ----------
+    names = list(agents)
+    for start in range(0, len(names), 3):
+        for col, agent in zip(st.columns(3), names[start:start + 3]):
+            render_agent_card(agent, col, agents[agent]["icon"], agents[agent]["color"])
+
+    # ---------- Manage Agents ----------
+    with st.expander("⚙️ Manage Agents"):
+        st.caption("Default splits apply to bookings saved without their own split. "
+                   "Removed agents keep their past earnings.")
+        edited = st.data_editor(pd.DataFrame([
+            {"Agent": name, "Split (%)": info["split"], "Icon": info["icon"], "Color": info["color"]}
+            for name, info in agents.items()
+        ]), num_rows="dynamic", use_container_width=True, key="agents_editor")
+        if st.button("💾 Save Agents", key="agents_save"):
+            edited = edited.dropna(subset=["Agent"])
+            edited["Agent"] = edited["Agent"].astype(str).str.strip()
+            edited = edited[edited["Agent"] != ""]
+            edited["Split (%)"] = pd.to_numeric(edited["Split (%)"], errors="coerce").fillna(0)
+            if edited.empty or edited["Agent"].duplicated().any():
+                st.warning("⚠️ Agent names must be unique and not empty.")
+            elif round(edited["Split (%)"].sum(), 2) != 100:
+                st.warning("⚠️ Default splits must total 100%.")
+            else:
+                save_agents({
+                    row["Agent"]: {"split": row["Split (%)"], "icon": row["Icon"], "color": row["Color"]}
+                    for row in edited.to_dict("records")
+                })
+                st.success("✅ Agents saved.")
+                st.rerun()
@@ -0,0 +1,210 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytz
+import streamlit as st
+
+from booking_index import VIEWS, VIEW_UPCOMING, VIEW_UPCOMING_PENDING
+from group_actions import GroupActions
+from ledger import encode_splits
+from ui.services import PAGE_SIZE, STATUS_BOOKED, STATUS_PENDING, get_storage, load_agents
+from ui.admin.data import (
+    archived_months, bulk_delete, bulk_mark_as_booked, bulk_mark_as_pending, delete_booking,
+    get_archive_index, get_group_index, live_changes, mark_as_booked, mark_as_pending, split_sliders
+)
+
+# ---------- Booking Requests tab ----------
+def render(request_rollups):
+    if "bulk_results" in st.session_state:
+        summary, results = st.session_state.pop("bulk_results")
+        st.success(summary)
+        st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+
+    index = get_group_index()
+    st.session_state["live_cursor"] = index.cursor
+    live_changes()
+    # Metrics count the live groups listed below; rollups also cover archived months
+    archived_groups = int(request_rollups["Groups"].sum()) - len(index.groups) if archived_months() else 0
+    if index.groups.empty:
+        if archived_groups > 0:
+            st.info(f"No live bookings. 🗄️ {archived_groups} group(s) are in archived months; "
+                    "unarchive a month on the Summary Dashboard to edit them.")
+        else:
+            st.info("No bookings found.")
+    else:
+        status = index.groups["Status"]
+        total = len(index.groups)
+        pending = int((status == STATUS_PENDING).sum())
+        booked = int((status == STATUS_BOOKED).sum())
+
+        st.markdown("## 📋 Booking Requests")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("📋 Total Requests", total)
+        col2.metric("⏳ Pending", pending)
+        col3.metric("✅ Booked", booked)
+        if archived_groups > 0:
+            st.caption(f"🗄️ {archived_groups} more group(s) in archived months, not counted above.")
+        st.markdown("---")
+
+        # 🔍 Filters + search
+        col_view, col_search = st.columns([1, 2])
+        view = col_view.selectbox("👀 View", VIEWS, key="list_view")
+        query = col_search.text_input("🔍 Search by name, phone or group ID", key="list_search")
+        today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+        matching = index.select(view, query, today)
+
+        if matching.empty:
+            st.info("No requests match this view.")
+            matching_dates = pd.Series(dtype=str)
+        else:
+            matching_dates = matching["Date of Journey"].dt.strftime("%Y-%m-%d")
+
+        # 🗄️ Archived months are only searched on request (read-only)
+        if query.strip() and archived_months() and view not in (VIEW_UPCOMING_PENDING, VIEW_UPCOMING):
+            if st.checkbox(f"🗄️ Also search {len(archived_months())} archived month(s)", key="list_search_archive"):
+                archived = get_archive_index().select(view, query, today)
+                if archived.empty:
+                    st.caption("No archived requests match.")
+                else:
+                    st.caption(f"🗄️ {len(archived)} archived group(s) match. Unarchive the month to edit them.")
+                    st.dataframe(
+                        archived.reset_index()[["GroupID", "Name", "Date of Journey", "Status", "Boarding Station", "Destination", "Phone", "Passengers"]],
+                        use_container_width=True, hide_index=True
+                    )
+
+        # 🧺 Bulk actions over the groups in the current view
+        with st.expander("🧺 Bulk Actions"):
+            if st.checkbox(f"Select all {len(matching)} group(s) in this view", key="bulk_all"):
+                selected = list(matching.index)
+            else:
+                selected = st.multiselect(
+                    "Groups", list(matching.index), key="bulk_groups",
+                    format_func=lambda g: f"{matching.at[g, 'Name']} — {matching.at[g, 'Date of Journey']:%Y-%m-%d} — {matching.at[g, 'Status']} ({matching.at[g, 'Passengers']} pax)"
+                )
+            action = st.radio("Action", ["✅ Mark as Booked", "🔄 Mark as Pending", "🗑️ Delete"], horizontal=True, key="bulk_action")
+
+            can_apply = bool(selected)
+            if action == "✅ Mark as Booked":
+                col_agent, col_profit = st.columns(2)
+                bulk_agent = col_agent.selectbox("👤 Agent", list(load_agents()), key="bulk_agent")
+                bulk_profit = col_profit.number_input("💰 Profit per passenger ₹", value=100, step=10, key="bulk_profit")
+                bulk_splits = split_sliders(load_agents(), key="bulk_split")
+                if sum(bulk_splits.values()) != 100:
+                    st.warning("⚠️ Profit split must total 100%.")
+                    can_apply = False
+
+            if st.button(f"Apply to {len(selected)} group(s)", key="bulk_apply", disabled=not can_apply):
+                chosen = matching.loc[selected]
+                if action == "✅ Mark as Booked":
+                    results = bulk_mark_as_booked(chosen, bulk_agent, bulk_profit, bulk_splits)
+                elif action == "🔄 Mark as Pending":
+                    results = bulk_mark_as_pending(chosen)
+                else:
+                    results = bulk_delete(chosen)
+                done = sum(not r["Result"].startswith(("⏭️", "⚠️")) for r in results)
+                st.session_state["bulk_results"] = (f"{action}: {done} of {len(results)} group(s) updated", results)
+                st.session_state.pop("bulk_groups", None)
+                st.session_state.pop("bulk_all", None)
+                st.rerun()
+
+        # 📄 Only the visible page of groups is materialised and rendered
+        page_count = max(1, -(-len(matching) // PAGE_SIZE))
+        if st.session_state.get("list_filter") != (view, query) or st.session_state.get("list_page", 1) > page_count:
+            st.session_state["list_filter"] = (view, query)
+            st.session_state["list_page"] = 1
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key="list_page")
+        page_groups = matching.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        page_rows = dict(tuple(index.page_rows(page_groups.index).groupby("GroupID")))
+
+        # Open "Mark as Booked" forms, kept per session in one bounded store
+        actions = st.session_state.setdefault("group_actions", GroupActions())
+        actions.refresh(index.groups["Status"], page_groups.index)
+        date_counts = matching_dates.value_counts()
+
+        # 🌟 Group by Date of Journey
+        for journey_date, date_groups in page_groups.groupby(matching_dates.loc[page_groups.index], sort=False):
+            st.markdown(f"### 📅 {journey_date} — {date_counts[journey_date]} Request(s)")
+
+            for group_id in date_groups.index:
+                group = page_rows[group_id]
+                main_row = group.iloc[0]
+                with st.expander(f"🎫 {main_row['Name']} — {main_row['Status']} | {main_row['Boarding Station']} → {main_row['Destination']}"):
+                    for passenger_num, (_, row) in enumerate(group.iterrows(), start=1):
+                        st.markdown(f"### Passenger {passenger_num}")
+                        for k in ["Name", "Age", "Gender"]:
+                            st.markdown(f"- **{k}**: {row[k]}")
+                    st.markdown("---")
+                    for key in ["Class", "Boarding Station", "Destination", "Phone", "Date of Journey"]:
+                        st.markdown(f"**{key}**: {main_row[key]}")
+
+                    col1, col2, col3 = st.columns(3)
+                    if main_row["Status"] != STATUS_BOOKED:
+                        cols = st.columns([2, 2, 1])
+                        col1, col2, col3 = cols
+
+                        action = actions.get(group_id)
+                        if action is None:
+                            if col1.button("✅ Mark as Booked", key=f"book_btn_{group_id}"):
+                                actions.open(group_id, main_row["Status"])
+                                st.rerun()
+                        else:
+                            agents = load_agents()
+                            agent_names = list(agents)
+                            selected_agent = col1.selectbox(
+                                "👤 Choose Agent", agent_names,
+                                index=agent_names.index(action["agent"]) if action.get("agent") in agent_names else 0,
+                                key=f"agent_select_{group_id}"
+                            )
+
+                            passenger_count = len(group)
+                            profit_input = col2.number_input(
+                                "💰 Profit ₹",
+                                value=action.get("profit", passenger_count * 100),
+                                step=10,
+                                key=f"profit_input_{group_id}"
+                            )
+
+                            splits = split_sliders(agents, key=f"split_{group_id}", values=action.get("splits"))
+                            actions.update(group_id, agent=selected_agent, profit=profit_input, splits=splits)
+
+                            if sum(splits.values()) != 100:
+                                st.warning("⚠️ Profit split must total 100%.")
+                            else:
+                                if col3.button("✅ Confirm", key=f"confirm_booked_{group_id}"):
+                                    # Mark as booked
+                                    mark_as_booked(group_id)
+
+                                    log_entry = {
+                                        "Customer Name": main_row["Name"],
+                                        "Date of Journey": pd.to_datetime(main_row["Date of Journey"]).strftime("%Y-%m-%d"),
+                                        "Agent": selected_agent,
+                                        "Profit": float(profit_input),
+                                        "Splits": encode_splits(splits),
+                                        "GroupID": group_id
+                                    }
+
+                                    get_storage().add_booked_log(log_entry)
+
+                                    st.success(f"✅ Booked and assigned to {selected_agent}")
+                                    actions.close(group_id)
+                                    st.rerun()
+
+                    else:
+                        if col1.button("🔄 Mark as Pending", key=f"pending_{group_id}"):
+                            mark_as_pending(group_id)
+
+                            get_storage().delete_booked_log_groups([group_id])
+
+                            st.info(f"Marked group {group_id} as pending and removed log entry.")
+                            time.sleep(1)
+                            st.rerun()
+
+                    if col3.button("🗑️ Delete Request", key=f"delete_{group_id}"):
+                        delete_booking(group_id)
+
+                        get_storage().delete_booked_log_groups([group_id])
+
+                        st.warning(f"Deleted booking and log for group {group_id}")
+                        time.sleep(1)
+                        st.rerun()
@@ -0,0 +1,177 @@
+from datetime import datetime
+
+import pandas as pd
+import pytz
+import streamlit as st
+
+from archive import all_archived_months, archive_before, unarchive
+from booking_index import GroupIndex, LiveGroupIndex
+from ledger import AgentLedger, encode_splits
+from rollups import Rollups
+from tatkal_queue import TatkalQueue
+from ui.services import STATUS_BOOKED, STATUS_PENDING, get_storage
+
+# One slider per registered agent (up to four a row); returns {agent: pct}
+def split_sliders(agents, key=None, values=None):
+    values = values or {name: info["split"] for name, info in agents.items()}
+    names = list(agents)
+    splits = {}
+    for start in range(0, len(names), 4):
+        cols = st.columns(min(4, len(names)))
+        for col, name in zip(cols, names[start:start + 4]):
+            splits[name] = col.slider(f"{name} (%)", 0, 100, int(round(values.get(name, 0))),
+                                      key=f"{key}_{name.lower()}" if key else None)
+    return splits
+
+def mark_as_booked(group_id):
+    get_storage().set_group_status(group_id, STATUS_BOOKED)
+
+def mark_as_pending(group_id):
+    get_storage().set_group_status(group_id, STATUS_PENDING)
+
+def delete_booking(group_id):
+    get_storage().delete_group(group_id)
+
+# ---------- Bulk admin actions ----------
+# Each bulk action is one write per table (a single journal event or SQLite
+# transaction), followed by one rerun. `groups` are GroupIndex summary rows;
+# every group gets a result row, including the ones that were skipped.
+def _bulk_result(group_id, row, result):
+    doj = pd.to_datetime(row["Date of Journey"])
+    return {"Group": group_id, "Name": row["Name"], "Date of Journey": doj.strftime("%Y-%m-%d"), "Result": result}
+
+def _bulk_split(groups, want):
+    # Re-check against the live index: another admin may have acted meanwhile
+    live = get_group_index().groups["Status"]
+    todo, results = [], []
+    for group_id, row in groups.iterrows():
+        if group_id not in live.index:
+            results.append(_bulk_result(group_id, row, "⚠️ Not found (already deleted)"))
+        elif not want(live[group_id]):
+            results.append(_bulk_result(group_id, row, f"⏭️ Skipped ({live[group_id]})"))
+        else:
+            todo.append((group_id, row))
+    return todo, results
+
+def bulk_mark_as_booked(groups, agent, profit_per_passenger, splits):
+    todo, results = _bulk_split(groups, lambda status: status != STATUS_BOOKED)
+    if todo:
+        entries = [{
+            "Customer Name": row["Name"],
+            "Date of Journey": pd.to_datetime(row["Date of Journey"]).strftime("%Y-%m-%d"),
+            "Agent": agent,
+            "Profit": float(profit_per_passenger * row["Passengers"]),
+            "Splits": encode_splits(splits),
+            "GroupID": group_id,
+        } for group_id, row in todo]
+        get_storage().set_groups_status([group_id for group_id, _ in todo], STATUS_BOOKED)
+        get_storage().add_booked_log_many(entries)
+        results += [_bulk_result(group_id, row, f"✅ Booked → {agent}") for group_id, row in todo]
+    return results
+
+def bulk_mark_as_pending(groups):
+    todo, results = _bulk_split(groups, lambda status: status == STATUS_BOOKED)
+    if todo:
+        get_storage().set_groups_status([group_id for group_id, _ in todo], STATUS_PENDING)
+        get_storage().delete_booked_log_groups([group_id for group_id, _ in todo])
+        results += [_bulk_result(group_id, row, "🔄 Pending") for group_id, row in todo]
+    return results
+
+def bulk_delete(groups):
+    todo, results = _bulk_split(groups, lambda status: True)
+    if todo:
+        get_storage().delete_groups([group_id for group_id, _ in todo])
+        get_storage().delete_booked_log_groups([group_id for group_id, _ in todo])
+        results += [_bulk_result(group_id, row, "🗑️ Deleted") for group_id, row in todo]
+    return results
+
+# The group index follows the change feed: writes since the last refresh
+# are patched in rather than reloading the requests table
+@st.cache_resource
+def get_live_index():
+    return LiveGroupIndex()
+
+def get_group_index():
+    storage = get_storage()
+    return get_live_index().refresh(storage, lambda: storage.load_typed("requests"))
+
+# Pending groups in Tatkal-window order, shared by every admin session and
+# kept current from the same change feed as the group index
+@st.cache_resource
+def get_tatkal_queue():
+    return TatkalQueue()
+
+def tatkal_queue():
+    return get_tatkal_queue().refresh(get_storage(), get_group_index)
+
+# Polls the feed every few seconds ([admin] live_refresh) and shows only the
+# groups written since this page was rendered; the list below is untouched
+@st.fragment(run_every=st.secrets.get("admin", {}).get("live_refresh", 5))
+def live_changes():
+    index = get_group_index()
+    changed = get_live_index().changed_since(st.session_state.get("live_cursor"))
+    if changed is None:
+        st.caption("🔄 Requests changed. Refresh to see the latest list.")
+    elif changed:
+        groups = index.groups[index.groups.index.isin(changed)]
+        removed = len(changed) - len(groups)
+        st.info(f"🆕 {len(groups)} new or updated group(s) since this page loaded"
+                + (f", {removed} deleted" if removed else ""))
+        if not groups.empty:
+            st.dataframe(
+                groups.reset_index()[["GroupID", "Name", "Date of Journey", "Status", "Boarding Station", "Destination", "Passengers"]],
+                use_container_width=True, hide_index=True
+            )
+    else:
+        st.caption(f"🟢 Live — checked {datetime.now(pytz.timezone('Asia/Kolkata')):%H:%M:%S}")
+    if changed != set() and st.button("🔄 Show in list", key="live_show"):
+        st.rerun()
+
+# Typed booked log: dates and numbers already parsed by the columnar snapshot
+def load_booked_log():
+    return get_storage().load_typed("booked_log")
+
+# ---------- Archived months ----------
+# Past journey months live in read-only partitions (archive.py) and are only
+# loaded when the month filter or a search asks for them.
+def archived_months(table="requests"):
+    return get_storage().archived_months(table)
+
+# Every month that unarchive can restore, whichever tables it is in
+def restorable_months():
+    return all_archived_months(get_storage())
+
+def load_archived_booked_log(month):
+    df = get_storage().load_archived("booked_log", [month])
+    df["Date of Journey"] = pd.to_datetime(df["Date of Journey"], errors="coerce")
+    df["Profit"] = df["Profit"].astype(float)
+    return df
+
+def get_archive_index():
+    storage = get_storage()
+    return storage.derived("archive", "group_index",
+                           lambda: GroupIndex(storage.load_archived("requests", storage.archived_months("requests"))))
+
+# Runs on the raw backend under the write lock; the views rebuild from the
+# changed table versions, including archived rows.
+def archive_past_months(cutoff):
+    storage = get_storage()
+    with storage.write_lock:
+        months = archive_before(storage.inner, cutoff)
+    storage.cache.invalidate()
+    return months
+
+def unarchive_months(months):
+    storage = get_storage()
+    with storage.write_lock:
+        unarchive(storage.inner, months)
+    storage.cache.invalidate()
+
+def load_settlements():
+    return get_storage().load_settlements()
+
+def load_agent_balances():
+    return AgentLedger().balances(get_storage())
+
+def load_rollups():
+    return Rollups().frame(get_storage())
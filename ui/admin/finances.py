@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from ui.services import get_storage, load_agents
+from ui.admin.data import load_settlements
+
+# ---------- Finances tab ----------
+def render(balances):
+    st.subheader("💳 Settle Agent Dues")
+
+    # ---------- Load Logs ----------
+    settled_df = load_settlements()
+    agent_names = list(load_agents())
+
+    # ---------- Display Agent Summary Table (materialised ledger) ----------
+    st.markdown("### 📊 Agent-wise Summary")
+    # Registry order first; agents no longer listed keep their history
+    summary_agents = agent_names + [a for a in balances.index if a not in agent_names]
+    agent_balances = balances.reindex(summary_agents, fill_value=0.0).round(2)
+    summary_df = pd.DataFrame({
+        "Agent": summary_agents,
+        "Total Profit Earned (₹)": agent_balances["Earned"].values,
+        "Amount Settled (₹)": agent_balances["Settled"].values,
+        "Amount Due (₹)": agent_balances["Due"].values
+    })
+
+    st.dataframe(summary_df, use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------- Settlement Form ----------
+    st.markdown("### 💸 Settle Dues")
+
+    with st.form("settle_form"):
+        col1, col2 = st.columns(2)
+        agent_selected = col1.selectbox("Select Agent", agent_names)
+        amount = col2.number_input("Amount to Settle (₹)", min_value=0.0, step=10.0)
+
+        col3, col4 = st.columns(2)
+        date = col3.date_input("Settlement Date", value=datetime.now().date())
+        notes = col4.text_input("Notes (optional)", placeholder="e.g., UPI, Cash, etc.")
+
+        submit = st.form_submit_button("💾 Record Settlement")
+
+        if submit:
+            if amount == 0:
+                st.warning("⚠️ Enter a valid amount.")
+            else:
+                get_storage().add_settlement({
+                    "Agent": agent_selected,
+                    "Amount": amount,
+                    "Date": date.strftime("%Y-%m-%d"),
+                    "Notes": notes
+                })
+                st.success(f"✅ ₹{amount} settled to {agent_selected}")
+                st.rerun()
+
+    st.markdown("---")
+
+    # ---------- View Settlement History ----------
+    with st.expander("📜 View Settlement History"):
+        if not settled_df.empty:
+            st.dataframe(settled_df.sort_values("Date", ascending=False), use_container_width=True)
+        else:
+            st.info("No settlements have been recorded yet.")
+
+    st.markdown("---")
+    st.markdown("### ✏️ Edit or 🗑️ Delete Settlement Entries")
+
+    if not settled_df.empty:
+        selected_idx = st.selectbox("Select Entry to Modify", settled_df.index)
+
+        entry = settled_df.loc[selected_idx]
+
+        with st.form("edit_delete_form"):
+            col1, col2 = st.columns(2)
+            # An agent removed from the registry stays selectable on their old entries
+            options = agent_names if entry["Agent"] in agent_names else agent_names + [entry["Agent"]]
+            edit_agent = col1.selectbox("Agent", options, index=options.index(entry["Agent"]))
+            edit_amount = col2.number_input("Amount (₹)", min_value=0.0, value=float(entry["Amount"]), step=10.0)
+
+            col3, col4 = st.columns(2)
+            edit_date = col3.date_input("Date", value=pd.to_datetime(entry["Date"]).date())
+            edit_notes = col4.text_input("Notes", value=entry["Notes"])
+
+            col_a, col_b = st.columns([1, 1])
+            update_btn = col_a.form_submit_button("💾 Update Entry")
+            delete_btn = col_b.form_submit_button("🗑️ Delete Entry")
+
+            if update_btn:
+                get_storage().update_settlement(selected_idx, {
+                    "Agent": edit_agent,
+                    "Amount": edit_amount,
+                    "Date": edit_date.strftime("%Y-%m-%d"),
+                    "Notes": edit_notes
+                })
+                st.success("✅ Entry updated successfully.")
+                st.rerun()
+
+            if delete_btn:
+                get_storage().delete_settlement(selected_idx)
+                st.warning("🗑️ Entry deleted.")
+                st.rerun()
+    else:
+        st.info("No settlement records available to edit or delete.")
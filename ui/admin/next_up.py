@@ -0,0 +1,85 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytz
+import streamlit as st
+
+from tatkal_queue import CLAIM_TIMEOUT, window_opens
+from ui.services import STATUS_BOOKED, load_agents
+from ui.admin.data import bulk_mark_as_booked, get_group_index, split_sliders, tatkal_queue
+
+# ---------- Next Up tab ----------
+# 🎯 One click pops the pending group whose Tatkal window opens first (AC
+# 10:00, non-AC 11:00 IST the day before the journey). It is held for this
+# admin until booked or put back, so two admins never work the same group.
+def render():
+    if "next_up_result" in st.session_state:
+        st.success(st.session_state.pop("next_up_result"))
+
+    queue = tatkal_queue()
+    index = get_group_index()
+    group_id = st.session_state.get("next_up")
+    if group_id is not None and group_id not in queue.claimed:
+        # Booked or deleted elsewhere, or held past the claim timeout
+        st.session_state.pop("next_up")
+        if group_id in index.groups.index and index.groups.at[group_id, "Status"] != STATUS_BOOKED:
+            st.warning(f"⌛ Held for over {CLAIM_TIMEOUT // 60} minutes; group {group_id} went back in the queue.")
+        group_id = None
+
+    st.subheader(f"🎯 Next Up — {len(queue)} group(s) waiting")
+    if group_id is None:
+        upcoming = queue.peek(5)
+        if upcoming:
+            groups = index.groups.loc[[g for _, g in upcoming]]
+            st.dataframe(pd.DataFrame({
+                "Window opens": [_opens_text(row["Date of Journey"], row["Class"]) for _, row in groups.iterrows()],
+                "Name": groups["Name"], "Class": groups["Class"], "Passengers": groups["Passengers"],
+                "Date of Journey": groups["Date of Journey"].dt.strftime("%Y-%m-%d"),
+            }), use_container_width=True, hide_index=True)
+        if st.button("⏭️ Next up", key="next_up_pop", disabled=not upcoming):
+            st.session_state["next_up"] = queue.pop()
+            st.rerun()
+        if not upcoming:
+            st.info("🎉 Nothing waiting to be booked.")
+        return
+
+    group = index.page_rows([group_id])
+    main_row = group.iloc[0]
+    opens = window_opens(main_row["Date of Journey"], main_row["Class"])
+    wait = opens.timestamp() - time.time()
+    if wait > 0:
+        st.info(f"🕙 Tatkal window opens {_opens_text(main_row['Date of Journey'], main_row['Class'])} "
+                f"(in {int(wait // 3600)}h {int(wait % 3600 // 60)}m)")
+    else:
+        st.error(f"🚨 Tatkal window open since {opens:%d %b %H:%M} IST — book now")
+
+    st.markdown(f"### 🎫 {main_row['Name']} | {main_row['Boarding Station']} → {main_row['Destination']}")
+    for key in ["Class", "Date of Journey", "Phone", "GroupID"]:
+        value = main_row[key]
+        st.markdown(f"**{key}**: {value:%Y-%m-%d}" if key == "Date of Journey" else f"**{key}**: {value}")
+    st.dataframe(group[["Name", "Age", "Gender"]], use_container_width=True, hide_index=True)
+
+    agents = load_agents()
+    col1, col2 = st.columns(2)
+    agent = col1.selectbox("👤 Choose Agent", list(agents), key="next_up_agent")
+    profit = col2.number_input("💰 Profit per passenger ₹", value=100, step=10, key="next_up_profit")
+    splits = split_sliders(agents, key="next_up_split")
+
+    col1, col2 = st.columns(2)
+    if sum(splits.values()) != 100:
+        st.warning("⚠️ Profit split must total 100%.")
+    elif col1.button("✅ Confirm Booked", key="next_up_confirm"):
+        results = bulk_mark_as_booked(index.groups.loc[[group_id]], agent, profit, splits)
+        st.session_state.pop("next_up")
+        st.session_state["next_up_result"] = results[0]["Result"]
+        st.rerun()
+    if col2.button("↩️ Put back", key="next_up_release"):
+        queue.release(st.session_state.pop("next_up"))
+        st.rerun()
+
+def _opens_text(journey_date, train_class):
+    opens = window_opens(journey_date, train_class)
+    today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+    day = "today" if opens.date() == today else f"{opens:%d %b}"
+    return f"{day} {opens:%H:%M} IST"
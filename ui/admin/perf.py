@@ -0,0 +1,23 @@
+import streamlit as st
+
+from metrics import METRICS
+from ui.services import get_ingest_worker, get_rate_limiter, get_storage, ingest_mode
+
+# ---------- Perf tab ----------
+# ⏱ Per-phase timings for this server process (last 1000 reruns per phase)
+def render():
+    st.subheader("⏱ Performance")
+    summary = METRICS.summary()
+    if summary.empty:
+        st.info("No timings recorded yet.")
+    else:
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+    st.markdown("### 🔢 Counters")
+    st.dataframe(METRICS.counter_frame(), use_container_width=True, hide_index=True)
+    if ingest_mode() == "queue":
+        st.caption(f"Ingest queue: {get_ingest_worker().queue.counts()}")
+    st.caption(f"Rate limiter: {len(get_rate_limiter())} active bucket(s); rejections are counted in rate_limited_total.")
+    cache = get_storage().cache
+    st.caption(f"Frame cache: {cache.hits} hits, {cache.misses} misses, "
+               f"{len(cache.entries)} entries, {cache.bytes / 1024 / 1024:.1f} MB. "
+               f"Exported to {METRICS.log.handlers[0].baseFilename if METRICS.log else '-'} and {METRICS.prom_file or '-'}.")
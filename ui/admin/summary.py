@@ -0,0 +1,237 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+import pytz
+import streamlit as st
+
+from storage import BOOKED_LOG_COLUMNS
+from ledger import encode_splits, parse_splits
+from transfer import import_rows, export_rows
+from ui.services import STATUS_BOOKED, STATUS_PENDING, get_storage, load_agents
+from ui.admin.data import (
+    archive_past_months, archived_months, load_archived_booked_log, restorable_months, split_sliders, unarchive_months
+)
+
+# ---------- Summary Dashboard tab ----------
+def render(booked_log, booked_rollups):
+    st.subheader("📊 Summary Dashboard")
+
+    log_df = booked_log
+    if not log_df.empty or archived_months("booked_log"):
+        # --- Filters ---
+        st.markdown("### 🔍 Filter Bookings")
+
+        col_filter1, col_filter2 = st.columns(2)
+        with col_filter1:
+            agent_options = set(log_df["Agent"].dropna()) | set(booked_rollups["Agent"]) - {""}
+            selected_agent = st.selectbox("Filter by Agent", ["All"] + sorted(agent_options))
+        with col_filter2:
+            # Rollups cover archived months too; those load only when picked
+            unique_months = set(booked_rollups["Month"]) - {""}
+            month_options = ["All"] + sorted(unique_months, reverse=True)
+            cold_months = set(archived_months("booked_log"))
+            selected_month = st.selectbox("Filter by Month", month_options,
+                                          format_func=lambda m: f"🗄️ {m}" if m in cold_months else m)
+
+        # --- Apply Filters ---
+        filtered_df = log_df.copy()
+        if selected_month in cold_months:
+            filtered_df = pd.concat([filtered_df, load_archived_booked_log(selected_month)], ignore_index=True)
+        elif selected_month == "All" and cold_months:
+            st.caption(f"🗄️ {len(cold_months)} archived month(s) not included. Pick one in the month filter to load it.")
+        if selected_agent != "All":
+            filtered_df = filtered_df[filtered_df["Agent"] == selected_agent]
+        if selected_month != "All":
+            filtered_df = filtered_df[filtered_df["Date of Journey"].dt.to_period("M") == pd.Period(selected_month)]
+
+        # --- Display Table ---
+        if not filtered_df.empty:
+            st.dataframe(filtered_df[["Customer Name", "Date of Journey", "Agent", "Profit"]], use_container_width=True)
+            st.markdown(f"**💰 Total Earnings (Filtered):** ₹{filtered_df['Profit'].sum():.2f}")
+        else:
+            st.warning("No data found for selected filters.")
+
+    else:
+        filtered_df = pd.DataFrame(columns=BOOKED_LOG_COLUMNS)
+        st.info("No booking logs available.")
+
+
+
+    st.markdown("---")
+
+    # Session state triggers
+    if "show_add_form" not in st.session_state:
+        st.session_state.show_add_form = False
+    if "show_edit_form" not in st.session_state:
+        st.session_state.show_edit_form = False
+    if "show_delete_form" not in st.session_state:
+        st.session_state.show_delete_form = False
+
+    # Button controls
+    col1, col2, col3 = st.columns(3)
+    if col1.button("➕ Add Entry"):
+        st.session_state.show_add_form = not st.session_state.show_add_form
+        st.session_state.show_edit_form = False
+        st.session_state.show_delete_form = False
+    if col2.button("✏️ Edit Entry"):
+        st.session_state.show_edit_form = not st.session_state.show_edit_form
+        st.session_state.show_add_form = False
+        st.session_state.show_delete_form = False
+    if col3.button("🗑️ Delete Entry"):
+        st.session_state.show_delete_form = not st.session_state.show_delete_form
+        st.session_state.show_add_form = False
+        st.session_state.show_edit_form = False
+
+    # --- Add Entry ---
+    if st.session_state.show_add_form:
+        st.markdown("### ➕ Add New Entry")
+        with st.form("add_entry"):
+            name = st.text_input("Customer Name")
+            date = st.date_input("Date of Journey")
+            agent = st.selectbox("Agent", list(load_agents()))
+            profit = st.number_input("Profit (₹)", min_value=0.0, step=10.0)
+
+            splits = split_sliders(load_agents())
+
+            if st.form_submit_button("💾 Save Entry"):
+                if sum(splits.values()) != 100:
+                    st.warning("⚠️ Profit split must total 100%.")
+                else:
+                    new_row = {
+                        "Customer Name": name,
+                        "Date of Journey": date.strftime("%Y-%m-%d"),
+                        "Agent": agent,
+                        "Profit": profit,
+                        "Splits": encode_splits(splits)
+                    }
+                    get_storage().add_booked_log(new_row)
+                    st.success("✅ Entry added.")
+                    st.rerun()
+
+
+    # --- Edit Entry ---
+    if st.session_state.show_edit_form:
+        st.markdown("### ✏️ Edit Existing Entry")
+        if log_df.empty:
+            st.warning("No entries to edit.")
+        else:
+            selected_index = st.selectbox(
+                "Select Row to Edit",
+                options=log_df.index,
+                format_func=lambda i: f"{log_df.at[i, 'Customer Name']} | {log_df.at[i, 'Date of Journey'].date()} | {log_df.at[i, 'Agent']}"
+            )
+            row = log_df.loc[selected_index]
+
+            with st.form("edit_entry"):
+                name = st.text_input("Customer Name", value=row["Customer Name"])
+                date = st.date_input("Date of Journey", value=pd.to_datetime(row["Date of Journey"]))
+                agent_names = list(load_agents())
+                agent = st.selectbox("Agent", agent_names,
+                                     index=agent_names.index(row["Agent"]) if row["Agent"] in agent_names else 0)
+                profit = st.number_input("Profit (₹)", min_value=0.0, step=10.0, value=float(row["Profit"]))
+
+                # Entries without their own split were booked at the default split
+                row_splits = {name: share * 100 for name, share in parse_splits(row["Splits"]).items()}
+                splits = split_sliders(load_agents(), values=row_splits or None)
+
+                if st.form_submit_button("💾 Update Entry"):
+                    if sum(splits.values()) != 100:
+                        st.warning("⚠️ Profit split must total 100%.")
+                    else:
+                        get_storage().update_booked_log(selected_index, {
+                            "Customer Name": name,
+                            "Date of Journey": date.strftime("%Y-%m-%d"),
+                            "Agent": agent,
+                            "Profit": profit,
+                            "Splits": encode_splits(splits)
+                        })
+                        st.success("✅ Entry updated.")
+                        st.rerun()
+
+
+    # --- Delete Entry ---
+    if st.session_state.show_delete_form:
+        st.markdown("### 🗑️ Delete Entry")
+        if log_df.empty:
+            st.warning("No entries to delete.")
+        else:
+            selected_index = st.selectbox(
+                "Select Row to Delete",
+                options=log_df.index,
+                format_func=lambda i: f"{log_df.at[i, 'Customer Name']} | {log_df.at[i, 'Date of Journey'].date()} | {log_df.at[i, 'Agent']}"
+            )
+            if st.button("⚠️ Confirm Delete"):
+                get_storage().delete_booked_log(selected_index)
+                st.warning("❌ Entry deleted.")
+                st.rerun()
+
+    # --- Archive ---
+    st.markdown("---")
+    with st.expander("🗄️ Archive"):
+        this_month = datetime.now(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m")
+        st.caption("Journeys before the current month can be moved to read-only monthly archives. "
+                   "They still count in the dashboards and balances, but are only loaded when asked for.")
+        if st.button(f"🗄️ Archive journeys before {this_month}", key="archive_run"):
+            months = archive_past_months(this_month)
+            st.success(f"✅ Archived {len(months)} month(s)")
+            st.rerun()
+        if restorable_months():
+            restore = st.multiselect("Archived months", restorable_months(), key="archive_restore")
+            if st.button(f"♻️ Unarchive {len(restore)} month(s)", key="unarchive_run", disabled=not restore):
+                unarchive_months(restore)
+                st.success(f"✅ Restored {', '.join(restore)}")
+                st.rerun()
+
+    # --- Import / Export ---
+    with st.expander("📦 Import / Export"):
+        tables = {"Booking requests": "requests", "Booked log": "booked_log", "Settlements": "settlements"}
+        st.caption("Imports are checked row by row like the booking form; rejected rows are listed "
+                   "with the reason. Passengers of one submission share a GroupID, or the same phone, "
+                   "journey date, route and class.")
+        import_table = tables[st.selectbox("Import into", list(tables), key="import_table")]
+        upload = st.file_uploader("CSV or JSONL file", type=["csv", "jsonl", "ndjson", "json"], key="import_file")
+        if st.button("📥 Import", key="import_run", disabled=upload is None):
+            rejects = io.StringIO()
+            result = import_rows(get_storage(), import_table, upload, rejects=rejects)
+            st.session_state["import_result"] = (result, rejects.getvalue())
+        if "import_result" in st.session_state:
+            result, rejects = st.session_state["import_result"]
+            st.success(f"✅ Imported {result['imported']} of {result['read']} row(s)"
+                       + (f" in {result['groups']} group(s)" if result["table"] == "requests" else ""))
+            if result["rejected"]:
+                st.warning(f"⚠️ {result['rejected']} row(s) rejected: "
+                           + ", ".join(f"{reason} ({count})" for reason, count in result["reasons"].items()))
+                st.download_button("⬇️ Download rejected rows", rejects, file_name="rejects.csv",
+                                   mime="text/csv", key="import_rejects")
+
+        st.markdown("##### Export")
+        export_table = tables[st.selectbox("Export", list(tables), key="export_table")]
+        col_from, col_to, col_filter, col_format = st.columns(4)
+        with col_from:
+            export_start = st.date_input("From", value=None, key="export_from")
+        with col_to:
+            export_end = st.date_input("To", value=None, key="export_to")
+        with col_filter:
+            if export_table == "requests":
+                export_status = st.selectbox("Status", ["All", STATUS_PENDING, STATUS_BOOKED], key="export_status")
+                export_agent = "All"
+            else:
+                export_agent = st.selectbox("Agent", ["All"] + list(load_agents()), key="export_agent")
+                export_status = "All"
+        with col_format:
+            export_format = st.selectbox("Format", ["csv", "jsonl"], key="export_format")
+
+        def export_file():
+            # Built when the button is clicked; Streamlit serves the bytes
+            buffer = io.BytesIO()
+            for text in export_rows(get_storage(), export_table, fmt=export_format,
+                                    start=export_start, end=export_end,
+                                    agent=None if export_agent == "All" else export_agent,
+                                    status=None if export_status == "All" else export_status):
+                buffer.write(text.encode("utf-8"))
+            return buffer.getvalue()
+
+        st.download_button("⬇️ Export", export_file, file_name=f"{export_table}.{export_format}",
+                           mime="text/csv" if export_format == "csv" else "application/x-ndjson",
+                           key="export_run")
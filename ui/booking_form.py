@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+
+import pytz
+import streamlit as st
+
+from metrics import span
+from storage import CLASSES, GENDERS, new_group_id
+from stations import normalise_station, station_index
+from ratelimit import wait_text
+from ui.services import STATUS_PENDING, admit, find_duplicate, get_duplicate_index, save_booking
+
+
+# ---------- USER FORM ----------
+def render():
+    st.title("🚅 VITATKAL Booking System")
+
+    if st.session_state.get("submitted", False):
+        if st.session_state.get("duplicate"):
+            st.info("ℹ️ We already received this booking request, no need to submit it again.")
+        else:
+            st.success("✅ Your booking request has been submitted successfully!")
+        if st.session_state.get("receipt"):
+            st.markdown(f"🧾 **Receipt ID:** `{st.session_state.receipt}`")
+        st.balloons()
+        st.markdown("""
+        ### 🎟️ Next Steps
+        - Our team will verify your details and contact you via Whatsapp.
+        - You’ll be notified via call or Whatsapp once it is booked.
+        - For urgent help, contact: **+91 93834 96183** | **+91 97787 01912**
+
+        [🔁 Make another request](?restart=true)
+        """, unsafe_allow_html=True)
+        st.stop()
+
+    if "num_passengers" not in st.session_state:
+        st.session_state.num_passengers = 1
+
+    with st.form("booking_form"), span("render.user_form"):
+        st.subheader("📝 Passenger Details")
+        col_main1, col_main2 = st.columns(2)
+
+        with col_main1:
+            name = st.text_input("Full Name*")
+            age = st.number_input("Age*", min_value=1, max_value=100, value=25)
+            gender = st.selectbox("Gender*", GENDERS)
+        with col_main2:
+            phone = st.text_input("Mobile Number*")
+            train_class = st.selectbox("Class*", CLASSES)
+
+        passenger_data = [{"Name": name, "Age": age, "Gender": gender}]
+
+        for i in range(1, st.session_state.num_passengers):
+            st.markdown(f"#### Additional Passenger {i + 1}")
+            col1, col2 = st.columns(2)
+            with col1:
+                name = st.text_input(f"Name*", key=f"name_{i}")
+                age = st.number_input(f"Age*", min_value=1, max_value=100, value=25, key=f"age_{i}")
+            with col2:
+                gender = st.selectbox(f"Gender*", GENDERS, key=f"gender_{i}")
+            passenger_data.append({"Name": name, "Age": age, "Gender": gender})
+
+        st.markdown("""<div style='text-align: right;'>""", unsafe_allow_html=True)
+        col_add, col_remove = st.columns([1, 1])
+        with col_add:
+            add_passenger = st.form_submit_button("➕ Add Extra Passenger")
+        with col_remove:
+            if st.session_state.num_passengers > 1:
+                remove_passenger = st.form_submit_button("➖ Remove Last Passenger")
+            else:
+                remove_passenger = False
+
+        if add_passenger:
+            st.session_state.num_passengers += 1
+            st.rerun()
+        elif remove_passenger:
+            st.session_state.num_passengers -= 1
+            st.rerun()
+
+        st.markdown("""</div>""", unsafe_allow_html=True)
+
+        if add_passenger:
+            st.session_state.num_passengers += 1
+            st.rerun()
+
+        st.subheader("🚉 Journey Details")
+        col3, col4 = st.columns(2)
+        # Pick from the station list (type to filter) or enter any station;
+        # either way it is stored as its station code where known
+        station_labels = station_index().labels()
+        with col3:
+            boarding = st.selectbox("Boarding Station*", station_labels, index=None, accept_new_options=True,
+                                    placeholder="Station name or code")
+        with col4:
+            destination = st.selectbox("Destination Station*", station_labels, index=None, accept_new_options=True,
+                                       placeholder="Station name or code")
+
+        india_tz = pytz.timezone("Asia/Kolkata")
+        now_ist = datetime.now(india_tz)
+        tomorrow = now_ist + timedelta(days=1)
+        doj = st.date_input("Date of Journey*", value=tomorrow.date(), min_value=now_ist.date())
+
+        submitted = st.form_submit_button("SUBMIT BOOKING REQUEST")
+
+        if submitted:
+            if not phone.isdigit() or len(phone) != 10:
+                st.error("❌ Invalid phone number")
+                st.stop()
+
+            boarding = normalise_station(boarding)
+            destination = normalise_station(destination)
+            if boarding and destination and all(p["Name"] and p["Age"] for p in passenger_data):
+                group_id = new_group_id()
+                full_data = []
+                for p in passenger_data:
+                    entry = {
+                        **p,
+                        "Class": train_class,
+                        "Boarding Station": boarding,
+                        "Destination": destination,
+                        "Phone": phone,
+                        "Date of Journey": doj.strftime("%Y-%m-%d"),
+                        "Date": now_ist.strftime("%Y-%m-%d"),
+                        "Status": STATUS_PENDING,
+                        "GroupID": group_id
+                    }
+                    full_data.append(entry)
+
+                existing = find_duplicate(full_data)
+                if existing:
+                    st.session_state.submitted = True
+                    st.session_state.receipt = existing
+                    st.session_state.duplicate = True
+                    st.rerun()
+                # Only a complete, new submission spends a rate-limit token
+                wait = admit(phone)
+                if wait:
+                    get_duplicate_index().release(full_data)
+                    st.warning(f"⏳ Too many booking requests in a short time. Please wait {wait_text(wait)} and try again.")
+                    st.stop()
+                try:
+                    receipt = save_booking(full_data)
+                except ValueError as e:
+                    get_duplicate_index().release(full_data)
+                    st.error(f"❌ {e}")
+                    st.stop()
+                except Exception:
+                    # Not saved: a retry must not be answered as a repeat of it
+                    get_duplicate_index().release(full_data)
+                    raise
+                # Mail code loads on the first notification, not with the form
+                from ui.mail import send_email_notification
+                if send_email_notification(full_data):
+                    st.session_state.submitted = True
+                    st.session_state.receipt = receipt
+                    st.session_state.duplicate = False
+                    st.rerun()
+                else:
+                    st.warning("⚠️ Booking saved but failed to send email notification.")
+            else:
+                st.error("❌ Please fill all required fields")
+
+    st.markdown("""
+    <div style='text-align: center; margin-top: 40px; font-size: 0.8rem; color: #666;'>
+        ©️ 2025 Vitatkal Booking System | Premium Railway Services<br>
+        For support: vitatkal@gmail.com | Phone: +91 93834 96183 | +91 97787 01912
+    </div>
+    """, unsafe_allow_html=True)
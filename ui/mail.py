@@ -0,0 +1,50 @@
+import streamlit as st
+from mailer import Outbox, MailWorker
+from metrics import span
+
+# Email notifications go through a persistent outbox drained by a background worker.
+# Optional [email] keys: host, port, starttls, digest (e.g. a local test SMTP server).
+@st.cache_resource
+def get_mail_worker():
+    config = st.secrets["email"]
+    worker = MailWorker(
+        Outbox(),
+        sender=config["sender"],
+        password=config.get("password"),
+        receiver=config["receiver"],
+        host=config.get("host", "smtp.gmail.com"),
+        port=config.get("port", 587),
+        starttls=config.get("starttls", True),
+        digest=config.get("digest", True)
+    )
+    worker.start()
+    return worker
+
+def send_email_notification(data_list):
+    try:
+        subject = f"🚨 New Vitatkal Booking Request from {data_list[0]['Name']}"
+        body_lines = ["Booking Group Details:\n"]
+
+        # Common info
+        common_keys = ["Class", "Boarding Station", "Destination", "Phone", "Date of Journey"]
+        for key in common_keys:
+            body_lines.append(f"{key}: {data_list[0][key]}")
+
+        body_lines.append("\nPassenger Details:")
+        for i, data in enumerate(data_list):
+            body_lines.append(f"Passenger {i + 1}:")
+            body_lines.append(f"  Name: {data['Name']}")
+            body_lines.append(f"  Age: {data['Age']}")
+            body_lines.append(f"  Gender: {data['Gender']}")
+            body_lines.append("")
+
+        body = "\n".join(body_lines)
+
+        worker = get_mail_worker()
+        with span("email.enqueue"):
+            worker.outbox.enqueue(subject, body)
+        worker.notify()
+        return True
+    except Exception as e:
+        print(f"❌ Failed to queue email: {e}")
+        return False
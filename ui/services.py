@@ -0,0 +1,109 @@
+import uuid
+
+import streamlit as st
+from storage import open_storage
+from migrations import run_migrations
+from cache import CachedStorage
+from ledger import AgentLedger
+from rollups import Rollups
+from outbox import Outbox
+from metrics import METRICS, span
+from ingest import IngestQueue, IngestWorker
+from snapshot import ColumnarSnapshot
+from dedupe import DEDUPE_WINDOW, DuplicateIndex
+from ratelimit import LIMITS, RateLimiter
+
+STATUS_PENDING = "Pending"
+STATUS_BOOKED = "Booked ✅"
+PAGE_SIZE = 20
+
+# Storage backend: [storage] backend = "csv" | "sqlite" in secrets
+@st.cache_resource
+def get_storage():
+    config = dict(st.secrets.get("storage", {}))
+    backend = config.pop("backend", "csv")
+    storage = open_storage(backend, **config)
+    with span("startup.migrations"):
+        run_migrations(storage)
+    return CachedStorage(storage, listeners=[AgentLedger(), Rollups()],
+                         snapshots=[ColumnarSnapshot("requests"), ColumnarSnapshot("booked_log")])
+
+def load_agents():
+    return get_storage().load_agents()
+
+def save_agents(agent_dict):
+    get_storage().save_agents(agent_dict)
+
+def load_data():
+    return get_storage().load_requests()
+
+# Spike mode: with [ingest] mode = "queue" a submission is validated and
+# committed to a durable queue, and a single background writer moves queued
+# submissions into storage in batches (group commit). Returns the receipt ID.
+def ingest_mode():
+    return st.secrets.get("ingest", {}).get("mode", "sync")
+
+@st.cache_resource
+def get_ingest_worker():
+    worker = IngestWorker(IngestQueue(), get_storage())
+    worker.start()
+    return worker
+
+def save_booking(data_list):
+    if ingest_mode() == "queue":
+        return get_ingest_worker().submit(data_list)
+    get_storage().add_requests(data_list)
+    return data_list[0]["GroupID"]
+
+# Repeat submissions (double clicks, retries) within [dedupe] window_minutes
+# get the first one's GroupID back instead of a second write and email;
+# window_minutes = 0 turns this off
+@st.cache_resource
+def get_duplicate_index():
+    minutes = st.secrets.get("dedupe", {}).get("window_minutes", DEDUPE_WINDOW / 60)
+    return DuplicateIndex(window=minutes * 60)
+
+def find_duplicate(data_list):
+    with span("submit.dedupe"):
+        return get_duplicate_index().claim(get_storage(), data_list)
+
+# Submissions per phone number and per browser session are rate limited
+# (ratelimit.py). Override a limit with e.g. [ratelimit.phone] burst = 3,
+# per_minute = 1; per_minute = 0 turns that limit off.
+@st.cache_resource
+def get_rate_limiter():
+    config = st.secrets.get("ratelimit", {})
+    limits = {kind: {**limit, **config.get(kind, {})} for kind, limit in LIMITS.items()}
+    return RateLimiter({kind: limit for kind, limit in limits.items() if limit["per_minute"] > 0})
+
+# Seconds the user has to wait before submitting again; 0 if they may submit now
+def admit(phone):
+    session = st.session_state.setdefault("session_key", uuid.uuid4().hex)
+    with span("submit.ratelimit"):
+        return get_rate_limiter().acquire(phone=phone, session=session)
+
+# Spans and counters are exported every few seconds to a rotating JSON-lines
+# file and a Prometheus text file. Optional [metrics] keys: file, prom_file,
+# port (serve /metrics over HTTP), host (the address it binds, 127.0.0.1 by
+# default) and interval.
+@st.cache_resource
+def get_metrics():
+    config = st.secrets.get("metrics", {})
+    METRICS.start(
+        metrics_file=config.get("file", "vitatkal_metrics.jsonl"),
+        prom_file=config.get("prom_file", "vitatkal_metrics.prom"),
+        port=config.get("port"),
+        interval=config.get("interval", 10),
+        host=config.get("host", "127.0.0.1")
+    )
+    return METRICS
+
+# The mail worker (and smtplib) load on the first notification. A process
+# that starts with mail still in the outbox, e.g. after a restart, starts
+# the worker straight away so it gets sent.
+@st.cache_resource
+def resume_mail():
+    if Outbox().pending():
+        from ui.mail import get_mail_worker
+        get_mail_worker()
+    return True
@@ -0,0 +1,66 @@
+import json
+import os
+
+from fileio import atomic_write_json, locked
+
+
+# ---------- Materialised views ----------
+# A view keeps derived state in a small JSON file together with the versions
+# of the tables it was computed from. CachedStorage calls on_change() around
+# every write so the view can apply an incremental delta; if the stored
+# versions don't match what the write started from (a hand-edited file,
+# another process, a missing state file) the view is rebuilt from scratch.
+class MaterializedView:
+    TABLES = ()
+
+    def __init__(self, path):
+        self.path = path
+
+    # Subclasses: compute full state from storage / apply one write's delta
+    def compute(self, storage):
+        raise NotImplementedError
+
+    def apply(self, state, storage, table, old_rows, new_rows):
+        raise NotImplementedError
+
+    def state(self, storage):
+        with locked(self.path):
+            state = self._load()
+            if state is None or state["versions"] != self._versions(storage):
+                state = self.rebuild(storage)
+            return state
+
+    def rebuild(self, storage):
+        with locked(self.path):
+            versions = self._versions(storage)
+            state = self.compute(storage)
+            state["versions"] = versions
+            atomic_write_json(state, self.path)
+            return state
+
+    def on_change(self, storage, table, old_rows, new_rows, versions_before):
+        with locked(self.path):
+            state = self._load()
+            if state is None or state["versions"] != self._normalise(versions_before):
+                self.rebuild(storage)
+                return
+            self.apply(state, storage, table, old_rows, new_rows)
+            state["versions"] = self._versions(storage)
+            atomic_write_json(state, self.path)
+
+    def _versions(self, storage):
+        return self._normalise({table: storage.version(table) for table in self.TABLES})
+
+    @staticmethod
+    def _normalise(versions):
+        # Round-trip through JSON so tuples compare equal to stored lists
+        return json.loads(json.dumps(versions))
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None